@@ -7,7 +7,20 @@ from sqlalchemy.orm import Session
 from jose import JWTError
 
 from app.db.session import SessionLocal
+from app.core.admission import AdmissionRejected, TenantAdmission, parse_weights
+from app.core.config import (
+    ADMISSION_WEIGHTS,
+    HEAP_SNAPSHOTS_KEEP,
+    PROFILER_ALLOWED_USER_IDS,
+    PROFILER_KEEP,
+    TENANT_BURST,
+    TENANT_MAX_CONCURRENCY,
+    TENANT_RATE_PER_SECOND,
+)
+from app.core.memory import HeapSnapshots
+from app.core.profiling import ProfileStore
 from app.core.security import decode_access_token
+from app.core.tracing import span
 from app.models.user import User
 from app.models.business_user import BusinessUser, BusinessRole
 
@@ -31,15 +44,16 @@ def get_current_user(
     db: Session = Depends(get_db),
 ) -> User:
     token = credentials.credentials
-    try:
-        payload = decode_access_token(token)
-        user_id = payload.get("sub")
-        if user_id is None:
+    with span("auth"):
+        try:
+            payload = decode_access_token(token)
+            user_id = payload.get("sub")
+            if user_id is None:
+                raise HTTPException(status_code=401, detail="Invalid token")
+        except JWTError:
             raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+        user = db.query(User).filter(User.id == int(user_id)).first()
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
 
@@ -66,14 +80,15 @@ def get_current_business(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="X-Business-ID header required",
         )
-    bu = (
-        db.query(BusinessUser)
-        .filter(
-            BusinessUser.user_id == current_user.id,
-            BusinessUser.business_id == x_business_id,
+    with span("auth.business"):
+        bu = (
+            db.query(BusinessUser)
+            .filter(
+                BusinessUser.user_id == current_user.id,
+                BusinessUser.business_id == x_business_id,
+            )
+            .first()
         )
-        .first()
-    )
     if bu is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -103,3 +118,86 @@ def require_role(minimum: BusinessRole) -> Callable:
             )
         return ctx
     return _dependency
+
+
+# ------------------------------------------------------------------ #
+#  require_admission: per-tenant rate limit + concurrency limit
+# ------------------------------------------------------------------ #
+
+tenant_admission = TenantAdmission(
+    rate_per_second=TENANT_RATE_PER_SECOND,
+    burst=TENANT_BURST,
+    max_concurrency=TENANT_MAX_CONCURRENCY,
+)
+
+_ENDPOINT_WEIGHTS = parse_weights(ADMISSION_WEIGHTS)
+
+
+def require_admission(endpoint: str) -> Callable:
+    """
+    Зависимость для дорогих эндпоинтов: пропускает запрос, только если
+    у бизнеса есть токены и свободная конкурентность. Иначе — быстрый
+    429/503 с Retry-After. Вес эндпоинта — из ADMISSION_WEIGHTS.
+    """
+    weight = _ENDPOINT_WEIGHTS.get(endpoint, 1)
+
+    def _dependency(
+        ctx: BusinessContext = Depends(get_current_business),
+    ):
+        try:
+            with span("admission"):
+                slots = tenant_admission.acquire(ctx.business_id, weight)
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=e.detail,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        try:
+            yield ctx
+        finally:
+            tenant_admission.release(ctx.business_id, slots)
+    return _dependency
+
+
+# ------------------------------------------------------------------ #
+#  Профайлер запросов: серверный allowlist пользователей
+# ------------------------------------------------------------------ #
+
+PROFILER_USER_IDS = frozenset(
+    int(user_id) for user_id in PROFILER_ALLOWED_USER_IDS.split(",") if user_id.strip()
+)
+
+profile_store = ProfileStore(keep=PROFILER_KEEP)
+heap_snapshots = HeapSnapshots(keep=HEAP_SNAPSHOTS_KEEP)
+
+
+def is_profiler_user(scope) -> bool:
+    """
+    Запрос несёт валидный Bearer-токен пользователя из
+    PROFILER_ALLOWED_USER_IDS. Только проверка JWT, без БД: вызывается
+    из middleware до маршрутизации.
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return False
+            try:
+                return int(decode_access_token(token)["sub"]) in PROFILER_USER_IDS
+            except (JWTError, KeyError, TypeError, ValueError):
+                return False
+    return False
+
+
+def require_profiler_access(
+    ctx: BusinessContext = Depends(require_role(BusinessRole.OWNER)),
+    current_user: User = Depends(get_current_user),
+) -> BusinessContext:
+    """Владелец бизнеса и пользователь из allowlist профайлера."""
+    if current_user.id not in PROFILER_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Profiler access denied",
+        )
+    return ctx
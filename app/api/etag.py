@@ -0,0 +1,64 @@
+# app/api/etag.py
+
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from app.core.metrics import etag_checks
+from app.core.versions import change_versions
+
+
+def business_etag(business_id: int) -> str:
+    """Weak ETag для списков бизнеса (bookings, staff, services)."""
+    version = change_versions.business(business_id)
+    return _weak(change_versions.epoch, business_id, version)
+
+
+def staff_etag(
+    business_id: int, staff_id: int, *extra: object, version: Optional[int] = None,
+) -> str:
+    """
+    Weak ETag для данных сотрудника (слоты и т.п.). version — уже
+    прочитанная версия сотрудника, если по ней же строится ответ.
+    """
+    if version is None:
+        version = change_versions.staff(business_id, staff_id)
+    return _weak(change_versions.epoch, business_id, staff_id, version, *extra)
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Проверяет If-None-Match (слабое сравнение, RFC 9110 §13.1.2).
+    При нескольких воркерах всегда False: версии процесса не видят
+    изменений, сделанных другими воркерами.
+    """
+    header = request.headers.get("if-none-match")
+    if not header or not change_versions.authoritative:
+        hit = False
+    elif header.strip() == "*":
+        hit = True
+    else:
+        candidates = {_strip_weak(tag.strip()) for tag in header.split(",")}
+        hit = _strip_weak(etag) in candidates
+    etag_checks.inc("hit" if hit else "miss")
+    return hit
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=cache_headers(etag),
+    )
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    # no-cache: клиент обязан ревалидировать ответ через If-None-Match
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _weak(*parts: object) -> str:
+    return 'W/"' + "-".join(str(p) for p in parts) + '"'
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
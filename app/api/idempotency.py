@@ -0,0 +1,41 @@
+# app/api/idempotency.py
+
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+
+from app.services.idempotency import IdempotencyRequest, IdempotentReplay, make_request
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def idempotency_request(
+    key: Optional[str], *, endpoint: str, payload: Any,
+) -> Optional[IdempotencyRequest]:
+    """Заголовок Idempotency-Key → IdempotencyRequest (None, если не передан)."""
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key должен быть от 1 до {IDEMPOTENCY_KEY_MAX_LENGTH} символов",
+        )
+    return make_request(key, endpoint=endpoint, payload=payload)
+
+
+def replay_response(replay: IdempotentReplay) -> JSONResponse:
+    """Сохранённый ответ с пометкой Idempotent-Replayed."""
+    return JSONResponse(
+        status_code=replay.status_code,
+        content=replay.body,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def key_mismatch(e: Exception) -> HTTPException:
+    return HTTPException(
+        status_code=422,
+        detail=str(e),
+    )
@@ -0,0 +1,114 @@
+# app/api/metrics.py
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app.api.v1.schedule import slots_flight
+from app.core.config import METRICS_TOKEN
+from app.core.metrics import CONTENT_TYPE, callback, registry
+from app.db.retry import write_lock_stats
+from app.db.session import engine
+from app.services.booking_index import booking_index
+from app.services.idempotency import idempotency_stats
+from app.services.slot_tokens import slot_token_stats
+
+router = APIRouter(tags=["health"])
+
+# Статистика, которая уже ведётся в своих модулях, читается при сборе
+
+callback(
+    "db_pool_connections",
+    "Соединения пула SQLAlchemy: checked_out — выданы, idle — свободны, overflow — сверх pool_size",
+    lambda: {
+        ("checked_out",): engine.pool.checkedout(),
+        ("idle",): engine.pool.checkedin(),
+        ("overflow",): max(engine.pool.overflow(), 0),
+    },
+    labelnames=("state",),
+)
+callback(
+    "sqlite_write_lock_acquired_total",
+    "Успешные BEGIN IMMEDIATE",
+    lambda: write_lock_stats.acquired,
+    type="counter",
+)
+callback(
+    "sqlite_write_lock_retries_total",
+    "Повторы мутаций после «database is locked»",
+    lambda: write_lock_stats.retries,
+    type="counter",
+)
+callback(
+    "sqlite_write_lock_gave_up_total",
+    "Мутации, исчерпавшие повторы (ответ 503)",
+    lambda: write_lock_stats.gave_up,
+    type="counter",
+)
+
+
+def _singleflight():
+    stats = slots_flight.stats()
+    return {("execution",): stats.executions, ("coalesced",): stats.coalesced}
+
+
+callback(
+    "slots_singleflight_calls_total",
+    "Расчёты слотов: execution — выполнен, coalesced — получен результат параллельного",
+    _singleflight,
+    type="counter",
+    labelnames=("result",),
+)
+callback(
+    "booking_index_lookups_total",
+    "Обращения к booking_index: hit — из памяти, miss — загрузка сотрудника из БД",
+    lambda: {
+        ("hit",): booking_index.lookups - booking_index.loads,
+        ("miss",): booking_index.loads,
+    },
+    type="counter",
+    labelnames=("result",),
+)
+callback(
+    "booking_index_precheck_total",
+    "Precheck пересечений до BEGIN IMMEDIATE: conflict — найдено пересечение, clear — нет",
+    lambda: {("conflict",): booking_index.conflicts, ("clear",): booking_index.clears},
+    type="counter",
+    labelnames=("result",),
+)
+callback(
+    "idempotency_keys_total",
+    "Idempotency-Key: stored — ответ сохранён, replayed — отдан сохранённый, mismatched — ключ от другого запроса",
+    lambda: {
+        ("stored",): idempotency_stats.stored,
+        ("replayed",): idempotency_stats.replayed,
+        ("mismatched",): idempotency_stats.mismatched,
+    },
+    type="counter",
+    labelnames=("result",),
+)
+callback(
+    "slot_tokens_total",
+    "Проверенные токены слотов",
+    lambda: {("accepted",): slot_token_stats.accepted, ("rejected",): slot_token_stats.rejected},
+    type="counter",
+    labelnames=("result",),
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Метрики процесса в text format Prometheus. async: сбор не ходит в БД
+    и должен отвечать, даже когда threadpool занят ждущими пул запросами.
+    При заданном METRICS_TOKEN нужен заголовок Authorization: Bearer.
+    """
+    if METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "")
+        if not hmac.compare_digest(supplied.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    return Response(registry.render(), media_type=CONTENT_TYPE)
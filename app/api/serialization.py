@@ -0,0 +1,33 @@
+# app/api/serialization.py
+
+from typing import Iterable, Mapping, Sequence
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.tracing import span
+
+
+def json_list_response(
+    adapter: TypeAdapter,
+    chunks: Iterable[Sequence[Mapping]],
+    *,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """
+    JSON-массив из строк БД, сериализуемых пачками: в памяти одновременно
+    одна пачка строк/моделей и уже готовые байты, а не весь список
+    ORM-объектов, моделей и промежуточных dict'ов FastAPI (response_model).
+    adapter — TypeAdapter(list[Schema]); вывод тот же, что у response_model.
+    Спан render включает и чтение пачек (SQL — вложенные спаны).
+    """
+    parts = []
+    with span("render"):
+        for chunk in chunks:
+            if chunk:
+                parts.append(adapter.dump_json(adapter.validate_python(chunk))[1:-1])
+    return Response(
+        b"[" + b",".join(parts) + b"]",
+        media_type="application/json",
+        headers=headers,
+    )
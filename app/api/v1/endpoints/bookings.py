@@ -1,22 +1,48 @@
 # app/api/v1/endpoints/bookings.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, time, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_business, BusinessContext
-from app.schemas.booking import BookingCreate, BookingRead, BookingCancel
-from app.models.booking import Booking
+from app.api.deps import get_db, require_admission, BusinessContext
+from app.api.etag import business_etag, cache_headers, is_not_modified, not_modified
+from app.api.idempotency import idempotency_request, key_mismatch, replay_response
+from app.api.serialization import json_list_response
+from app.core.metrics import booking_rejections
+from app.schemas.booking import (
+    BookingCreate,
+    BookingBulkAction,
+    BookingBulkRead,
+    BookingCartCreate,
+    BookingRead,
+    BookingCancel,
+    BookingReschedule,
+    BookingSeriesCreate,
+    BookingSeriesRead,
+)
+from app.models.booking import BookingStatus
+from app.repositories import bookings as bookings_repo
 from app.services.booking_service import (
     BookingService,
+    BookingBusyError,
+    BookingError,
     BookingNotFoundError,
     BookingStateError,
+    CartItem,
     SlotUnavailableError,
 )
+from app.services.idempotency import IdempotencyKeyMismatchError, IdempotentReplay
+from app.services.recurrence import RecurrenceRule
 
 router = APIRouter(tags=["Bookings"])
 
 _booking_service = BookingService()
 
+_booking_list = TypeAdapter(list[BookingRead])
+
 
 @router.get(
     "/bookings",
@@ -24,17 +50,20 @@ _booking_service = BookingService()
     summary="Список бронирований бизнеса",
 )
 def list_bookings(
+    request: Request,
     db: Session = Depends(get_db),
-    ctx: BusinessContext = Depends(get_current_business),
+    ctx: BusinessContext = Depends(require_admission("bookings.list")),
 ):
-    return (
-        db.query(Booking)
-        .filter(
-            Booking.business_id == ctx.business_id,
-            Booking.is_active == True,
-        )
-        .order_by(Booking.start_at.desc())
-        .all()
+    etag = business_etag(ctx.business_id)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    # Десятки тысяч броней: сериализация пачками строк, а не через
+    # response_model по списку ORM-объектов (пик памяти в разы меньше)
+    return json_list_response(
+        _booking_list,
+        bookings_repo.iter_rows_for_business(db, business_id=ctx.business_id),
+        headers=cache_headers(etag),
     )
 
 
@@ -47,8 +76,15 @@ def list_bookings(
 def create_booking(
     body: BookingCreate,
     db: Session = Depends(get_db),
-    ctx: BusinessContext = Depends(get_current_business),
+    ctx: BusinessContext = Depends(require_admission("bookings.create")),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
+    idempotency = idempotency_request(
+        idempotency_key,
+        endpoint="bookings.create",
+        # Токен слота меняется между повторами — в fingerprint не входит
+        payload=body.model_dump(mode="json", exclude={"slot_token"}),
+    )
     try:
         booking = _booking_service.create_booking(
             db,
@@ -61,15 +97,133 @@ def create_booking(
             customer_phone=body.customer.phone,
             customer_email=body.customer.email,
             comment=body.comment,
+            slot_token=body.slot_token,
+            idempotency=idempotency,
         )
+    except IdempotentReplay as replay:
+        return replay_response(replay)
+    except IdempotencyKeyMismatchError as e:
+        raise key_mismatch(e)
     except SlotUnavailableError as e:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        raise _conflict(e)
     except BookingNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BookingBusyError as e:
+        raise _busy(e)
 
     return booking
 
 
+@router.post(
+    "/bookings/batch",
+    response_model=list[BookingRead],
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать несколько бронирований одной транзакцией (корзина)",
+)
+def create_bookings_batch(
+    body: BookingCartCreate,
+    db: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(require_admission("bookings.batch")),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    idempotency = idempotency_request(
+        idempotency_key,
+        endpoint="bookings.batch",
+        payload=body.model_dump(mode="json", exclude={"items": {"__all__": {"slot_token"}}}),
+    )
+    try:
+        bookings = _booking_service.create_bookings(
+            db,
+            business_id=ctx.business_id,
+            items=[
+                CartItem(
+                    staff_id=item.staff_id,
+                    service_id=item.service_id,
+                    start_at=item.start_at,
+                    slot_token=item.slot_token,
+                )
+                for item in body.items
+            ],
+            confirm=body.confirm,
+            customer_name=body.customer.name,
+            customer_phone=body.customer.phone,
+            customer_email=body.customer.email,
+            comment=body.comment,
+            idempotency=idempotency,
+        )
+    except IdempotentReplay as replay:
+        return replay_response(replay)
+    except IdempotencyKeyMismatchError as e:
+        raise key_mismatch(e)
+    except SlotUnavailableError as e:
+        raise _conflict(e)
+    except BookingNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BookingBusyError as e:
+        raise _busy(e)
+    except BookingError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return bookings
+
+
+@router.post(
+    "/bookings/series",
+    response_model=BookingSeriesRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать серию повторяющихся бронирований",
+)
+def create_booking_series(
+    body: BookingSeriesCreate,
+    db: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(require_admission("bookings.series")),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    idempotency = idempotency_request(
+        idempotency_key,
+        endpoint="bookings.series",
+        payload=body.model_dump(mode="json"),
+    )
+    try:
+        result = _booking_service.create_series(
+            db,
+            business_id=ctx.business_id,
+            staff_id=body.staff_id,
+            service_id=body.service_id,
+            start_at=body.start_at,
+            rule=RecurrenceRule(
+                frequency=body.frequency, count=body.count, until=body.until,
+            ),
+            confirm=body.confirm,
+            customer_name=body.customer.name,
+            customer_phone=body.customer.phone,
+            customer_email=body.customer.email,
+            comment=body.comment,
+            idempotency=idempotency,
+        )
+    except IdempotentReplay as replay:
+        return replay_response(replay)
+    except IdempotencyKeyMismatchError as e:
+        raise key_mismatch(e)
+    except BookingNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BookingBusyError as e:
+        raise _busy(e)
+    except BookingError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not result.created:
+        booking_rejections.inc("series_conflict")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Ни одно повторение серии не доступно",
+                "conflicts": BookingSeriesRead.model_validate(result).model_dump(mode="json")["conflicts"],
+            },
+        )
+    return result
+
+
 @router.post(
     "/bookings/{booking_id}/confirm",
     response_model=BookingRead,
@@ -78,16 +232,28 @@ def create_booking(
 def confirm_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    ctx: BusinessContext = Depends(get_current_business),
+    ctx: BusinessContext = Depends(require_admission("bookings.confirm")),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
+    idempotency = idempotency_request(
+        idempotency_key,
+        endpoint="bookings.confirm",
+        payload={"booking_id": booking_id},
+    )
     try:
         booking = _booking_service.confirm_booking(
-            db, booking_id, business_id=ctx.business_id,
+            db, booking_id, business_id=ctx.business_id, idempotency=idempotency,
         )
+    except IdempotentReplay as replay:
+        return replay_response(replay)
+    except IdempotencyKeyMismatchError as e:
+        raise key_mismatch(e)
     except BookingNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BookingBusyError as e:
+        raise _busy(e)
     except BookingStateError as e:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        raise _conflict(e)
 
     return booking
 
@@ -100,15 +266,160 @@ def confirm_booking(
 def cancel_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    ctx: BusinessContext = Depends(get_current_business),
+    ctx: BusinessContext = Depends(require_admission("bookings.cancel")),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
+    idempotency = idempotency_request(
+        idempotency_key,
+        endpoint="bookings.cancel",
+        payload={"booking_id": booking_id},
+    )
     try:
         booking = _booking_service.cancel_booking(
-            db, booking_id, business_id=ctx.business_id,
+            db, booking_id, business_id=ctx.business_id, idempotency=idempotency,
+        )
+    except IdempotentReplay as replay:
+        return replay_response(replay)
+    except IdempotencyKeyMismatchError as e:
+        raise key_mismatch(e)
+    except BookingNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BookingBusyError as e:
+        raise _busy(e)
+    except BookingStateError as e:
+        raise _conflict(e)
+
+    return booking
+
+
+@router.post(
+    "/bookings/bulk-cancel",
+    response_model=BookingBulkRead,
+    summary="Отменить несколько бронирований",
+)
+def bulk_cancel_bookings(
+    body: BookingBulkAction,
+    db: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(require_admission("bookings.bulk")),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    return _bulk_transition("cancel", body, db, ctx, idempotency_key)
+
+
+@router.post(
+    "/bookings/bulk-confirm",
+    response_model=BookingBulkRead,
+    summary="Подтвердить несколько HOLD-бронирований",
+)
+def bulk_confirm_bookings(
+    body: BookingBulkAction,
+    db: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(require_admission("bookings.bulk")),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    return _bulk_transition("confirm", body, db, ctx, idempotency_key)
+
+
+def _bulk_transition(
+    action: str,
+    body: BookingBulkAction,
+    db: Session,
+    ctx: BusinessContext,
+    idempotency_key: Optional[str],
+):
+    """
+    Общая часть bulk-cancel / bulk-confirm. Ответ 200 даже если часть
+    броней не изменилась — итог по каждой брони в results.
+    """
+    idempotency = idempotency_request(
+        idempotency_key,
+        endpoint=f"bookings.bulk_{action}",
+        payload=body.model_dump(mode="json"),
+    )
+    start = end = None
+    if body.date_from is not None:
+        start = datetime.combine(body.date_from, time.min)
+        end = datetime.combine(body.date_to or body.date_from, time.min) + timedelta(days=1)
+    try:
+        return _booking_service.bulk_transition(
+            db,
+            action=action,
+            business_id=ctx.business_id,
+            booking_ids=body.booking_ids,
+            staff_id=body.staff_id,
+            start=start,
+            end=end,
+            statuses=[BookingStatus(s) for s in body.statuses] if body.statuses else None,
+            idempotency=idempotency,
         )
+    except IdempotentReplay as replay:
+        return replay_response(replay)
+    except IdempotencyKeyMismatchError as e:
+        raise key_mismatch(e)
+    except BookingBusyError as e:
+        raise _busy(e)
+    except BookingError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    "/bookings/{booking_id}/reschedule",
+    response_model=BookingRead,
+    summary="Перенести бронирование",
+)
+def reschedule_booking(
+    booking_id: int,
+    body: BookingReschedule,
+    db: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(require_admission("bookings.reschedule")),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    idempotency = idempotency_request(
+        idempotency_key,
+        endpoint="bookings.reschedule",
+        payload={
+            "booking_id": booking_id,
+            **body.model_dump(mode="json", exclude={"slot_token"}),
+        },
+    )
+    try:
+        booking = _booking_service.reschedule_booking(
+            db,
+            booking_id,
+            business_id=ctx.business_id,
+            start_at=body.start_at,
+            staff_id=body.staff_id,
+            slot_token=body.slot_token,
+            idempotency=idempotency,
+        )
+    except IdempotentReplay as replay:
+        return replay_response(replay)
+    except IdempotencyKeyMismatchError as e:
+        raise key_mismatch(e)
+    except SlotUnavailableError as e:
+        raise _conflict(e)
     except BookingNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BookingBusyError as e:
+        raise _busy(e)
     except BookingStateError as e:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        raise _conflict(e)
+    except BookingError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     return booking
+
+
+def _conflict(e: BookingError) -> HTTPException:
+    reason = "slot_unavailable" if isinstance(e, SlotUnavailableError) else "invalid_state"
+    booking_rejections.inc(reason)
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+def _busy(e: BookingBusyError) -> HTTPException:
+    booking_rejections.inc("busy")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "1"},
+    )
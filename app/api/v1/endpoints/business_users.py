@@ -27,21 +27,21 @@ def list_business_users(
     db: Session = Depends(get_db),
     ctx: BusinessContext = Depends(get_current_business),
 ):
-    bus = (
-        db.query(BusinessUser)
+    rows = (
+        db.query(BusinessUser, User.email)
+        .outerjoin(User, User.id == BusinessUser.user_id)
         .filter(BusinessUser.business_id == ctx.business_id)
         .all()
     )
-    result = []
-    for bu in bus:
-        user = db.query(User).filter(User.id == bu.user_id).first()
-        result.append(BusinessUserRead(
+    return [
+        BusinessUserRead(
             user_id=bu.user_id,
             business_id=bu.business_id,
             role=bu.role,
-            email=user.email if user else None,
-        ))
-    return result
+            email=email,
+        )
+        for bu, email in rows
+    ]
 
 
 @router.post(
@@ -1,15 +1,20 @@
 # app/api/v1/endpoints/customers.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_business, BusinessContext
+from app.api.serialization import json_list_response
 from app.schemas.customer import CustomerCreate, CustomerRead
 from app.models.customer import Customer
 from app.repositories import customers as customers_repo
+from app.core.versions import change_versions
 
 router = APIRouter(tags=["Customers"])
 
+_customer_list = TypeAdapter(list[CustomerRead])
+
 
 @router.post(
     "/customers",
@@ -40,6 +45,7 @@ def create_customer(
     )
     customers_repo.create(db, customer)
     db.commit()
+    change_versions.bump(business_id)
     db.refresh(customer)
     return customer
 
@@ -54,8 +60,11 @@ def list_customers(
     db: Session = Depends(get_db),
     ctx: BusinessContext = Depends(get_current_business),
 ):
-    return customers_repo.list_for_business(
-        db, business_id=ctx.business_id, only_active=only_active,
+    return json_list_response(
+        _customer_list,
+        customers_repo.iter_rows_for_business(
+            db, business_id=ctx.business_id, only_active=only_active,
+        ),
     )
 
 
@@ -0,0 +1,129 @@
+# app/api/v1/endpoints/debug.py
+
+import tracemalloc
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import (
+    heap_snapshots,
+    profile_store,
+    require_profiler_access,
+    BusinessContext,
+)
+from app.core.memory import KEY_TYPES
+from app.core.config import SQL_PROFILER_ENABLED
+from app.db.session import sql_profiler
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+def _profiler_enabled() -> None:
+    if not SQL_PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="SQL profiler disabled")
+
+
+@router.get("/sql-profile", dependencies=[Depends(_profiler_enabled)])
+def get_sql_profile(
+    top: int = Query(20, ge=1, le=200),
+    ctx: BusinessContext = Depends(require_profiler_access),
+):
+    """
+    SQL по маршрутам с момента старта (или последнего сброса):
+    число запросов на HTTP-запрос, суммарное время и самые дорогие
+    нормализованные запросы. Статистика общая для процесса (все
+    бизнесы), поэтому доступ — только из allowlist профайлера.
+    """
+    return sql_profiler.snapshot(top=top)
+
+
+@router.delete(
+    "/sql-profile",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(_profiler_enabled)],
+)
+def reset_sql_profile(
+    ctx: BusinessContext = Depends(require_profiler_access),
+):
+    sql_profiler.reset()
+
+
+# ------------------------------------------------------------------ #
+#  Профили запросов (X-Profile: 1, app/core/profiling.py)
+# ------------------------------------------------------------------ #
+
+@router.get("/profiles")
+def list_profiles(
+    ctx: BusinessContext = Depends(require_profiler_access),
+):
+    """Последние профили процесса, новые первыми."""
+    return [profile.summary() for profile in profile_store.recent()]
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(
+    profile_id: int,
+    ctx: BusinessContext = Depends(require_profiler_access),
+):
+    """
+    Collapsed stacks («кадр;кадр;... число_сэмплов»): вход для
+    flamegraph.pl, speedscope, inferno.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile.collapsed())
+
+
+# ------------------------------------------------------------------ #
+#  Снимки кучи (TRACEMALLOC_ENABLED, app/core/memory.py)
+# ------------------------------------------------------------------ #
+
+def _tracemalloc_enabled() -> None:
+    if not tracemalloc.is_tracing():
+        raise HTTPException(status_code=404, detail="tracemalloc disabled")
+
+
+@router.post(
+    "/heap-snapshots",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(_tracemalloc_enabled)],
+)
+def take_heap_snapshot(
+    ctx: BusinessContext = Depends(require_profiler_access),
+):
+    """Снимок живых аллокаций процесса (хранятся последние HEAP_SNAPSHOTS_KEEP)."""
+    return heap_snapshots.take()
+
+
+@router.get("/heap-snapshots", dependencies=[Depends(_tracemalloc_enabled)])
+def list_heap_snapshots(
+    ctx: BusinessContext = Depends(require_profiler_access),
+):
+    return heap_snapshots.recent()
+
+
+@router.get("/heap-snapshots/{snapshot_id}/diff", dependencies=[Depends(_tracemalloc_enabled)])
+def diff_heap_snapshots(
+    snapshot_id: int,
+    target: Optional[int] = Query(None, description="Второй снимок; по умолчанию — текущая куча"),
+    key_type: str = Query("app", description="app | lineno | filename | traceback"),
+    top: int = Query(30, ge=1, le=500),
+    ctx: BusinessContext = Depends(require_profiler_access),
+):
+    """
+    Рост аллокаций от снимка snapshot_id до target по местам аллокации.
+    key_type=app группирует по ближайшей к аллокации строке кода проекта.
+    """
+    if key_type not in KEY_TYPES:
+        raise HTTPException(status_code=422, detail=f"key_type must be one of {', '.join(KEY_TYPES)}")
+    base = heap_snapshots.get(snapshot_id)
+    if base is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    target_snapshot = None
+    if target is not None:
+        target_snapshot = heap_snapshots.get(target)
+        if target_snapshot is None:
+            raise HTTPException(status_code=404, detail="Snapshot not found")
+    return heap_snapshots.diff(base, target_snapshot, key_type=key_type, top=top)
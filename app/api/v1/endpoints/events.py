@@ -0,0 +1,88 @@
+# app/api/v1/endpoints/events.py
+
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_business, BusinessContext
+from app.core.config import EVENTS_HEARTBEAT_SECONDS
+from app.core.events import event_bus, ChangeEvent
+from app.core.versions import change_versions
+
+router = APIRouter(tags=["Events"])
+
+
+@router.get(
+    "/events/stream",
+    summary="SSE-поток изменений слотов и бронирований",
+    response_class=StreamingResponse,
+)
+async def stream_events(
+    request: Request,
+    staff_id: int | None = Query(None, description="Только события сотрудника"),
+    db: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(get_current_business),
+):
+    """
+    Server-Sent Events: booking.created / confirmed / cancelled / expired,
+    schedule.changed. Событие resync означает, что клиент отстал и часть
+    событий потеряна — нужно перечитать данные целиком.
+
+    Шина событий — в памяти процесса: при нескольких воркерах подписчик
+    не увидит изменений, сделанных другими воркерами, поэтому поток
+    не открывается (503) и клиент остаётся на опросе.
+    """
+    # Соединение с БД нужно только для авторизации — не держим его
+    # открытым на всё время жизни стрима
+    db.close()
+    if not change_versions.authoritative:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Поток изменений недоступен при нескольких воркерах (WEB_CONCURRENCY > 1)",
+        )
+
+    subscription = event_bus.subscribe(ctx.business_id, staff_id=staff_id)
+
+    async def _stream():
+        try:
+            yield f"retry: {EVENTS_HEARTBEAT_SECONDS * 1000}\n\n"
+            while True:
+                events, overflowed = await subscription.next_batch(
+                    EVENTS_HEARTBEAT_SECONDS,
+                )
+                if await request.is_disconnected():
+                    break
+                if overflowed:
+                    yield _format("resync", {"reason": "overflow"})
+                for event in events:
+                    yield _format_event(event)
+                if not events and not overflowed:
+                    yield ": ping\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _format_event(event: ChangeEvent) -> str:
+    payload = {
+        "business_id": event.business_id,
+        "staff_id": event.staff_id,
+        **event.data,
+    }
+    return _format(event.type, payload, event_id=event.id)
+
+
+def _format(event_type: str, payload: dict, *, event_id: int | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(payload, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,74 @@
+# app/api/v1/endpoints/imports.py
+
+import io
+import tempfile
+from dataclasses import asdict
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, require_role, BusinessContext
+from app.core.config import IMPORT_MAX_BYTES, IMPORT_SPOOL_MEMORY_BYTES
+from app.models.business_user import BusinessRole
+from app.services.csv_import import ImportFormatError, import_csv
+
+router = APIRouter(tags=["Import"])
+
+
+@router.post(
+    "/imports/{entity}",
+    summary="Импорт клиентов, сотрудников или услуг из CSV",
+)
+async def import_entities(
+    entity: Literal["customers", "staff", "services"],
+    request: Request,
+    chunk_size: Optional[int] = None,
+    db: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(require_role(BusinessRole.ADMIN)),
+):
+    """
+    Тело запроса — CSV в UTF-8 (Content-Type: text/csv), первая строка —
+    заголовок с именами полей. Тело читается потоком во временный файл
+    (в памяти — до IMPORT_SPOOL_MEMORY_BYTES), затем разбирается
+    построчно и пишется пакетами. Ответ — отчёт с ошибками по строкам.
+    """
+    if chunk_size is not None and not 1 <= chunk_size <= 5000:
+        raise HTTPException(
+            status_code=422,
+            detail="chunk_size должен быть от 1 до 5000",
+        )
+
+    spool = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MEMORY_BYTES)
+    try:
+        size = 0
+        async for part in request.stream():
+            size += len(part)
+            if size > IMPORT_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Файл больше {IMPORT_MAX_BYTES} байт",
+                )
+            spool.write(part)
+        spool.seek(0)
+
+        # utf-8-sig: BOM из Excel не попадает в имя первой колонки
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            report = await run_in_threadpool(
+                import_csv,
+                db,
+                business_id=ctx.business_id,
+                entity=entity,
+                stream=stream,
+                chunk_size=chunk_size,
+            )
+        except ImportFormatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        finally:
+            stream.detach()
+    finally:
+        spool.close()
+
+    return asdict(report)
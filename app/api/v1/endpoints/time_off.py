@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_business, require_admission, BusinessContext
+from app.schemas.time_off import TimeOffBulkCreate, TimeOffBulkRead, TimeOffRead
+from app.repositories import time_off as repo
+from app.services.schedule_service import add_time_off, cancel_time_off
+
+
+router = APIRouter(tags=["Time Off"])
+
+
+@router.post(
+    "/time-off",
+    response_model=TimeOffBulkRead,
+    status_code=201,
+)
+def create_time_off(
+    payload: TimeOffBulkCreate,
+    session: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(require_admission("time_off.create")),
+):
+    """
+    Создаёт отгулы: каждый диапазон из ranges — для каждого сотрудника
+    из staff_ids. conflicts — действующие брони внутри новых отгулов;
+    они не отменяются, решение остаётся за менеджером.
+    """
+    try:
+        return add_time_off(
+            session,
+            business_id=ctx.business_id,
+            staff_ids=payload.staff_ids,
+            ranges=[(r.start_at, r.end_at) for r in payload.ranges],
+            reason=payload.reason,
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get(
+    "/time-off",
+    response_model=list[TimeOffRead],
+)
+def list_time_off(
+    staff_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    session: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(get_current_business),
+):
+    return repo.list_for_business(
+        session,
+        business_id=ctx.business_id,
+        staff_id=staff_id,
+        start=start,
+        end=end,
+    )
+
+
+@router.delete(
+    "/time-off/{time_off_id}",
+    response_model=TimeOffRead,
+)
+def delete_time_off(
+    time_off_id: int,
+    session: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(get_current_business),
+):
+    try:
+        return cancel_time_off(
+            session, business_id=ctx.business_id, time_off_id=time_off_id,
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_business, BusinessContext
+from app.api.deps import get_db, get_current_business, require_admission, BusinessContext
 from app.models.working_hours import WorkingHours
 from app.schemas.working_hours import (
     WorkingHoursCreate,
     WorkingHoursRead,
+    WorkingWeekUpdate,
 )
 from app.repositories import working_hours as repo
+from app.services.schedule_service import notify_schedule_changed, replace_working_week
 
 
 router = APIRouter(tags=["Working Hours"])
@@ -24,7 +26,33 @@ def create_working_hours(
     ctx: BusinessContext = Depends(get_current_business),
 ):
     wh = WorkingHours(**payload.dict(), business_id=ctx.business_id)
-    return repo.create(session=session, wh=wh)
+    wh = repo.create(session=session, wh=wh)
+    notify_schedule_changed(business_id=ctx.business_id, staff_id=wh.staff_id)
+    return wh
+
+
+@router.put(
+    "/working-hours/weekly",
+    response_model=list[WorkingHoursRead],
+)
+def replace_weekly_working_hours(
+    payload: WorkingWeekUpdate,
+    session: Session = Depends(get_db),
+    ctx: BusinessContext = Depends(require_admission("working_hours.weekly")),
+):
+    """
+    Заменяет весь недельный шаблон сотрудника одним запросом.
+    Возвращает шаблон целиком (неактивные дни — is_active=false).
+    """
+    try:
+        return replace_working_week(
+            session,
+            business_id=ctx.business_id,
+            staff_id=payload.staff_id,
+            days=[day.model_dump() for day in payload.days],
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get(
@@ -4,7 +4,7 @@ from app.api.v1.endpoints import businesses, auth, bookings, customers, business
 from app.api.v1.services import router as services_router
 from app.api.v1.staff import router as staff_router
 from app.api.v1 import schedule
-from app.api.v1.endpoints import working_hours
+from app.api.v1.endpoints import working_hours, events, time_off, imports, debug
 
 
 api_router = APIRouter(prefix="/api/v1")
@@ -32,6 +32,10 @@ api_router.include_router(services_router)
 api_router.include_router(staff_router)
 api_router.include_router(schedule.router)
 api_router.include_router(working_hours.router)
+api_router.include_router(time_off.router)
 api_router.include_router(bookings.router)
 api_router.include_router(customers.router)
 api_router.include_router(business_users.router)
+api_router.include_router(events.router)
+api_router.include_router(imports.router)
+api_router.include_router(debug.router)
@@ -2,23 +2,45 @@
 
 from datetime import date, datetime, timedelta
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_business, BusinessContext
+from app.api.deps import get_db, require_admission, BusinessContext
+from app.api.etag import staff_etag, cache_headers, is_not_modified, not_modified
+from app.core.singleflight import SingleFlight
+from app.core.tracing import span
+from app.core.versions import change_versions
 from app.services.schedule_service import ScheduleService
-from app.services.booking_service import SLOT_STEP_MINUTES, BOOKING_HORIZON_DAYS
+from app.services.slot_tokens import issue_slot_token, token_window
+from app.services.booking_service import (
+    SLOT_STEP_MINUTES,
+    BOOKING_HORIZON_DAYS,
+    MIN_LEAD_TIME_MINUTES,
+    SERIES_HORIZON_DAYS,
+)
 
 router = APIRouter(tags=["Schedule"])
 
+# Одинаковые конкурентные запросы слотов выполняют один расчёт на всех
+slots_flight: SingleFlight = SingleFlight()
+
 
 @router.get("/schedule/staff/{staff_id}/slots")
 def get_staff_slots(
+    request: Request,
+    response: Response,
     staff_id: int,
     service_id: int = Query(..., description="Service ID"),
     day: date = Query(..., description="Target day (YYYY-MM-DD)"),
+    include_tokens: bool = Query(
+        False, description="Подписанный токен на каждый слот (для POST /bookings)",
+    ),
+    series: bool = Query(
+        False,
+        description="Горизонт серий (SERIES_HORIZON_DAYS): серии и перенос их повторений",
+    ),
     db: Session = Depends(get_db),
-    ctx: BusinessContext = Depends(get_current_business),
+    ctx: BusinessContext = Depends(require_admission("schedule.slots")),
 ):
     now = datetime.utcnow()
     today = now.date()
@@ -30,33 +52,79 @@ def get_staff_slots(
             detail="Нельзя запросить слоты за прошедший день",
         )
 
-    # Горизонт → 400
-    horizon_date = (now + timedelta(days=BOOKING_HORIZON_DAYS)).date()
+    # Горизонт → 400. Внутри него слоты от series не зависят,
+    # поэтому флаг не входит ни в ETag, ни в ключ single-flight
+    horizon_days = SERIES_HORIZON_DAYS if series else BOOKING_HORIZON_DAYS
+    horizon_date = (now + timedelta(days=horizon_days)).date()
     if day > horizon_date:
         raise HTTPException(
             status_code=400,
-            detail=f"Горизонт бронирования — не дальше {BOOKING_HORIZON_DAYS} дней вперёд",
+            detail=f"Горизонт бронирования — не дальше {horizon_days} дней вперёд",
         )
 
+    # Пока lead time «задевает» этот день, слоты зависят от текущего
+    # времени — добавляем в ETag минутную метку
+    lead_day = (now + timedelta(minutes=MIN_LEAD_TIME_MINUTES)).date()
+    time_bucket = now.strftime("%Y%m%d%H%M") if day <= lead_day else "0"
+    # Токены детерминированы внутри окна выдачи
+    tokens_bucket = f"t{token_window(now)}" if include_tokens else "-"
+
+    # Один снимок версий — до расчёта — на ETag, ключ single-flight и
+    # токены: запрос после брони не присоединится к расчёту, начатому
+    # до неё, и не отдаст старые слоты под новым ETag. Токены не должны
+    # подписать устаревшее расписание.
+    staff_version = change_versions.staff(ctx.business_id, staff_id, now=now)
+    schedule_version = change_versions.schedule(ctx.business_id, staff_id)
+    etag = staff_etag(
+        ctx.business_id, staff_id, time_bucket, tokens_bucket, version=staff_version,
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
     schedule_service = ScheduleService(slot_step_minutes=SLOT_STEP_MINUTES)
 
     try:
-        slots = schedule_service.get_slots_for_day(
-            session=db,
-            business_id=ctx.business_id,
-            staff_id=staff_id,
-            service_id=service_id,
-            day=day,
-            now=now,
-        )
+        with span("slots"):
+            # time_bucket: now лидера определяет, какие слоты отрезал lead time
+            slots = slots_flight.do(
+                (ctx.business_id, staff_id, service_id, day, staff_version, schedule_version, time_bucket),
+                lambda: schedule_service.get_slots_for_day(
+                    session=db,
+                    business_id=ctx.business_id,
+                    staff_id=staff_id,
+                    service_id=service_id,
+                    day=day,
+                    now=now,
+                    horizon_days=horizon_days,
+                ),
+            )
     except LookupError as e:
         # например, если StaffService не найден
         raise HTTPException(status_code=404, detail=str(e))
 
+    response.headers.update(cache_headers(etag))
+    if not include_tokens:
+        return [
+            {
+                "start": slot.start,
+                "end": slot.end,
+            }
+            for slot in slots
+        ]
+
     return [
         {
             "start": slot.start,
             "end": slot.end,
+            "token": issue_slot_token(
+                business_id=ctx.business_id,
+                staff_id=staff_id,
+                service_id=service_id,
+                start_at=slot.start,
+                duration_minutes=int((slot.end - slot.start).total_seconds() // 60),
+                schedule_version=schedule_version,
+                now=now,
+            ),
         }
         for slot in slots
     ]
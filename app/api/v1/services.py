@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_business, BusinessContext
+from app.api.etag import business_etag, cache_headers, is_not_modified, not_modified
 from app.schemas.services import ServiceCreate, ServiceUpdate, ServiceRead
 from app.services.services import ServiceService
 from app.schemas.staff import StaffRead
@@ -28,10 +29,17 @@ def create_service(
     response_model=list[ServiceRead],
 )
 def list_services(
+    request: Request,
+    response: Response,
     only_active: bool = True,
     db: Session = Depends(get_db),
     ctx: BusinessContext = Depends(get_current_business),
 ):
+    etag = business_etag(ctx.business_id)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+
     return ServiceService.list_services(db, only_active, business_id=ctx.business_id)
 
 
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_business, BusinessContext
+from app.api.etag import business_etag, cache_headers, is_not_modified, not_modified
 from app.schemas.staff import StaffCreate, StaffUpdate, StaffRead
 from app.services.staff import StaffService
 from app.models.staff_service import StaffService as StaffServiceModel
@@ -9,6 +10,7 @@ from app.schemas.staff_service import StaffServiceRead
 from app.models.service import Service
 from app.schemas.services import ServiceRead
 from app.models.staff import Staff
+from app.services.schedule_service import notify_schedule_changed
 
 
 router = APIRouter(tags=["Staff"])
@@ -32,10 +34,17 @@ def create_staff(
     response_model=list[StaffRead],
 )
 def list_staff(
+    request: Request,
+    response: Response,
     only_active: bool = True,
     db: Session = Depends(get_db),
     ctx: BusinessContext = Depends(get_current_business),
 ):
+    etag = business_etag(ctx.business_id)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+
     return StaffService.list_staff(db, only_active, business_id=ctx.business_id)
 
 
@@ -125,6 +134,7 @@ def attach_service_to_staff(
 
     db.add(staff_service)
     db.commit()
+    notify_schedule_changed(business_id=business_id, staff_id=staff_id)
 
     return {"detail": "Service attached to staff"}
 
@@ -158,6 +168,7 @@ def detach_service_from_staff(
 
     staff_service.is_active = False
     db.commit()
+    notify_schedule_changed(business_id=ctx.business_id, staff_id=staff_id)
 
 
 @router.get(
@@ -175,16 +186,25 @@ def list_services_for_staff(
     if not staff:
         raise HTTPException(status_code=404, detail="Staff not found")
 
+    rows = (
+        db.query(StaffServiceModel, Service.name)
+        .join(Service, Service.id == StaffServiceModel.service_id)
+        .filter(
+            StaffServiceModel.staff_id == staff.id,
+            StaffServiceModel.is_active == True,
+        )
+        .order_by(StaffServiceModel.id)
+        .all()
+    )
     return [
         StaffServiceRead(
-            service_id=ss.service.id,
-            service_name=ss.service.name,
+            service_id=ss.service_id,
+            service_name=service_name,
             price=ss.price,
             duration=ss.duration,
             is_active=ss.is_active,
         )
-        for ss in staff.staff_services
-        if ss.is_active
+        for ss, service_name in rows
     ]
 
 
@@ -0,0 +1,164 @@
+# app/core/admission.py
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+class AdmissionRejected(Exception):
+    """Запрос отклонён до выполнения (429 — rate limit, 503 — concurrency)."""
+
+    def __init__(self, status_code: int, retry_after: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+class TokenBucket:
+    """Классический token bucket: rate токенов/сек, ёмкость burst."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def try_take(self, cost: float, now: float) -> float:
+        """
+        Списывает cost токенов. Возвращает 0, если получилось,
+        иначе — сколько секунд ждать до появления нужных токенов.
+        """
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        """Запас к моменту now восстановлен полностью."""
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+@dataclass
+class _TenantState:
+    bucket: Optional[TokenBucket]
+    in_flight: int = 0
+
+
+class TenantAdmission:
+    """
+    Admission control per tenant (business_id):
+
+    - token bucket: не больше rate «единиц веса» в секунду (burst — запас);
+      превышение → 429 + Retry-After;
+    - лимит конкурентности: не больше max_concurrency единиц веса
+      одновременно в обработке; превышение → 503 + Retry-After.
+
+    Отказ происходит сразу, без ожидания: агрессивный tenant получает
+    быстрые отказы и не занимает threadpool и write-lock SQLite
+    за счёт остальных.
+
+    Состояние tenant'а без запросов в обработке и с полным bucket'ом
+    неотличимо от нового, поэтому такие записи периодически (не чаще
+    раза в burst / rate секунд) удаляются — память не растёт с числом
+    когда-либо виденных бизнесов.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate_per_second: float,
+        burst: float,
+        max_concurrency: int,
+    ) -> None:
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._tenants: dict[int, _TenantState] = {}
+        # За burst / rate секунд простоя bucket заполняется целиком
+        self._sweep_interval = max(burst / rate_per_second, 1.0) if rate_per_second > 0 else 1.0
+        self._next_sweep = time.monotonic() + self._sweep_interval
+        self.rejected_rate = 0
+        self.rejected_concurrency = 0
+
+    def acquire(self, tenant_id: int, weight: int = 1) -> int:
+        """
+        Резервирует weight единиц для запроса tenant_id.
+        Возвращает фактически занятый вес (передать в release).
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep_locked(now)
+            state = self._tenants.get(tenant_id)
+            if state is None:
+                bucket = (
+                    TokenBucket(self.rate_per_second, self.burst, now)
+                    if self.rate_per_second > 0 else None
+                )
+                state = self._tenants[tenant_id] = _TenantState(bucket=bucket)
+
+            slots = 0
+            if self.max_concurrency > 0:
+                slots = min(weight, self.max_concurrency)
+                if state.in_flight + slots > self.max_concurrency:
+                    self.rejected_concurrency += 1
+                    raise AdmissionRejected(
+                        503, 1, "Too many concurrent requests for this business",
+                    )
+
+            if state.bucket is not None:
+                wait = state.bucket.try_take(min(weight, self.burst), now)
+                if wait > 0:
+                    self.rejected_rate += 1
+                    raise AdmissionRejected(
+                        429, max(1, math.ceil(wait)),
+                        "Rate limit exceeded for this business",
+                    )
+
+            state.in_flight += slots
+            return slots
+
+    def release(self, tenant_id: int, slots: int) -> None:
+        if slots <= 0:
+            return
+        with self._lock:
+            state = self._tenants.get(tenant_id)
+            if state is not None:
+                state.in_flight = max(0, state.in_flight - slots)
+
+    def tenant_count(self) -> int:
+        """Сколько tenant'ов сейчас хранят состояние."""
+        with self._lock:
+            return len(self._tenants)
+
+    def _sweep_locked(self, now: float) -> None:
+        idle = [
+            tenant_id
+            for tenant_id, state in self._tenants.items()
+            if state.in_flight == 0 and (state.bucket is None or state.bucket.is_full(now))
+        ]
+        for tenant_id in idle:
+            del self._tenants[tenant_id]
+        self._next_sweep = now + self._sweep_interval
+
+
+def parse_weights(raw: str) -> dict[str, int]:
+    """"bookings.create=3,schedule.slots=2" → {"bookings.create": 3, ...}"""
+    weights: dict[str, int] = {}
+    for part in raw.split(","):
+        name, sep, value = part.strip().partition("=")
+        if sep and name:
+            weights[name.strip()] = int(value)
+    return weights
@@ -0,0 +1,113 @@
+import os
+
+# --- База данных ---
+# По умолчанию — SQLite-файл в текущем каталоге. Бенчмарки направляют
+# приложение на отдельный файл с синтетическими данными.
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+
+# --- Процессы приложения ---
+# Число воркеров; uvicorn --workers и gunicorn берут значение по
+# умолчанию из WEB_CONCURRENCY — задавайте число воркеров через неё.
+# Версии изменений (ETag, slot-токены) и шина SSE-событий живут в памяти
+# процесса: при нескольких воркерах ответы 304, доверие slot-токенам
+# и SSE-поток выключаются.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# --- HOLD expiry sweeper ---
+# Как часто фоновая задача переводит истёкшие HOLD в EXPIRED (секунды).
+# 0 — отключить.
+HOLD_SWEEP_INTERVAL_SECONDS = int(os.getenv("HOLD_SWEEP_INTERVAL_SECONDS", "15"))
+
+# --- Server-Sent Events ---
+# Размер очереди одного подписчика. При переполнении очередь сбрасывается,
+# и клиент получает событие resync.
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+EVENTS_HEARTBEAT_SECONDS = int(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+# --- Admission control (per tenant = business_id) ---
+# Token bucket: единиц веса в секунду и запас (burst). 0 — без rate limit.
+TENANT_RATE_PER_SECOND = float(os.getenv("TENANT_RATE_PER_SECOND", "50"))
+TENANT_BURST = float(os.getenv("TENANT_BURST", "100"))
+# Сколько единиц веса tenant может обрабатывать одновременно. 0 — без лимита.
+TENANT_MAX_CONCURRENCY = int(os.getenv("TENANT_MAX_CONCURRENCY", "16"))
+# Вес эндпоинтов: "имя=вес,...". Не указанные — вес 1.
+ADMISSION_WEIGHTS = os.getenv(
+    "ADMISSION_WEIGHTS",
+    "bookings.list=2,bookings.create=3,bookings.confirm=2,"
+    "bookings.cancel=2,bookings.reschedule=3,bookings.batch=6,"
+    "bookings.series=8,bookings.bulk=6,schedule.slots=2,time_off.create=4,"
+    "working_hours.weekly=4",
+)
+
+# --- SQLITE_BUSY retry для мутаций бронирований ---
+BUSY_RETRY_MAX_ATTEMPTS = int(os.getenv("BUSY_RETRY_MAX_ATTEMPTS", "4"))
+BUSY_RETRY_BASE_DELAY_SECONDS = float(os.getenv("BUSY_RETRY_BASE_DELAY_SECONDS", "0.05"))
+BUSY_RETRY_MAX_DELAY_SECONDS = float(os.getenv("BUSY_RETRY_MAX_DELAY_SECONDS", "1.0"))
+BUSY_RETRY_DEADLINE_SECONDS = float(os.getenv("BUSY_RETRY_DEADLINE_SECONDS", "8.0"))
+
+# --- Idempotency-Key ---
+# Сколько часов хранится ответ на запрос с Idempotency-Key.
+IDEMPOTENCY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+
+# --- Slot tokens ---
+# Сколько секунд (минимум) действителен подписанный токен слота.
+SLOT_TOKEN_TTL_SECONDS = int(os.getenv("SLOT_TOKEN_TTL_SECONDS", "300"))
+
+# --- CSV import ---
+# Строк в одном пакете (один executemany + COMMIT).
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+# Максимальный размер загружаемого файла (байты) и сколько из него
+# держать в памяти, прежде чем сбросить во временный файл.
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(20 * 1024 * 1024)))
+IMPORT_SPOOL_MEMORY_BYTES = int(os.getenv("IMPORT_SPOOL_MEMORY_BYTES", str(1024 * 1024)))
+# Сколько ошибок строк попадает в отчёт (остальные только считаются).
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+
+# --- Запись трафика (record & replay) ---
+# Путь к JSONL-журналу запросов; пусто — запись выключена.
+TRAFFIC_RECORD_PATH = os.getenv("TRAFFIC_RECORD_PATH", "")
+# Доля записываемых запросов (0..1).
+TRAFFIC_RECORD_SAMPLE_RATE = float(os.getenv("TRAFFIC_RECORD_SAMPLE_RATE", "1.0"))
+
+# --- Трассировка запросов ---
+# Заголовок Server-Timing с разбивкой времени запроса по спанам —
+# только пользователям из PROFILER_ALLOWED_USER_IDS. Выключен по
+# умолчанию: трасса на каждый запрос — работа, которой нет при 0.
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "0") == "1"
+# JSONL-файл трасс (все спаны запроса) и доля запросов, попадающих в него.
+# Пустой путь или 0 — трассы не пишутся.
+TRACE_PATH = os.getenv("TRACE_PATH", "")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+
+# --- SQL-профайлер ---
+# Статистика SQL по маршрутам (GET /debug/sql-profile), opt-in: тексты
+# запросов видны всем процессам, доступ — через PROFILER_ALLOWED_USER_IDS.
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "0") == "1"
+# Запросы дольше порога (мс) пишутся в лог вместе с EXPLAIN QUERY PLAN.
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+
+# --- Метрики ---
+# GET /metrics (Prometheus text format) и сбор латентности по маршрутам.
+# Opt-in: метрики видят трафик и объёмы броней всех бизнесов.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+# Если задан — /metrics требует «Authorization: Bearer <METRICS_TOKEN>»
+# (bearer_token в scrape_config Prometheus). Пусто — без проверки.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# --- Сэмплирующий профайлер запросов ---
+# Id пользователей (через запятую), чьи запросы с «X-Profile: 1»
+# профилируются. Пусто — профайлер выключен.
+PROFILER_ALLOWED_USER_IDS = os.getenv("PROFILER_ALLOWED_USER_IDS", "")
+# Шаг сэмплирования (мс) и сколько последних профилей хранить в памяти.
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "2"))
+PROFILER_KEEP = int(os.getenv("PROFILER_KEEP", "20"))
+
+# --- Отслеживание аллокаций (tracemalloc) ---
+# Пик аллокаций на запрос и снимки кучи (/debug/heap-snapshots).
+# Заметно замедляет процесс — включать для диагностики.
+TRACEMALLOC_ENABLED = os.getenv("TRACEMALLOC_ENABLED", "0") == "1"
+# Глубина стека, запоминаемого для каждой аллокации (для группировки
+# по коду проекта нужно больше 1).
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "16"))
+# Сколько снимков кучи хранить в памяти.
+HEAP_SNAPSHOTS_KEEP = int(os.getenv("HEAP_SNAPSHOTS_KEEP", "3"))
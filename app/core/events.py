@@ -0,0 +1,162 @@
+# app/core/events.py
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from app.core.config import EVENTS_QUEUE_SIZE
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    Событие об изменении данных бизнеса.
+
+    type:
+        booking.created / booking.confirmed / booking.cancelled /
+        booking.expired / schedule.changed
+    staff_id:
+        сотрудник, чья доступность изменилась (None — весь бизнес)
+    """
+    type: str
+    business_id: int
+    staff_id: Optional[int] = None
+    data: dict[str, Any] = field(default_factory=dict)
+    id: int = 0
+
+
+class Subscription:
+    """
+    Подписка одного SSE-клиента.
+
+    Очередь ограничена maxsize. Публикация никогда не блокирует писателя:
+    если клиент не успевает читать и очередь переполнена, накопленные
+    события сбрасываются и выставляется флаг overflowed — клиент получит
+    resync и перечитает данные целиком.
+    """
+
+    def __init__(
+        self,
+        *,
+        business_id: int,
+        staff_id: Optional[int],
+        maxsize: int,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self.business_id = business_id
+        self.staff_id = staff_id
+        self.overflowed = False
+        self.dropped = 0
+        self._maxsize = maxsize
+        self._queue: deque[ChangeEvent] = deque()
+        self._lock = threading.Lock()
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+
+    def matches(self, event: ChangeEvent) -> bool:
+        if self.staff_id is None or event.staff_id is None:
+            return True
+        return event.staff_id == self.staff_id
+
+    def offer(self, event: ChangeEvent) -> None:
+        """Вызывается из любого потока (в т.ч. threadpool)."""
+        with self._lock:
+            if len(self._queue) >= self._maxsize:
+                self.dropped += len(self._queue) + 1
+                self._queue.clear()
+                self.overflowed = True
+            else:
+                self._queue.append(event)
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # event loop уже закрыт — подписчик отключился
+            pass
+
+    async def next_batch(self, timeout: float) -> tuple[list[ChangeEvent], bool]:
+        """
+        Ждёт события не дольше timeout секунд.
+        Возвращает (события, был_ли_overflow). Пустой список — пора слать heartbeat.
+        """
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return [], False
+        with self._lock:
+            self._wakeup.clear()
+            events = list(self._queue)
+            self._queue.clear()
+            overflowed, self.overflowed = self.overflowed, False
+        return events, overflowed
+
+
+class EventBus:
+    """In-process pub/sub: публикаторы — сервисы, подписчики — SSE-стримы."""
+
+    def __init__(self, *, queue_size: int = 256) -> None:
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._seq = itertools.count(1)
+
+    def subscribe(
+        self,
+        business_id: int,
+        *,
+        staff_id: Optional[int] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> Subscription:
+        sub = Subscription(
+            business_id=business_id,
+            staff_id=staff_id,
+            maxsize=self._queue_size,
+            loop=loop or asyncio.get_running_loop(),
+        )
+        with self._lock:
+            self._subscribers.setdefault(business_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.business_id)
+            if subs is None:
+                return
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[sub.business_id]
+
+    def publish(
+        self,
+        type: str,
+        *,
+        business_id: int,
+        staff_id: Optional[int] = None,
+        **data: Any,
+    ) -> None:
+        with self._lock:
+            subs = list(self._subscribers.get(business_id, ()))
+        if not subs:
+            return
+        event = ChangeEvent(
+            type=type,
+            business_id=business_id,
+            staff_id=staff_id,
+            data=data,
+            id=next(self._seq),
+        )
+        for sub in subs:
+            if sub.matches(event):
+                sub.offer(event)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+# Единая шина событий процесса
+event_bus = EventBus(queue_size=EVENTS_QUEUE_SIZE)
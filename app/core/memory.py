@@ -0,0 +1,212 @@
+# app/core/memory.py
+
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Optional
+
+from app.core.metrics import histogram
+from app.core.tracing import current_trace
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+
+# Не показывать в диффах аллокации самого tracemalloc и импорта модулей
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+KEY_TYPES = ("app", "lineno", "filename", "traceback")
+
+http_request_memory_peak = histogram(
+    "http_request_memory_peak_bytes",
+    "Пик аллокаций Python за запрос (tracemalloc; только запросы без перекрытия с другими)",
+    ("method", "route"),
+    buckets=tuple(float(4 ** i * 64 * 1024) for i in range(8)),  # 64 КиБ … 1 ГиБ
+)
+
+
+class _Measurement:
+    __slots__ = ("start", "overlapped")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.overlapped = False
+
+
+class AllocationTracker:
+    """
+    Пик аллокаций на запрос по tracemalloc.
+
+    tracemalloc считает память всего процесса, поэтому пик запроса —
+    максимум traced-памяти с его начала минус значение на старте.
+    Пик сбрасывается, когда начинается запрос, а других в обработке нет.
+    Если запросы перекрылись, их пики общие: measurement помечается
+    overlapped, и значение — только верхняя граница.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active: set[_Measurement] = set()
+
+    def begin(self) -> _Measurement:
+        with self._lock:
+            if not self._active:
+                tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            measurement = _Measurement(current)
+            if self._active:
+                measurement.overlapped = True
+                for other in self._active:
+                    other.overlapped = True
+            self._active.add(measurement)
+        return measurement
+
+    def end(self, measurement: _Measurement) -> dict:
+        """{"peak_bytes", "retained_bytes", "overlapped"}."""
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            self._active.discard(measurement)
+        return {
+            "peak_bytes": max(peak - measurement.start, 0),
+            "retained_bytes": current - measurement.start,
+            "overlapped": measurement.overlapped,
+        }
+
+
+class MemoryTrackingMiddleware:
+    """
+    ASGI-middleware: пик и остаток аллокаций запроса. Пишется в
+    гистограмму http_request_memory_peak_bytes рядом с
+    http_request_duration_seconds (только точные замеры, без
+    перекрытия) и в текущую трассу (поле mem JSONL-трассы).
+    Ставится внутрь ServerTimingMiddleware.
+    """
+
+    def __init__(self, app, *, tracker: AllocationTracker) -> None:
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not tracemalloc.is_tracing():
+            await self.app(scope, receive, send)
+            return
+        measurement = self.tracker.begin()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            memory = self.tracker.end(measurement)
+            route = scope.get("route")
+            if not memory["overlapped"] and route is not None:
+                http_request_memory_peak.observe(memory["peak_bytes"], scope["method"], route.path)
+            trace = current_trace()
+            if trace is not None:
+                trace.memory = memory
+
+
+class HeapSnapshots:
+    """
+    Снимки tracemalloc (последние keep) и их сравнение по местам
+    аллокации. Снимок содержит все живые аллокации процесса, поэтому
+    их хранится мало.
+    """
+
+    def __init__(self, *, keep: int = 3) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._snapshots: deque[tuple[dict, tracemalloc.Snapshot]] = deque(maxlen=keep)
+
+    def take(self) -> dict:
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        summary = {
+            "taken_at": round(time.time(), 3),
+            "traced_bytes": sum(trace.size for trace in snapshot.traces),
+            "traceback_limit": snapshot.traceback_limit,
+        }
+        with self._lock:
+            summary = {"id": next(self._ids), **summary}
+            self._snapshots.append((summary, snapshot))
+        return summary
+
+    def recent(self) -> list[dict]:
+        with self._lock:
+            return [summary for summary, _ in reversed(self._snapshots)]
+
+    def get(self, snapshot_id: int) -> Optional[tracemalloc.Snapshot]:
+        with self._lock:
+            return next((s for summary, s in self._snapshots if summary["id"] == snapshot_id), None)
+
+    def diff(
+        self,
+        base: tracemalloc.Snapshot,
+        target: Optional[tracemalloc.Snapshot] = None,
+        *,
+        key_type: str = "app",
+        top: int = 30,
+    ) -> list[dict]:
+        """
+        Разница target − base (target по умолчанию — снимок «сейчас») по
+        местам аллокации, крупнейший рост первым.
+
+        key_type:
+            app       — ближайший к месту аллокации кадр кода проекта
+                        (какой репозиторий/эндпоинт материализует);
+                        нужен TRACEMALLOC_FRAMES > 1
+            lineno, filename, traceback — как в tracemalloc
+        """
+        if target is None:
+            target = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        if key_type != "app":
+            stats = target.compare_to(base, key_type)
+            return [_stat_row(_format_traceback(s.traceback, key_type), s) for s in stats[:top]]
+
+        grouped: dict[str, list[int]] = {}
+        for stat in target.compare_to(base, "traceback"):
+            site = _app_site(stat.traceback)
+            row = grouped.setdefault(site, [0, 0, 0, 0])
+            row[0] += stat.size_diff
+            row[1] += stat.count_diff
+            row[2] += stat.size
+            row[3] += stat.count
+        ranked = sorted(grouped.items(), key=lambda item: abs(item[1][0]), reverse=True)
+        return [
+            {"site": site, "size_diff": size_diff, "count_diff": count_diff, "size": size, "count": count}
+            for site, (size_diff, count_diff, size, count) in ranked[:top]
+        ]
+
+
+def _stat_row(site: str, stat) -> dict:
+    return {
+        "site": site,
+        "size_diff": stat.size_diff,
+        "count_diff": stat.count_diff,
+        "size": stat.size,
+        "count": stat.count,
+    }
+
+
+def _short(filename: str) -> str:
+    return filename[len(_ROOT):] if filename.startswith(_ROOT) else filename
+
+
+def _format_traceback(traceback: tracemalloc.Traceback, key_type: str) -> str:
+    if key_type == "filename":
+        return _short(traceback[0].filename)
+    if key_type == "lineno":
+        return f"{_short(traceback[0].filename)}:{traceback[0].lineno}"
+    return " <- ".join(f"{_short(frame.filename)}:{frame.lineno}" for frame in reversed(traceback))
+
+
+def _app_site(traceback: tracemalloc.Traceback) -> str:
+    """Самый глубокий кадр кода проекта (кадры — от старого к новому)."""
+    for frame in reversed(traceback):
+        if frame.filename.startswith(_ROOT) and os.sep + "site-packages" + os.sep not in frame.filename:
+            return f"{_short(frame.filename)}:{frame.lineno}"
+    return f"(вне проекта) {_short(traceback[-1].filename)}:{traceback[-1].lineno}"
@@ -0,0 +1,334 @@
+# app/core/metrics.py
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+import weakref
+from typing import Callable, Iterable, Mapping, Union
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Границы бакетов латентности (секунды) — стандартные для Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Маршрут запросов, не сопоставленных ни с одним роутом (404 на
+# произвольные пути): один label вместо неограниченного числа путей
+UNMATCHED_ROUTE = "(unmatched)"
+
+LabelValues = tuple[str, ...]
+
+
+class _Shards:
+    """
+    Значения метрики по потокам. Каждый поток пишет только в свой dict
+    (без блокировок: под GIL владелец — единственный писатель), сбор
+    копирует все dict'ы. Блокировка берётся лишь при первой записи
+    потока и при сборе. Dict'ы завершившихся потоков (threadpool
+    пересоздаёт рабочие потоки) при сборе сливаются в retired.
+    """
+
+    def __init__(self, merge: Callable[[dict, dict], None]) -> None:
+        self._merge = merge
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: list[tuple[weakref.ref, dict]] = []
+        self._retired: dict = {}
+
+    def local(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values: dict = {}
+            with self._lock:
+                self._shards.append((weakref.ref(threading.current_thread()), values))
+            self._local.values = values
+            return values
+
+    def collect(self) -> dict:
+        with self._lock:
+            alive = []
+            for thread_ref, values in self._shards:
+                thread = thread_ref()
+                if thread is None or not thread.is_alive():
+                    self._merge(self._retired, values)
+                else:
+                    alive.append((thread_ref, values))
+            self._shards = alive
+            result: dict = {}
+            self._merge(result, self._retired)
+            for _, values in alive:
+                self._merge(result, dict(values))
+            return result
+
+
+def _merge_numbers(into: dict, values: dict) -> None:
+    for key, value in values.items():
+        into[key] = into.get(key, 0) + value
+
+
+def _merge_histograms(into: dict, values: dict) -> None:
+    for key, counts in values.items():
+        current = into.get(key)
+        if current is None:
+            into[key] = list(counts)
+        else:
+            for i, value in enumerate(counts):
+                current[i] += value
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[tuple[str, LabelValues, tuple[tuple[str, str], ...], float]]:
+        """(суффикс имени, значения label'ов, доп. label'ы, значение)."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Монотонный счётчик: inc(*label_values, amount=1). Имя — с суффиксом _total."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._shards = _Shards(_merge_numbers)
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        values = self._shards.local()
+        values[labels] = values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self._shards.collect().items()):
+            yield "", labels, (), value
+
+
+class Gauge(Counter):
+    """Текущее значение, изменяемое inc/dec (запросы в обработке и т.п.)."""
+
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """
+    Гистограмма: observe(value, *label_values). На набор label'ов —
+    список [счётчики бакетов..., +Inf, сумма]; бакеты кумулятивными
+    становятся только при выводе.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = _Shards(_merge_histograms)
+
+    def observe(self, value: float, *labels: str) -> None:
+        values = self._shards.local()
+        counts = values.get(labels)
+        if counts is None:
+            counts = values[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def samples(self):
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for labels, counts in sorted(self._shards.collect().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield "_bucket", labels, (("le", bound),), cumulative
+            yield "_sum", labels, (), counts[-1]
+            yield "_count", labels, (), cumulative
+
+
+class CallbackMetric(_Metric):
+    """
+    Значение, вычисляемое при сборе: fn() → число или
+    {значения label'ов: число}. Для статистики, которая уже ведётся
+    в другом месте (пул соединений, кэши), — нулевая цена на горячем пути.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        fn: Callable[[], Union[float, Mapping[LabelValues, float]]],
+        *,
+        type: str = "gauge",
+        labelnames: Iterable[str] = (),
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.type = type
+        self.fn = fn
+
+    def samples(self):
+        value = self.fn()
+        items = value.items() if isinstance(value, Mapping) else [((), value)]
+        for labels, number in items:
+            yield "", labels, (), number
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Text exposition format Prometheus 0.0.4."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, extra, value in metric.samples():
+                pairs = [*zip(metric.labelnames, labels), *extra]
+                label_text = ",".join(f'{key}="{_escape_label(str(val))}"' for key, val in pairs)
+                name = metric.name + suffix
+                lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if label_text else f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+
+def counter(name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+    return registry.register(Counter(name, help, labelnames))
+
+
+def gauge(name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+    return registry.register(Gauge(name, help, labelnames))
+
+
+def histogram(name: str, help: str, labelnames: Iterable[str] = (), **kwargs) -> Histogram:
+    return registry.register(Histogram(name, help, labelnames, **kwargs))
+
+
+def callback(name: str, help: str, fn, **kwargs) -> CallbackMetric:
+    return registry.register(CallbackMetric(name, help, fn, **kwargs))
+
+
+# --- Метрики, которые пишутся на горячем пути ---
+
+http_request_duration = histogram(
+    "http_request_duration_seconds",
+    "Длительность обработки HTTP-запроса по маршруту",
+    ("method", "route"),
+)
+http_requests = counter(
+    "http_requests_total",
+    "HTTP-запросы по маршруту и коду ответа",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = gauge(
+    "http_requests_in_flight",
+    "HTTP-запросы в обработке",
+)
+db_pool_checkout_wait = histogram(
+    "db_pool_checkout_wait_seconds",
+    "Ожидание соединения из пула SQLAlchemy",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+db_pool_checkout_timeouts = counter(
+    "db_pool_checkout_timeouts_total",
+    "Запросы соединения, не дождавшиеся свободного в пуле (pool_timeout)",
+)
+sqlite_write_lock_wait = histogram(
+    "sqlite_write_lock_wait_seconds",
+    "Ожидание BEGIN IMMEDIATE (write-lock SQLite)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0),
+)
+sqlite_write_lock_hold = histogram(
+    "sqlite_write_lock_hold_seconds",
+    "Удержание write-lock SQLite: от BEGIN IMMEDIATE до COMMIT/ROLLBACK",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0),
+)
+booking_events = counter(
+    "booking_events_total",
+    "Изменения бронирований: booking.created, booking.expired, ...",
+    ("event",),
+)
+booking_rejections = counter(
+    "booking_rejections_total",
+    "Отказы в операциях с бронированиями: slot_unavailable / invalid_state (409), busy (503)",
+    ("reason",),
+)
+etag_checks = counter(
+    "etag_checks_total",
+    "Проверки If-None-Match: hit — ответ 304, miss — полный ответ",
+    ("result",),
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware: длительность и код ответа по шаблону маршрута,
+    число запросов в обработке. Длительность — до конца отправки тела.
+    """
+
+    def __init__(self, app, *, exclude_paths: Iterable[str] = ("/metrics",)) -> None:
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            http_request_duration.observe(elapsed, scope["method"], route_path)
+            http_requests.inc(scope["method"], route_path, str(status_code))
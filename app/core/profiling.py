@@ -0,0 +1,219 @@
+# app/core/profiling.py
+
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter, deque
+from contextvars import Context, ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+try:
+    from anyio._backends._asyncio import WorkerThread as _AnyioWorkerThread
+except ImportError:  # другая версия anyio: sync-часть запроса не сэмплируется
+    _AnyioWorkerThread = None
+
+# Код цикла рабочего потока anyio: его локальная context — копия
+# контекста запроса, переданная в run_in_threadpool
+_WORKER_RUN_CODE = getattr(getattr(_AnyioWorkerThread, "run", None), "__code__", None)
+
+# Заголовок, включающий профилирование запроса
+PROFILE_HEADER = b"x-profile"
+
+_SITE_MARKERS = ("site-packages" + os.sep, "dist-packages" + os.sep)
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+_STDLIB = sysconfig.get_paths()["stdlib"] + os.sep
+
+
+@dataclass
+class Profile:
+    """
+    Профиль одного запроса: stacks — «кадр;кадр;...» → число сэмплов
+    (collapsed stacks: flamegraph.pl, speedscope, inferno).
+    """
+
+    id: int
+    method: str
+    route: str
+    interval: float
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "route": self.route,
+            "started_at": round(self.started_at, 3),
+            "ms": round(self.duration * 1000, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+        }
+
+
+_active: ContextVar[Optional[Profile]] = ContextVar("profile", default=None)
+
+
+def frame_label(code) -> str:
+    """
+    «функция (путь:строка определения)»; путь — от корня проекта,
+    site-packages или стандартной библиотеки.
+    """
+    path = code.co_filename
+    if path.startswith(_ROOT):
+        path = path[len(_ROOT):]
+    elif path.startswith(_STDLIB):
+        path = path[len(_STDLIB):]
+    else:
+        for marker in _SITE_MARKERS:
+            index = path.rfind(marker)
+            if index != -1:
+                path = path[index + len(marker):]
+                break
+    return f"{code.co_qualname} ({path}:{code.co_firstlineno})"
+
+
+def _request_stack(frame, profile: Profile, root_frame) -> Optional[list[str]]:
+    """
+    Стек потока, если поток сейчас выполняет профилируемый запрос,
+    иначе None. Кадры ниже границы запроса (цикл событий, middleware,
+    цикл рабочего потока) отбрасываются.
+
+    Поток цикла событий: в стеке есть кадр корневого middleware запроса.
+    Рабочий поток anyio (sync-зависимости и эндпоинт): контекст,
+    переданный в run_in_threadpool, содержит этот профиль.
+    """
+    labels = []
+    while frame is not None:
+        if frame is root_frame:
+            break
+        if frame.f_code is _WORKER_RUN_CODE:
+            context = frame.f_locals.get("context")
+            if isinstance(context, Context) and context.get(_active) is profile:
+                break
+            return None
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    else:
+        return None
+    labels.reverse()
+    return labels
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, profile: Profile, root_frame) -> None:
+        super().__init__(name="request-profiler", daemon=True)
+        self.profile = profile
+        self.root_frame = root_frame
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while not self.stopped.wait(self.profile.interval):
+            self.sample(sys._current_frames(), own)
+
+    def sample(self, frames: dict, own: int) -> None:
+        profile = self.profile
+        profile.samples += 1
+        for thread_id, frame in frames.items():
+            if thread_id == own:
+                continue
+            labels = _request_stack(frame, profile, self.root_frame)
+            if labels:
+                profile.stacks[";".join(labels)] += 1
+
+
+class ProfileStore:
+    """Последние keep профилей процесса (в памяти)."""
+
+    def __init__(self, *, keep: int = 20) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._profiles: deque[Profile] = deque(maxlen=keep)
+
+    def new(self, *, method: str, route: str, interval: float) -> Profile:
+        return Profile(id=next(self._ids), method=method, route=route, interval=interval)
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        with self._lock:
+            return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def recent(self) -> list[Profile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+
+class SamplingProfilerMiddleware:
+    """
+    ASGI-middleware: запрос с заголовком «X-Profile: 1» от пользователя
+    из allowlist (is_allowed(scope) — решение по заголовкам, без БД)
+    выполняется под сэмплирующим профайлером. Поток-сэмплер раз в
+    interval секунд снимает sys._current_frames() и копит стеки потоков,
+    выполняющих этот запрос. Профиль сохраняется в store, его id
+    возвращается в заголовке X-Profile-Id.
+
+    Реальный шаг сэмплирования не меньше sys.getswitchinterval() (5 мс):
+    чаще сэмплер не получит GIL у CPU-занятого потока запроса.
+    Остальные запросы не затрагиваются.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        store: ProfileStore,
+        is_allowed: Callable[[dict], bool],
+        interval: float = 0.002,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.is_allowed = is_allowed
+        self.interval = interval
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or not any(name == PROFILE_HEADER and value in (b"1", b"true") for name, value in scope["headers"])
+            or not self.is_allowed(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.store.new(method=scope["method"], route=scope["path"], interval=self.interval)
+        token = _active.set(profile)
+        sampler = _Sampler(profile, sys._getframe())
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-profile-id", str(profile.id).encode())],
+                }
+            await send(message)
+
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stopped.set()
+            sampler.join()
+            _active.reset(token)
+            profile.duration = time.perf_counter() - started
+            route = scope.get("route")
+            profile.route = getattr(route, "path", scope["path"])
+            self.store.add(profile)
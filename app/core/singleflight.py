@@ -0,0 +1,85 @@
+# app/core/singleflight.py
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    calls: int          # всего вызовов do()
+    executions: int     # реально выполненных вычислений
+    coalesced: int      # вызовов, получивших чужой результат
+    in_flight: int      # вычислений в процессе прямо сейчас
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalescing одинаковых конкурентных вычислений (аналог Go singleflight).
+
+    Первый вызов с ключом key выполняет fn(); все вызовы с тем же key,
+    пришедшие, пока он выполняется, ждут и получают тот же результат
+    (или то же исключение). Результат не кэшируется: после завершения
+    следующий вызов снова выполнит fn().
+
+    Рассчитан на sync-эндпоинты FastAPI (threadpool).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+        self._total = 0
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self._total += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            return SingleFlightStats(
+                calls=self._total,
+                executions=self._executions,
+                coalesced=self._coalesced,
+                in_flight=len(self._calls),
+            )
@@ -0,0 +1,214 @@
+# app/core/tracing.py
+
+from __future__ import annotations
+
+import contextlib
+import random
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.traffic import TraceWriter
+
+
+class Trace:
+    """
+    Спаны одного запроса: (имя, начало от старта запроса, длительность,
+    глубина вложенности), секунды. Запрос выполняется последовательно
+    (sync-зависимости и эндпоинт — по очереди в threadpool), поэтому
+    блокировки не нужны. memory — пик/остаток аллокаций запроса
+    (MemoryTrackingMiddleware), если отслеживание включено.
+    """
+
+    __slots__ = ("started", "spans", "depth", "memory")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: list[tuple[str, float, float, int]] = []
+        self.depth = 0
+        self.memory: Optional[dict] = None
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+class _Span:
+    __slots__ = ("trace", "name", "started", "depth")
+
+    def __init__(self, trace: Trace, name: str) -> None:
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.depth = self.trace.depth
+        self.trace.depth += 1
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        finished = time.perf_counter()
+        self.trace.depth = self.depth
+        self.trace.spans.append(
+            (self.name, self.started - self.trace.started, finished - self.started, self.depth)
+        )
+
+
+_NOOP = contextlib.nullcontext()
+
+
+def span(name: str):
+    """
+    with span("db.bookings"): ...
+
+    Вне трассируемого запроса — общий no-op контекст: одно чтение
+    ContextVar, без аллокаций.
+    """
+    trace = _current.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def server_timing(trace: Trace, *, total: float) -> str:
+    """
+    Значение заголовка Server-Timing: спаны суммируются по имени
+    (desc — число вызовов, если больше одного); other — время верхнего
+    уровня, не покрытое спанами (валидация, сериализация response_model,
+    middleware).
+    """
+    durations: dict[str, float] = {}
+    counts: dict[str, int] = {}
+    covered = 0.0
+    for name, _, duration, depth in trace.spans:
+        durations[name] = durations.get(name, 0.0) + duration
+        counts[name] = counts.get(name, 0) + 1
+        if depth == 0:
+            covered += duration
+
+    parts = []
+    for name, duration in durations.items():
+        part = f"{name};dur={duration * 1000:.2f}"
+        if counts[name] > 1:
+            part += f';desc="{counts[name]}x"'
+        parts.append(part)
+    parts.append(f"other;dur={max(total - covered, 0.0) * 1000:.2f}")
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse со спаном render (json.dumps тела ответа)."""
+
+    def render(self, content) -> bytes:
+        with span("render"):
+            return super().render(content)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Каждый SQL-запрос в трассируемом запросе — спан sql (вложенный в текущий)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        trace = _current.get()
+        if trace is not None:
+            conn.info.setdefault("trace_sql", []).append((time.perf_counter(), trace.depth))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        trace = _current.get()
+        stack = conn.info.get("trace_sql")
+        if trace is None or not stack:
+            return
+        started, depth = stack.pop()
+        trace.spans.append(("sql", started - trace.started, time.perf_counter() - started, depth))
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI-middleware трассировки запроса.
+
+    header:
+        добавлять Server-Timing в ответ (спаны, завершённые до начала
+        ответа, + other + total)
+    is_allowed:
+        если задан — заголовок только для запросов, где is_allowed(scope)
+        (allowlist профайлера): разбивка по auth и SQL не уходит всем
+    writer, sample_rate:
+        доля запросов, чья трасса (все спаны, включая отправку тела)
+        пишется в JSONL
+
+    Если заголовок выключен и запрос не попал в выборку, Trace не
+    создаётся и span() остаётся no-op.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        header: bool = True,
+        is_allowed: Optional[Callable[[dict], bool]] = None,
+        writer: Optional[TraceWriter] = None,
+        sample_rate: float = 0.0,
+    ) -> None:
+        self.app = app
+        self.header = header
+        self.is_allowed = is_allowed
+        self.writer = writer
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        sampled = self.writer is not None and random.random() < self.sample_rate
+        header = self.header and (self.is_allowed is None or self.is_allowed(scope))
+        if not header and not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        token = _current.set(trace)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if header:
+                    value = server_timing(trace, total=time.perf_counter() - trace.started)
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"server-timing", value.encode("latin-1"))],
+                    }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if sampled:
+                self._write(scope, trace, status_code)
+
+    def _write(self, scope, trace: Trace, status_code: int) -> None:
+        route = scope.get("route")
+        record = {
+            "ts": round(time.time(), 3),
+            "method": scope["method"],
+            "route": getattr(route, "path", scope["path"]),
+            "status": status_code,
+            "ms": round((time.perf_counter() - trace.started) * 1000, 3),
+            "spans": [
+                {"name": name, "start_ms": round(start * 1000, 3), "ms": round(duration * 1000, 3), "depth": depth}
+                for name, start, duration, depth in trace.spans
+            ],
+        }
+        if trace.memory is not None:
+            record["mem"] = trace.memory
+        self.writer.write(record)
@@ -0,0 +1,192 @@
+# app/core/traffic.py
+
+from __future__ import annotations
+
+import json
+import queue
+import random
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import parse_qsl
+
+# Ключи, значения которых не попадают в журнал (в любом месте запроса)
+SENSITIVE_KEYS = frozenset({
+    "password", "token", "access_token", "slot_token",
+    "name", "customer_name", "first_name", "last_name",
+    "phone", "email", "comment", "reason",
+})
+REDACTED = "***"
+# Тело запроса пишется только для JSON не больше этого размера
+MAX_BODY_BYTES = 64 * 1024
+
+
+def sanitize(value: Any) -> Any:
+    """Копия JSON-значения с заменёнными значениями SENSITIVE_KEYS."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key.lower() in SENSITIVE_KEYS else sanitize(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    return value
+
+
+class TraceWriter:
+    """
+    Пишет записи в JSONL из отдельного потока. write() не блокирует
+    запрос: если очередь переполнена (диск не успевает), запись
+    отбрасывается и учитывается в dropped.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, *, maxsize: int = 10_000) -> None:
+        self.path = path
+        self.written = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="traffic-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record: dict) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                if record is self._STOP:
+                    break
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str))
+                f.write("\n")
+                self.written += 1
+                # Сбрасываем на диск, когда очередь опустела
+                if self._queue.empty():
+                    f.flush()
+
+
+class TrafficRecorderMiddleware:
+    """
+    ASGI-middleware записи трафика для последующего воспроизведения
+    (benchmarks.replay). Для каждого запроса под path_prefix пишется:
+
+        ts          — время начала (unix, секунды)
+        method      — HTTP-метод
+        route       — шаблон маршрута («/api/v1/bookings/{booking_id}/confirm»),
+                      для несопоставленных путей — сам путь
+        path_params — параметры пути
+        query       — параметры строки запроса
+        tenant      — X-Business-ID
+        status, ms  — код и длительность ответа
+        body        — JSON-тело (≤ MAX_BODY_BYTES)
+
+    Значения SENSITIVE_KEYS заменяются на «***», заголовки (в т.ч.
+    Authorization) не пишутся. Пустые поля опускаются.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        writer: TraceWriter,
+        sample_rate: float = 1.0,
+        path_prefix: str = "/api/",
+    ) -> None:
+        self.app = app
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.path_prefix)
+            or (self.sample_rate < 1.0 and random.random() >= self.sample_rate)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        capture_body = (
+            b"json" in headers.get(b"content-type", b"")
+            and int(headers.get(b"content-length", b"0") or 0) <= MAX_BODY_BYTES
+        )
+        chunks: list[bytes] = []
+        status_code = 500
+
+        async def receive_wrapper():
+            nonlocal capture_body
+            message = await receive()
+            if capture_body and message["type"] == "http.request":
+                chunks.append(message.get("body", b""))
+                # Тело без Content-Length (chunked) тоже ограничиваем
+                if sum(map(len, chunks)) > MAX_BODY_BYTES:
+                    chunks.clear()
+                    capture_body = False
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        ts = time.time()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.writer.write(self._record(
+                scope, headers, chunks,
+                ts=ts, status_code=status_code, elapsed_ms=elapsed_ms,
+            ))
+
+    @staticmethod
+    def _record(scope, headers, chunks, *, ts, status_code, elapsed_ms) -> dict:
+        route = scope.get("route")
+        query: dict[str, Any] = {}
+        for key, value in parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True):
+            if key in query:
+                previous = query[key]
+                query[key] = (previous if isinstance(previous, list) else [previous]) + [value]
+            else:
+                query[key] = value
+
+        record = {
+            "ts": round(ts, 3),
+            "method": scope["method"],
+            "route": getattr(route, "path", scope["path"]),
+            "path_params": sanitize(scope.get("path_params") or {}),
+            "query": sanitize(query),
+            "tenant": _tenant(headers),
+            "status": status_code,
+            "ms": round(elapsed_ms, 2),
+            "body": _json_body(chunks),
+        }
+        return {key: value for key, value in record.items() if value not in (None, {}, [])}
+
+
+def _tenant(headers: dict[bytes, bytes]) -> Optional[int]:
+    try:
+        return int(headers[b"x-business-id"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _json_body(chunks: list[bytes]) -> Any:
+    if not chunks:
+        return None
+    try:
+        return sanitize(json.loads(b"".join(chunks)))
+    except ValueError:
+        return None
@@ -0,0 +1,109 @@
+# app/core/versions.py
+
+from __future__ import annotations
+
+import heapq
+import threading
+import uuid
+from datetime import datetime
+from typing import Iterable, Optional
+
+from app.core.config import WEB_CONCURRENCY
+
+
+class ChangeVersions:
+    """
+    Монотонные счётчики версий данных: на бизнес и на сотрудника.
+
+    Любая мутация (бронирование, расписание, сотрудники, услуги)
+    увеличивает версию ПОСЛЕ commit. Версия используется как weak ETag:
+    если версия не изменилась — данные не изменились, и ответ можно
+    не пересчитывать (304 Not Modified).
+
+    Отдельно ведётся версия расписания сотрудника (рабочие часы, отгулы,
+    услуги) — она не меняется от бронирований и подписывается в
+    slot-токены (app/services/slot_tokens.py).
+
+    HOLD истекает «сам по себе» (без записи в БД), поэтому для него
+    регистрируется дедлайн: при первом чтении после expires_at версия
+    сотрудника и бизнеса увеличивается.
+
+    Счётчики живут в памяти процесса. epoch (случайный, свой у каждого
+    процесса) входит в ETag и slot-токены: после рестарта и в другом
+    воркере старые значения не совпадут. Изменение, сделанное другим
+    воркером, версии этого процесса не увеличивает, поэтому при
+    нескольких воркерах authoritative=False: по версиям нельзя отвечать
+    304 и доверять slot-токенам.
+    """
+
+    def __init__(self, *, authoritative: bool = True) -> None:
+        self.epoch = uuid.uuid4().hex[:12]
+        self.authoritative = authoritative
+        self._lock = threading.Lock()
+        self._business: dict[int, int] = {}
+        self._staff: dict[tuple[int, int], int] = {}
+        self._schedule: dict[tuple[int, int], int] = {}
+        # (when, business_id, staff_id) — отложенные bump'ы для HOLD
+        self._deadlines: list[tuple[datetime, int, int]] = []
+
+    # ---------- write ----------
+
+    def bump(
+        self,
+        business_id: int,
+        staff_ids: Iterable[int] = (),
+    ) -> None:
+        """Увеличивает версию бизнеса и (опционально) сотрудников."""
+        with self._lock:
+            self._bump_locked(business_id, staff_ids)
+
+    def bump_schedule(self, business_id: int, staff_id: int) -> None:
+        """Изменилось расписание сотрудника: версия расписания + обычный bump."""
+        with self._lock:
+            key = (business_id, staff_id)
+            self._schedule[key] = self._schedule.get(key, 0) + 1
+            self._bump_locked(business_id, (staff_id,))
+
+    def expire_at(self, business_id: int, staff_id: int, when: datetime) -> None:
+        """Регистрирует bump на момент истечения HOLD."""
+        with self._lock:
+            heapq.heappush(self._deadlines, (when, business_id, staff_id))
+
+    # ---------- read ----------
+
+    def business(self, business_id: int, *, now: Optional[datetime] = None) -> int:
+        self._flush_deadlines(now)
+        return self._business.get(business_id, 0)
+
+    def staff(
+        self, business_id: int, staff_id: int, *, now: Optional[datetime] = None,
+    ) -> int:
+        self._flush_deadlines(now)
+        return self._staff.get((business_id, staff_id), 0)
+
+    def schedule(self, business_id: int, staff_id: int) -> int:
+        return self._schedule.get((business_id, staff_id), 0)
+
+    # ---------- internals ----------
+
+    def _bump_locked(self, business_id: int, staff_ids: Iterable[int]) -> None:
+        self._business[business_id] = self._business.get(business_id, 0) + 1
+        for staff_id in staff_ids:
+            key = (business_id, staff_id)
+            self._staff[key] = self._staff.get(key, 0) + 1
+
+    def _flush_deadlines(self, now: Optional[datetime]) -> None:
+        # Быстрый путь без блокировки: ближайший дедлайн ещё не наступил
+        if not self._deadlines:
+            return
+        now = now or datetime.utcnow()
+        if self._deadlines[0][0] > now:
+            return
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, business_id, staff_id = heapq.heappop(self._deadlines)
+                self._bump_locked(business_id, (staff_id,))
+
+
+# Единый реестр версий процесса
+change_versions = ChangeVersions(authoritative=WEB_CONCURRENCY <= 1)
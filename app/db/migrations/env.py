@@ -5,6 +5,7 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from app.core.config import DATABASE_URL
 from app.db.base import Base
 from app.models.user import User
 from app.models.business import Business
@@ -16,10 +17,14 @@ from app.models.business_user import BusinessUser
 from app.models.customer import Customer
 from app.models.working_hours import WorkingHours
 from app.models.time_off import TimeOff
+from app.models.idempotency_key import IdempotencyKey
 
 
 config = context.config
 
+# DATABASE_URL из окружения (app.core.config) важнее значения в alembic.ini
+config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
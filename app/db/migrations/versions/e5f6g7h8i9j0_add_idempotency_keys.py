@@ -0,0 +1,44 @@
+"""add idempotency_keys
+
+Revision ID: e5f6g7h8i9j0
+Revises: d4e5f6g7h8i9
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6g7h8i9j0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6g7h8i9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Таблица сохранённых ответов для Idempotency-Key.
+    Поиск — по уникальному (business_id, key), очистка — по expires_at.
+    """
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('business_id', sa.Integer(), sa.ForeignKey('businesses.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('endpoint', sa.String(), nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('response_body', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('business_id', 'key', name='uq_idempotency_business_key'),
+    )
+    op.create_index('ix_idempotency_keys_expires_at', 'idempotency_keys', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
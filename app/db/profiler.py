@@ -0,0 +1,229 @@
+# app/db/profiler.py
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Запросы вне HTTP-запроса (sweeper, скрипты)
+BACKGROUND = "(background)"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(statement: str) -> str:
+    """
+    Текст запроса без литералов: строки и числа → ?, списки
+    параметров IN (?, ?, ...) → (?…), пробелы схлопнуты. Запросы,
+    отличающиеся только значениями, дают одну строку статистики.
+    """
+    sql = _STRING.sub("?", statement)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PARAM_LIST.sub("(?…)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+class SqlProfiler:
+    """
+    Статистика SQL по маршрутам: для каждого «METHOD /шаблон» — число
+    HTTP-запросов и по каждому нормализованному SQL число выполнений,
+    суммарное и максимальное время. Маршрут берётся из ASGI-scope
+    текущего запроса (SqlProfilerMiddleware), запросы вне HTTP
+    попадают в BACKGROUND.
+
+    Запросы дольше slow_query_ms пишутся в лог (WARNING) вместе с
+    EXPLAIN QUERY PLAN.
+    """
+
+    def __init__(self, *, slow_query_ms: float = 100.0) -> None:
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._requests: dict[str, int] = {}
+        self._statements: dict[str, dict[str, StatementStats]] = {}
+
+    def record(self, route: str, statement: str, seconds: float) -> None:
+        sql = normalize_sql(statement)
+        with self._lock:
+            by_sql = self._statements.setdefault(route, {})
+            stats = by_sql.get(sql)
+            if stats is None:
+                stats = by_sql[sql] = StatementStats()
+            stats.count += 1
+            stats.total_seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+
+    def request_finished(self, route: str) -> None:
+        with self._lock:
+            self._requests[route] = self._requests.get(route, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._statements.clear()
+
+    def snapshot(self, *, top: int = 20) -> list[dict]:
+        """
+        Маршруты по убыванию суммарного времени в SQL; у каждого —
+        top самых дорогих запросов.
+        """
+        with self._lock:
+            requests = dict(self._requests)
+            statements = {
+                route: {sql: StatementStats(s.count, s.total_seconds, s.max_seconds) for sql, s in by_sql.items()}
+                for route, by_sql in self._statements.items()
+            }
+
+        result = []
+        for route, by_sql in statements.items():
+            queries = sum(s.count for s in by_sql.values())
+            total = sum(s.total_seconds for s in by_sql.values())
+            n_requests = requests.get(route, 0)
+            ranked = sorted(by_sql.items(), key=lambda item: item[1].total_seconds, reverse=True)
+            result.append({
+                "route": route,
+                "requests": n_requests,
+                "queries": queries,
+                "queries_per_request": round(queries / n_requests, 2) if n_requests else None,
+                "total_ms": round(total * 1000, 3),
+                "statements": [
+                    {
+                        "sql": sql,
+                        "count": s.count,
+                        "total_ms": round(s.total_seconds * 1000, 3),
+                        "max_ms": round(s.max_seconds * 1000, 3),
+                    }
+                    for sql, s in ranked[:top]
+                ],
+            })
+        result.sort(key=lambda item: item["total_ms"], reverse=True)
+        return result
+
+    def instrument(self, engine: Engine) -> None:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            stack = conn.info.get("profiler_started")
+            if not stack:
+                return
+            elapsed = time.perf_counter() - stack.pop()
+            route = current_route()
+            self.record(route, statement, elapsed)
+            if elapsed * 1000 >= self.slow_query_ms:
+                self._log_slow(conn, cursor, statement, parameters, executemany, route=route, elapsed=elapsed)
+
+    def _log_slow(self, conn, cursor, statement, parameters, executemany, *, route, elapsed) -> None:
+        plan = "-"
+        if (
+            conn.dialect.name == "sqlite"
+            and not executemany
+            and statement.lstrip().upper().startswith(_EXPLAINABLE)
+        ):
+            # Прямо через DBAPI-соединение: события engine не срабатывают,
+            # запрос не выполняется повторно — sqlite только строит план
+            try:
+                rows = cursor.connection.execute("EXPLAIN QUERY PLAN " + statement, parameters or ()).fetchall()
+                plan = format_plan(rows)
+            except conn.dialect.dbapi.Error as e:
+                plan = f"unavailable: {e}"
+        logger.warning(
+            "slow query %.1f ms [%s]\n  %s\n  plan:\n%s",
+            elapsed * 1000, route, normalize_sql(statement), plan,
+        )
+
+
+def format_plan(rows) -> str:
+    """Строки EXPLAIN QUERY PLAN (id, parent, notused, detail) → дерево с отступами."""
+    depth = {0: 0}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, 0) + 1
+        lines.append("    " + "  " * (depth[node_id] - 1) + detail)
+    return "\n".join(lines)
+
+
+_scope: ContextVar[Optional[dict]] = ContextVar("sql_profiler_scope", default=None)
+
+
+def current_route() -> str:
+    """
+    «METHOD /шаблон» текущего запроса. scope["route"] выставляет роутер,
+    так что маршрут известен ко времени выполнения зависимостей и
+    эндпоинта; до сопоставления — сам путь.
+    """
+    scope = _scope.get()
+    if scope is None:
+        return BACKGROUND
+    return _route_of(scope)
+
+
+def _route_of(scope: dict) -> str:
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+
+class SqlProfilerMiddleware:
+    """ASGI-middleware: делает scope запроса видимым для SqlProfiler."""
+
+    def __init__(self, app, *, profiler: SqlProfiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _scope.reset(token)
+            self.profiler.request_finished(_route_of(scope))
+
+
+@contextlib.contextmanager
+def capture_queries() -> Iterator[list[str]]:
+    """
+    Собирает тексты всех SQL-запросов (любой engine) внутри блока:
+
+        with capture_queries() as statements:
+            client.get(...)
+        assert len(statements) <= 3
+    """
+    statements: list[str] = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", _collect)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", _collect)
@@ -0,0 +1,177 @@
+# app/db/retry.py
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy.exc import DBAPIError
+
+from app.core.metrics import Histogram, sqlite_write_lock_hold, sqlite_write_lock_wait
+
+T = TypeVar("T")
+
+# PRAGMA busy_timeout соединений (мс): сколько SQLite ждёт чужой
+# write-lock, прежде чем вернуть «database is locked»
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+# Момент (time.monotonic), к которому run_with_busy_retry должен
+# закончить; None — вне повторов
+_retry_deadline: ContextVar[Optional[float]] = ContextVar("busy_retry_deadline", default=None)
+
+
+def is_database_locked(exc: BaseException) -> bool:
+    """
+    SQLITE_BUSY / SQLITE_LOCKED: «database is locked», «database table is
+    locked», «database is busy». Приходит либо как sqlite3.OperationalError
+    (сырой BEGIN IMMEDIATE), либо обёрнутым в sqlalchemy OperationalError.
+    """
+    orig = exc.orig if isinstance(exc, DBAPIError) else exc
+    if not isinstance(orig, sqlite3.OperationalError):
+        return False
+    message = str(orig).lower()
+    return "locked" in message or "busy" in message
+
+
+@dataclass(frozen=True)
+class BusyRetryPolicy:
+    """
+    Экспоненциальный backoff с full jitter:
+        delay = random(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+    Повторы прекращаются после max_attempts попыток или по deadline
+    (секунды с начала первой попытки).
+    """
+    max_attempts: int = 5
+    base_delay: float = 0.05
+    max_delay: float = 1.0
+    deadline: float = 10.0
+
+    def backoff(self, attempt: int) -> float:
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+class WriteLockStats:
+    """
+    Статистика write-lock'а SQLite (BEGIN IMMEDIATE):
+    время ожидания и удержания блокировки, число повторов и отказов.
+    wait_histogram / hold_histogram — те же замеры для /metrics.
+    """
+
+    def __init__(
+        self,
+        *,
+        wait_histogram: Optional[Histogram] = None,
+        hold_histogram: Optional[Histogram] = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._wait_histogram = wait_histogram
+        self._hold_histogram = hold_histogram
+        self._local = threading.local()
+        self.acquired = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hold_seconds_total = 0.0
+        self.hold_seconds_max = 0.0
+        self.retries = 0
+        self.gave_up = 0
+
+    def record_wait(self, seconds: float, *, acquired: bool) -> None:
+        """Время ожидания BEGIN IMMEDIATE (в т.ч. неудачного — по busy_timeout)."""
+        with self._lock:
+            if acquired:
+                self.acquired += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        if self._wait_histogram is not None:
+            self._wait_histogram.observe(seconds)
+        if acquired:
+            self._local.acquired_at = time.perf_counter()
+
+    def record_release(self) -> None:
+        """Вызывается по завершении транзакции (commit/rollback)."""
+        acquired_at = getattr(self._local, "acquired_at", None)
+        if acquired_at is None:
+            return
+        self._local.acquired_at = None
+        held = time.perf_counter() - acquired_at
+        with self._lock:
+            self.hold_seconds_total += held
+            self.hold_seconds_max = max(self.hold_seconds_max, held)
+        if self._hold_histogram is not None:
+            self._hold_histogram.observe(held)
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_gave_up(self) -> None:
+        with self._lock:
+            self.gave_up += 1
+
+
+# Статистика процесса
+write_lock_stats = WriteLockStats(
+    wait_histogram=sqlite_write_lock_wait,
+    hold_histogram=sqlite_write_lock_hold,
+)
+
+
+def run_with_busy_retry(
+    fn: Callable[[], T],
+    *,
+    policy: BusyRetryPolicy,
+    stats: WriteLockStats = write_lock_stats,
+    before_retry: Optional[Callable[[], None]] = None,
+) -> T:
+    """
+    Выполняет fn() целиком, повторяя его при «database is locked».
+    fn должен быть идемпотентной единицей работы (валидация + запись),
+    before_retry — вернуть сессию в чистое состояние (rollback).
+    Последняя ошибка пробрасывается как есть.
+
+    Ожидание write-lock'а внутри попытки ограничено остатком deadline
+    (busy_timeout_ms), иначе каждая попытка могла бы ждать полный
+    busy_timeout и общий срок вышел бы далеко за deadline.
+    """
+    started = time.monotonic()
+    token = _retry_deadline.set(started + policy.deadline)
+    attempt = 0
+    try:
+        while True:
+            attempt += 1
+            try:
+                return fn()
+            except (DBAPIError, sqlite3.OperationalError) as e:
+                if not is_database_locked(e):
+                    raise
+                elapsed = time.monotonic() - started
+                if attempt >= policy.max_attempts or elapsed >= policy.deadline:
+                    stats.record_gave_up()
+                    raise
+            finally:
+                stats.record_release()
+
+            stats.record_retry()
+            if before_retry is not None:
+                before_retry()
+            time.sleep(min(policy.backoff(attempt), policy.deadline - elapsed))
+    finally:
+        _retry_deadline.reset(token)
+
+
+def busy_timeout_ms() -> int:
+    """
+    busy_timeout для очередного захвата write-lock'а: SQLITE_BUSY_TIMEOUT_MS,
+    внутри run_with_busy_retry — не больше остатка его deadline.
+    """
+    deadline = _retry_deadline.get()
+    if deadline is None:
+        return SQLITE_BUSY_TIMEOUT_MS
+    remaining = int((deadline - time.monotonic()) * 1000)
+    return max(0, min(SQLITE_BUSY_TIMEOUT_MS, remaining))
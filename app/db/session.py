@@ -1,13 +1,38 @@
+import time
 from typing import Generator
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import DATABASE_URL, SQL_SLOW_QUERY_MS
+from app.core.metrics import db_pool_checkout_timeouts, db_pool_checkout_wait
+from app.db.profiler import SqlProfiler
+from app.db.retry import SQLITE_BUSY_TIMEOUT_MS
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool, замеряющий ожидание соединения (включая открытие нового,
+    пока пул не заполнен) и отказы по pool_timeout — для /metrics.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            db_pool_checkout_timeouts.inc()
+            raise
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - started)
 
-DATABASE_URL = "sqlite:///./app.db"
 
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},  # для SQLite
+    poolclass=TimedQueuePool,
 )
 
 @event.listens_for(engine, "connect")
@@ -19,10 +44,25 @@ def _set_sqlite_pragma(dbapi_connection, connection_record):
     """
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA journal_mode=WAL")
-    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
     cursor.execute("PRAGMA foreign_keys=ON")
     cursor.close()
 
+@event.listens_for(engine, "checkin")
+def _restore_isolation_level(dbapi_connection, connection_record):
+    """
+    BookingService._begin_immediate переводит соединение pysqlite
+    в autocommit-режим (isolation_level=None), чтобы выполнить
+    BEGIN IMMEDIATE вручную. Возвращаем режим по умолчанию, когда
+    соединение возвращается в пул, — иначе следующие сессии на этом
+    соединении писали бы без транзакции (каждый statement — отдельный commit).
+    """
+    if dbapi_connection.isolation_level is None:
+        dbapi_connection.isolation_level = ""
+
+# Статистика SQL по маршрутам; подключается к engine в app.main
+sql_profiler = SqlProfiler(slow_query_ms=SQL_SLOW_QUERY_MS)
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -1,12 +1,65 @@
+import asyncio
+import logging
+import tracemalloc
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api import metrics
+from app.api.deps import PROFILER_USER_IDS, is_profiler_user, profile_store
 from app.api.v1.router import api_router
+from app.core.config import (
+    HOLD_SWEEP_INTERVAL_SECONDS,
+    METRICS_ENABLED,
+    PROFILER_INTERVAL_MS,
+    SERVER_TIMING_ENABLED,
+    SQL_PROFILER_ENABLED,
+    TRACEMALLOC_ENABLED,
+    TRACEMALLOC_FRAMES,
+    TRACE_PATH,
+    TRACE_SAMPLE_RATE,
+    TRAFFIC_RECORD_PATH,
+    TRAFFIC_RECORD_SAMPLE_RATE,
+    WEB_CONCURRENCY,
+)
+from app.core.memory import AllocationTracker, MemoryTrackingMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import SamplingProfilerMiddleware
+from app.core.tracing import ServerTimingMiddleware, TimedJSONResponse, instrument_engine
+from app.core.traffic import TraceWriter, TrafficRecorderMiddleware
+from app.db.profiler import SqlProfilerMiddleware
+from app.db.session import engine, sql_profiler
+from app.services.hold_sweeper import run_hold_sweeper
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if WEB_CONCURRENCY > 1:
+        logger.warning(
+            "WEB_CONCURRENCY=%d: версии изменений не разделяются между воркерами, "
+            "ответы 304, slot-токены и SSE-поток выключены",
+            WEB_CONCURRENCY,
+        )
+    sweeper = None
+    if HOLD_SWEEP_INTERVAL_SECONDS > 0:
+        sweeper = asyncio.create_task(run_hold_sweeper(HOLD_SWEEP_INTERVAL_SECONDS))
+    yield
+    if sweeper is not None:
+        sweeper.cancel()
+    for writer in (traffic_writer, trace_writer):
+        if writer is not None:
+            writer.close()
+
 
 app = FastAPI(
     title="SaaS Booking Backend",
     version="0.1.0",
     redirect_slashes=False,
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
 app.add_middleware(
@@ -17,6 +70,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Сэмплирующий профайлер по «X-Profile: 1» для пользователей из allowlist
+if PROFILER_USER_IDS:
+    app.add_middleware(
+        SamplingProfilerMiddleware,
+        store=profile_store,
+        is_allowed=is_profiler_user,
+        interval=PROFILER_INTERVAL_MS / 1000,
+    )
+
+# Пик аллокаций на запрос (внутри ServerTiming — пишется в трассу)
+if TRACEMALLOC_ENABLED:
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    app.add_middleware(MemoryTrackingMiddleware, tracker=AllocationTracker())
+
+# Server-Timing и выборочные JSONL-трассы (спаны: app/core/tracing.py)
+trace_writer = TraceWriter(TRACE_PATH) if TRACE_PATH and TRACE_SAMPLE_RATE > 0 else None
+if SERVER_TIMING_ENABLED or trace_writer is not None:
+    instrument_engine(engine)
+    app.add_middleware(
+        ServerTimingMiddleware,
+        header=SERVER_TIMING_ENABLED,
+        is_allowed=is_profiler_user,
+        writer=trace_writer,
+        sample_rate=TRACE_SAMPLE_RATE,
+    )
+
+# SQL по маршрутам + лог медленных запросов с EXPLAIN QUERY PLAN
+if SQL_PROFILER_ENABLED:
+    sql_profiler.instrument(engine)
+    app.add_middleware(SqlProfilerMiddleware, profiler=sql_profiler)
+
+# Запись трафика для benchmarks.replay (opt-in: TRAFFIC_RECORD_PATH)
+traffic_writer = TraceWriter(TRAFFIC_RECORD_PATH) if TRAFFIC_RECORD_PATH else None
+if traffic_writer is not None:
+    app.add_middleware(
+        TrafficRecorderMiddleware,
+        writer=traffic_writer,
+        sample_rate=TRAFFIC_RECORD_SAMPLE_RATE,
+    )
+
+# Prometheus: латентность и коды по маршрутам, запросы в обработке
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
 app.include_router(api_router)
 
 
@@ -4,3 +4,4 @@ from .customer import Customer
 from .working_hours import WorkingHours
 from .time_off import TimeOff
 from .booking import Booking, BookingStatus, BLOCKING_STATUSES
+from .idempotency_key import IdempotencyKey
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Сохранённый ответ на мутирующий запрос с заголовком Idempotency-Key.
+    Повтор запроса с тем же ключом получает этот ответ без повторного
+    выполнения операции.
+    """
+    __tablename__ = "idempotency_keys"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    business_id: Mapped[int] = mapped_column(
+        ForeignKey("businesses.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    # эндпоинт (bookings.create, ...) и sha256 запроса —
+    # тот же ключ с другим телом запроса отклоняется
+    endpoint: Mapped[str] = mapped_column(String, nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    response_body: Mapped[str] = mapped_column(Text, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        UniqueConstraint("business_id", "key", name="uq_idempotency_business_key"),
+    )
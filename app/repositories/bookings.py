@@ -1,9 +1,9 @@
 # app/repositories/bookings.py
 
-from typing import List, Optional, Sequence
+from typing import Iterable, Iterator, List, Optional, Sequence
 from datetime import datetime
 
-from sqlalchemy import select, or_, and_
+from sqlalchemy import RowMapping, insert, select, update, or_, and_
 from sqlalchemy.orm import Session
 
 from app.models.booking import Booking, BookingStatus, BLOCKING_STATUSES
@@ -52,6 +52,45 @@ def get_blocking_for_staff_and_period(
     return list(session.scalars(stmt))
 
 
+def get_blocking_for_staff_ids_and_period(
+    session: Session,
+    *,
+    staff_ids: Iterable[int],
+    start: datetime,
+    end: datetime,
+    business_id: Optional[int] = None,
+) -> List[Booking]:
+    """
+    То же, что get_blocking_for_staff_and_period, но сразу для
+    нескольких сотрудников (один запрос).
+    """
+    now = datetime.utcnow()
+    conditions = [
+        Booking.staff_id.in_(list(staff_ids)),
+        Booking.is_active == True,
+    ]
+    if business_id is not None:
+        conditions.append(Booking.business_id == business_id)
+    stmt = (
+        select(Booking)
+        .where(
+            *conditions,
+            Booking.start_at < end,
+            Booking.end_at > start,
+            or_(
+                Booking.status == BookingStatus.CONFIRMED,
+                and_(
+                    Booking.status == BookingStatus.HOLD,
+                    Booking.expires_at > now,
+                ),
+            ),
+        )
+        .order_by(Booking.start_at.asc())
+    )
+
+    return list(session.scalars(stmt))
+
+
 def has_overlap(
     session: Session,
     *,
@@ -89,6 +128,27 @@ def has_overlap(
     return session.scalar(stmt) is not None
 
 
+def get_expired_holds(
+    session: Session,
+    *,
+    now: datetime,
+    limit: Optional[int] = None,
+) -> List[Booking]:
+    """HOLD-брони (всех бизнесов), у которых expires_at уже наступил."""
+    stmt = (
+        select(Booking)
+        .where(
+            Booking.is_active == True,
+            Booking.status == BookingStatus.HOLD,
+            Booking.expires_at <= now,
+        )
+        .order_by(Booking.expires_at.asc())
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list(session.scalars(stmt))
+
+
 def get_by_id(
     session: Session,
     booking_id: int,
@@ -103,7 +163,152 @@ def get_by_id(
     return booking
 
 
+def list_for_business(session: Session, *, business_id: int) -> List[Booking]:
+    """Все активные брони бизнеса, новые сверху (GET /bookings)."""
+    stmt = (
+        select(Booking)
+        .where(
+            Booking.business_id == business_id,
+            Booking.is_active == True,
+        )
+        .order_by(Booking.start_at.desc())
+    )
+    return list(session.scalars(stmt))
+
+
+def iter_rows_for_business(
+    session: Session,
+    *,
+    business_id: int,
+    chunk_size: int = 1000,
+) -> Iterator[Sequence[RowMapping]]:
+    """
+    То же, что list_for_business, но строками колонок (без ORM-объектов
+    и identity map) пачками по chunk_size — для сериализации больших
+    списков без материализации всего результата.
+    """
+    stmt = (
+        select(*Booking.__table__.c)
+        .where(
+            Booking.business_id == business_id,
+            Booking.is_active == True,
+        )
+        .order_by(Booking.start_at.desc())
+    )
+    return session.execute(stmt).mappings().partitions(chunk_size)
+
+
 def create(session: Session, booking: Booking) -> Booking:
     session.add(booking)
     session.flush()  # flush, не commit — commit делает вызывающий код
     return booking
+
+
+def create_many(session: Session, bookings: Sequence[Booking]) -> Sequence[Booking]:
+    session.add_all(bookings)
+    session.flush()  # один flush на все INSERT; commit делает вызывающий код
+    return bookings
+
+
+def insert_many(session: Session, rows: Sequence[dict]) -> List[Booking]:
+    """
+    Пакетный INSERT (executemany) с RETURNING — без flush по объекту.
+    rows — словари значений колонок Booking.
+    """
+    return list(session.scalars(insert(Booking).returning(Booking), rows))
+
+
+def get_by_ids(session: Session, booking_ids: Iterable[int]) -> List[Booking]:
+    """
+    Загружает брони одним запросом (и заодно обновляет expired-объекты
+    этих броней в сессии, например после commit).
+    """
+    stmt = select(Booking).where(Booking.id.in_(list(booking_ids)))
+    return list(session.scalars(stmt))
+
+
+def get_active_by_ids(
+    session: Session,
+    *,
+    business_id: int,
+    booking_ids: Iterable[int],
+) -> List[Booking]:
+    """Активные брони бизнеса из списка id (один запрос); чужие и неактивные пропускаются."""
+    stmt = select(Booking).where(
+        Booking.id.in_(list(booking_ids)),
+        Booking.business_id == business_id,
+        Booking.is_active == True,
+    )
+    return list(session.scalars(stmt))
+
+
+def get_ids_for_staff_and_period(
+    session: Session,
+    *,
+    business_id: int,
+    staff_id: int,
+    start: datetime,
+    end: datetime,
+    statuses: Iterable[BookingStatus],
+    limit: Optional[int] = None,
+) -> List[int]:
+    """id активных броней сотрудника с началом в [start, end) и статусом из statuses."""
+    stmt = (
+        select(Booking.id)
+        .where(
+            Booking.business_id == business_id,
+            Booking.staff_id == staff_id,
+            Booking.is_active == True,
+            Booking.start_at >= start,
+            Booking.start_at < end,
+            Booking.status.in_(list(statuses)),
+        )
+        .order_by(Booking.start_at.asc(), Booking.id.asc())
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list(session.scalars(stmt))
+
+
+def update_status_many(
+    session: Session,
+    *,
+    business_id: int,
+    booking_ids: Iterable[int],
+    from_statuses: Iterable[BookingStatus],
+    to_status: BookingStatus,
+    now: Optional[datetime] = None,
+    hold_expired: Optional[bool] = None,
+    clear_expires_at: bool = True,
+) -> List[int]:
+    """
+    Один UPDATE ... RETURNING id: переводит в to_status те брони из списка,
+    чей текущий статус входит в from_statuses. Возвращает id изменённых.
+
+    hold_expired (нужен now): True — только брони с expires_at <= now,
+    False — только с ещё не истёкшим (или пустым) expires_at.
+    Объекты в сессии не синхронизируются — commit делает вызывающий код,
+    после него брони перечитываются.
+    """
+    conditions = [
+        Booking.id.in_(list(booking_ids)),
+        Booking.business_id == business_id,
+        Booking.is_active == True,
+        Booking.status.in_(list(from_statuses)),
+    ]
+    if hold_expired is True:
+        conditions.append(Booking.expires_at <= now)
+    elif hold_expired is False:
+        conditions.append(or_(Booking.expires_at.is_(None), Booking.expires_at > now))
+
+    values = {"status": to_status}
+    if clear_expires_at:
+        values["expires_at"] = None
+    stmt = (
+        update(Booking)
+        .where(*conditions)
+        .values(**values)
+        .returning(Booking.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(session.scalars(stmt))
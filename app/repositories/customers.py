@@ -1,8 +1,10 @@
 # app/repositories/customers.py
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import RowMapping, func, select
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 
 from app.models.customer import Customer
@@ -63,3 +65,65 @@ def list_for_business(
         .order_by(Customer.created_at.desc())
     )
     return list(session.scalars(stmt))
+
+
+def iter_rows_for_business(
+    session: Session,
+    *,
+    business_id: int,
+    only_active: bool = True,
+    chunk_size: int = 1000,
+) -> Iterator[Sequence[RowMapping]]:
+    """list_for_business строками колонок, пачками по chunk_size."""
+    conditions = [Customer.business_id == business_id]
+    if only_active:
+        conditions.append(Customer.is_active == True)
+    stmt = (
+        select(*Customer.__table__.c)
+        .where(*conditions)
+        .order_by(Customer.created_at.desc())
+    )
+    return session.execute(stmt).mappings().partitions(chunk_size)
+
+
+def get_ids_by_phones(
+    session: Session,
+    *,
+    business_id: int,
+    phones: Iterable[str],
+) -> dict[str, int]:
+    """{phone: id} для существующих клиентов (в т.ч. неактивных) — один запрос."""
+    stmt = select(Customer.phone, Customer.id).where(
+        Customer.business_id == business_id,
+        Customer.phone.in_(list(phones)),
+    )
+    return {phone: customer_id for phone, customer_id in session.execute(stmt)}
+
+
+def upsert_many(
+    session: Session,
+    *,
+    business_id: int,
+    rows: Sequence[dict],
+) -> None:
+    """
+    Пакетный INSERT ... ON CONFLICT (business_id, phone) DO UPDATE
+    (executemany). rows — словари name/phone/email. Существующий клиент
+    получает новое name, email — только если он передан (пустой email
+    в строке не стирает сохранённый, как и в _get_or_create_customer),
+    и снова становится активным. Без commit.
+    """
+    stmt = insert(Customer)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Customer.business_id, Customer.phone],
+        set_={
+            "name": stmt.excluded.name,
+            "email": func.coalesce(stmt.excluded.email, Customer.email),
+            "is_active": True,
+        },
+    )
+    now = datetime.utcnow()
+    session.execute(stmt, [
+        {**row, "business_id": business_id, "is_active": True, "created_at": now}
+        for row in rows
+    ])
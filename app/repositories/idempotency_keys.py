@@ -0,0 +1,54 @@
+# app/repositories/idempotency_keys.py
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models.idempotency_key import IdempotencyKey
+
+
+def get_active(
+    session: Session,
+    *,
+    business_id: int,
+    key: str,
+    now: datetime,
+) -> Optional[IdempotencyKey]:
+    """Ключ бизнеса, у которого не истёк TTL (uq_idempotency_business_key)."""
+    stmt = (
+        select(IdempotencyKey)
+        .where(
+            IdempotencyKey.business_id == business_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > now,
+        )
+    )
+    return session.scalar(stmt)
+
+
+def create(session: Session, record: IdempotencyKey) -> IdempotencyKey:
+    # Истёкшая, но ещё не удалённая запись с тем же ключом
+    # мешала бы уникальному индексу
+    session.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.business_id == record.business_id,
+            IdempotencyKey.key == record.key,
+        )
+    )
+    session.add(record)
+    session.flush()
+    return record
+
+
+def has_expired(session: Session, *, now: datetime) -> bool:
+    stmt = select(IdempotencyKey.id).where(IdempotencyKey.expires_at <= now).limit(1)
+    return session.scalar(stmt) is not None
+
+
+def delete_expired(session: Session, *, now: datetime) -> int:
+    result = session.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+    )
+    return result.rowcount
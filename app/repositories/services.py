@@ -1,5 +1,8 @@
 # app/repositories/services.py
 
+from typing import List, Sequence
+
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
 from app.models.service import Service
@@ -57,3 +60,28 @@ class ServiceRepository:
         db.commit()
         db.refresh(service)
         return service
+
+    # ---- bulk (импорт): без commit, фиксирует вызывающий ---- #
+
+    @staticmethod
+    def get_ids_by_name(db: Session, *, business_id: int) -> dict[str, int]:
+        """{name: id} всех услуг бизнеса."""
+        rows = db.execute(
+            select(Service.name, Service.id)
+            .where(Service.business_id == business_id)
+            .order_by(Service.id.asc())
+        )
+        return {name: service_id for name, service_id in rows}
+
+    @staticmethod
+    def insert_many(db: Session, rows: Sequence[dict]) -> List[int]:
+        """Пакетный INSERT (executemany) с RETURNING id в порядке rows."""
+        return list(db.scalars(
+            insert(Service).returning(Service.id, sort_by_parameter_order=True),
+            rows,
+        ))
+
+    @staticmethod
+    def update_many(db: Session, rows: Sequence[dict]) -> None:
+        """Пакетный UPDATE по первичному ключу: в каждой строке есть id."""
+        db.execute(update(Service), rows)
@@ -1,3 +1,6 @@
+from typing import List, Sequence
+
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
 from app.models.staff import Staff
@@ -55,3 +58,30 @@ class StaffRepository:
         db.commit()
         db.refresh(staff)
         return staff
+
+    # ---- bulk (импорт): без commit, фиксирует вызывающий ---- #
+
+    @staticmethod
+    def get_ids_by_name(
+        db: Session, *, business_id: int,
+    ) -> dict[tuple[str, str | None], int]:
+        """{(first_name, last_name): id} всех сотрудников бизнеса (их десятки)."""
+        rows = db.execute(
+            select(Staff.first_name, Staff.last_name, Staff.id)
+            .where(Staff.business_id == business_id)
+            .order_by(Staff.id.asc())
+        )
+        return {(first, last): staff_id for first, last, staff_id in rows}
+
+    @staticmethod
+    def insert_many(db: Session, rows: Sequence[dict]) -> List[int]:
+        """Пакетный INSERT (executemany) с RETURNING id в порядке rows."""
+        return list(db.scalars(
+            insert(Staff).returning(Staff.id, sort_by_parameter_order=True),
+            rows,
+        ))
+
+    @staticmethod
+    def update_many(db: Session, rows: Sequence[dict]) -> None:
+        """Пакетный UPDATE по первичному ключу: в каждой строке есть id."""
+        db.execute(update(Staff), rows)
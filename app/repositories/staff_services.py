@@ -1,6 +1,6 @@
 # app/repositories/staff_services.py
 
-from typing import List
+from typing import Iterable, List
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -25,3 +25,22 @@ def get_for_staff(
     )
 
     return list(session.scalars(stmt))
+
+
+def get_for_staff_ids(
+    session: Session,
+    *,
+    staff_ids: Iterable[int],
+) -> List[StaffService]:
+    """
+    Активные StaffService сразу для нескольких сотрудников (один запрос).
+    """
+    stmt = (
+        select(StaffService)
+        .where(
+            StaffService.staff_id.in_(list(staff_ids)),
+            StaffService.is_active == True,
+        )
+    )
+
+    return list(session.scalars(stmt))
@@ -1,9 +1,9 @@
 # app/repositories/time_off.py
 
-from typing import List
+from typing import Iterable, List, Optional, Sequence
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app.models.time_off import TimeOff
@@ -35,3 +35,85 @@ def get_for_staff_and_period(
     )
 
     return list(session.scalars(stmt))
+
+
+def get_for_staff_ids_and_period(
+    session: Session,
+    *,
+    staff_ids: Iterable[int],
+    start: datetime,
+    end: datetime,
+) -> List[TimeOff]:
+    """
+    TimeOff нескольких сотрудников, пересекающие [start, end) (один запрос).
+    """
+    stmt = (
+        select(TimeOff)
+        .where(
+            TimeOff.staff_id.in_(list(staff_ids)),
+            TimeOff.is_active == True,
+            TimeOff.start_at < end,
+            TimeOff.end_at > start,
+        )
+        .order_by(TimeOff.start_at.asc())
+    )
+
+    return list(session.scalars(stmt))
+
+
+def insert_many(session: Session, rows: Sequence[dict]) -> List[TimeOff]:
+    """
+    Пакетный INSERT (executemany) с RETURNING.
+    rows — словари значений колонок TimeOff.
+    """
+    return list(session.scalars(insert(TimeOff).returning(TimeOff), rows))
+
+
+def list_for_business(
+    session: Session,
+    *,
+    business_id: int,
+    staff_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[TimeOff]:
+    """Активные TimeOff бизнеса; фильтры по сотруднику и периоду [start, end)."""
+    conditions = [
+        TimeOff.business_id == business_id,
+        TimeOff.is_active == True,
+    ]
+    if staff_id is not None:
+        conditions.append(TimeOff.staff_id == staff_id)
+    if start is not None:
+        conditions.append(TimeOff.end_at > start)
+    if end is not None:
+        conditions.append(TimeOff.start_at < end)
+    stmt = (
+        select(TimeOff)
+        .where(*conditions)
+        .order_by(TimeOff.start_at.asc(), TimeOff.staff_id.asc())
+    )
+    return list(session.scalars(stmt))
+
+
+def get_by_id(
+    session: Session,
+    time_off_id: int,
+    *,
+    business_id: int,
+) -> Optional[TimeOff]:
+    stmt = select(TimeOff).where(
+        TimeOff.id == time_off_id,
+        TimeOff.business_id == business_id,
+    )
+    return session.scalars(stmt).first()
+
+
+def get_by_ids(session: Session, time_off_ids: Iterable[int]) -> List[TimeOff]:
+    """Загружает TimeOff одним запросом (обновляет expired-объекты после commit)."""
+    stmt = (
+        select(TimeOff)
+        .where(TimeOff.id.in_(list(time_off_ids)))
+        .order_by(TimeOff.staff_id.asc(), TimeOff.start_at.asc())
+    )
+    return list(session.scalars(stmt))
@@ -1,8 +1,9 @@
 # app/repositories/working_hours.py
 
-from typing import List
+from typing import Iterable, List, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 
 from app.models.working_hours import WorkingHours
@@ -38,3 +39,80 @@ def get_for_staff_and_weekday(
     )
 
     return list(session.scalars(stmt))
+
+
+def get_for_staff_ids_and_weekdays(
+    session: Session,
+    *,
+    staff_ids: Iterable[int],
+    weekdays: Iterable[int],
+) -> List[WorkingHours]:
+    """
+    Рабочие часы нескольких сотрудников на несколько дней недели
+    (один запрос). Группировку по (staff_id, weekday) делает вызывающий.
+    """
+    stmt = (
+        select(WorkingHours)
+        .where(
+            WorkingHours.staff_id.in_(list(staff_ids)),
+            WorkingHours.weekday.in_(list(weekdays)),
+            WorkingHours.is_active == True,
+        )
+        .order_by(WorkingHours.start_time.asc())
+    )
+
+    return list(session.scalars(stmt))
+
+
+def upsert_week(
+    session: Session,
+    *,
+    business_id: int,
+    staff_id: int,
+    days: Sequence[dict],
+) -> None:
+    """
+    Заменяет недельный шаблон сотрудника:
+    - дни из days — INSERT ... ON CONFLICT (uq_staff_weekday) DO UPDATE
+      одним executemany, день снова активен;
+    - остальные дни недели — is_active = False.
+
+    days — словари weekday/start_time/end_time/break_start/break_end.
+    Без commit — транзакцией управляет вызывающий код.
+    """
+    if days:
+        stmt = insert(WorkingHours)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WorkingHours.staff_id, WorkingHours.weekday],
+            set_={
+                "start_time": stmt.excluded.start_time,
+                "end_time": stmt.excluded.end_time,
+                "break_start": stmt.excluded.break_start,
+                "break_end": stmt.excluded.break_end,
+                "is_active": True,
+            },
+        )
+        session.execute(stmt, [
+            {**day, "business_id": business_id, "staff_id": staff_id, "is_active": True}
+            for day in days
+        ])
+
+    session.execute(
+        update(WorkingHours)
+        .where(
+            WorkingHours.staff_id == staff_id,
+            WorkingHours.weekday.not_in([day["weekday"] for day in days]),
+            WorkingHours.is_active == True,
+        )
+        .values(is_active=False)
+    )
+
+
+def list_for_staff(session: Session, *, staff_id: int) -> List[WorkingHours]:
+    """Весь недельный шаблон сотрудника, включая неактивные дни."""
+    stmt = (
+        select(WorkingHours)
+        .where(WorkingHours.staff_id == staff_id)
+        .order_by(WorkingHours.weekday, WorkingHours.start_time)
+    )
+    return list(session.scalars(stmt))
@@ -1,6 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.booking import BookingStatus
 from app.schemas.customer import CustomerInBooking
@@ -16,6 +17,63 @@ class BookingCreate(BaseModel):
     )
     customer: CustomerInBooking
     comment: str | None = None
+    slot_token: str | None = Field(
+        default=None,
+        description="Токен из GET /schedule/.../slots?include_tokens=true — "
+                    "рабочие часы и отгулы не перепроверяются",
+    )
+
+
+class CartItemCreate(BaseModel):
+    staff_id: int
+    service_id: int
+    start_at: datetime
+    slot_token: str | None = None
+
+
+class BookingCartCreate(BaseModel):
+    """Несколько услуг одного клиента — создаются все или ни одной."""
+    items: list[CartItemCreate] = Field(min_length=1)
+    confirm: bool = False
+    customer: CustomerInBooking
+    comment: str | None = None
+
+
+class BookingSeriesCreate(BaseModel):
+    """Серия: первое повторение в start_at, далее по правилу."""
+    staff_id: int
+    service_id: int
+    start_at: datetime
+    frequency: Literal["weekly", "biweekly"]
+    count: int | None = Field(default=None, ge=1, le=52)
+    until: date | None = None
+    confirm: bool = False
+    customer: CustomerInBooking
+    comment: str | None = None
+
+    @model_validator(mode="after")
+    def _count_or_until(self):
+        if (self.count is None) == (self.until is None):
+            raise ValueError("Нужно указать ровно одно из count или until")
+        return self
+
+
+class SeriesConflictRead(BaseModel):
+    start_at: datetime
+    end_at: datetime
+    reason: str
+
+    model_config = {"from_attributes": True}
+
+
+class BookingReschedule(BaseModel):
+    """Тело запроса для переноса бронирования."""
+    start_at: datetime
+    staff_id: int | None = Field(
+        default=None,
+        description="Другой сотрудник с той же услугой; по умолчанию — текущий",
+    )
+    slot_token: str | None = None
 
 
 class BookingRead(BaseModel):
@@ -38,6 +96,13 @@ class BookingRead(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class BookingSeriesRead(BaseModel):
+    created: list[BookingRead]
+    conflicts: list[SeriesConflictRead]
+
+    model_config = {"from_attributes": True}
+
+
 class BookingConfirm(BaseModel):
     """Тело запроса для подтверждения HOLD-бронирования."""
     pass
@@ -46,3 +111,44 @@ class BookingConfirm(BaseModel):
 class BookingCancel(BaseModel):
     """Тело запроса для отмены бронирования (расширяемо — reason и т.д.)."""
     reason: str | None = None
+
+
+class BookingBulkAction(BaseModel):
+    """
+    Массовая отмена / подтверждение: либо booking_ids, либо фильтр
+    staff_id + date_from (+ date_to, по умолчанию тот же день) + statuses.
+    """
+    booking_ids: list[int] | None = Field(default=None, min_length=1, max_length=500)
+    staff_id: int | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+    statuses: list[Literal["hold", "confirmed"]] | None = None
+
+    @model_validator(mode="after")
+    def _ids_or_filter(self):
+        by_filter = self.staff_id is not None or self.date_from is not None
+        if (self.booking_ids is not None) == by_filter:
+            raise ValueError("Нужно указать либо booking_ids, либо staff_id и date_from")
+        if by_filter and (self.staff_id is None or self.date_from is None):
+            raise ValueError("Фильтр требует staff_id и date_from")
+        if self.booking_ids is not None and (self.date_to or self.statuses):
+            raise ValueError("date_to и statuses используются только с фильтром")
+        if self.date_to is not None and self.date_to < self.date_from:
+            raise ValueError("date_to не может быть раньше date_from")
+        return self
+
+
+class BulkItemRead(BaseModel):
+    booking_id: int
+    ok: bool
+    status: BookingStatus | None
+    error: str | None
+
+    model_config = {"from_attributes": True}
+
+
+class BookingBulkRead(BaseModel):
+    updated: list[BookingRead]
+    results: list[BulkItemRead]
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from pydantic import BaseModel, Field, model_validator
+
+# Один диапазон — не длиннее года (защита от опечаток в датах)
+MAX_TIME_OFF_RANGE = timedelta(days=366)
+
+
+class TimeOffRange(BaseModel):
+    start_at: datetime
+    end_at: datetime
+
+    @model_validator(mode="after")
+    def _check_range(self):
+        if self.start_at >= self.end_at:
+            raise ValueError("start_at должен быть раньше end_at")
+        if self.end_at - self.start_at > MAX_TIME_OFF_RANGE:
+            raise ValueError("Диапазон отгула — не длиннее 366 дней")
+        return self
+
+
+class TimeOffBulkCreate(BaseModel):
+    """
+    Отгулы для нескольких сотрудников сразу: каждый диапазон
+    из ranges создаётся для каждого сотрудника из staff_ids.
+    """
+    staff_ids: list[int] = Field(min_length=1, max_length=100)
+    ranges: list[TimeOffRange] = Field(min_length=1, max_length=50)
+    reason: str | None = None
+
+    @model_validator(mode="after")
+    def _unique_staff(self):
+        if len(self.staff_ids) != len(set(self.staff_ids)):
+            raise ValueError("staff_ids не должны повторяться")
+        return self
+
+
+class TimeOffRead(BaseModel):
+    id: int
+    business_id: int
+    staff_id: int
+    start_at: datetime
+    end_at: datetime
+    reason: str | None
+    is_active: bool
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class TimeOffConflictRead(BaseModel):
+    """Существующая бронь, попавшая в новый отгул."""
+    booking_id: int
+    staff_id: int
+    start_at: datetime
+    end_at: datetime
+    status: str
+    customer_id: int
+    time_off_id: int
+
+
+class TimeOffBulkRead(BaseModel):
+    created: list[TimeOffRead]
+    conflicts: list[TimeOffConflictRead]
+
+    model_config = {"from_attributes": True}
@@ -1,5 +1,5 @@
 from datetime import time
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class WorkingHoursBase(BaseModel):
@@ -21,3 +21,36 @@ class WorkingHoursRead(WorkingHoursBase):
 
     class Config:
         from_attributes = True
+
+
+class WorkingDay(BaseModel):
+    weekday: int = Field(ge=0, le=6, description="0 = Monday, 6 = Sunday")
+    start_time: time
+    end_time: time
+    break_start: time | None = None
+    break_end: time | None = None
+
+    @model_validator(mode="after")
+    def _check_times(self):
+        if self.start_time >= self.end_time:
+            raise ValueError("start_time должен быть раньше end_time")
+        if (self.break_start is None) != (self.break_end is None):
+            raise ValueError("break_start и break_end задаются вместе")
+        if self.break_start is not None and not (
+            self.start_time <= self.break_start < self.break_end <= self.end_time
+        ):
+            raise ValueError("Перерыв должен быть внутри рабочего дня")
+        return self
+
+
+class WorkingWeekUpdate(BaseModel):
+    """Полный недельный шаблон: дни, которых нет в days, становятся выходными."""
+    staff_id: int
+    days: list[WorkingDay] = Field(max_length=7)
+
+    @model_validator(mode="after")
+    def _unique_weekdays(self):
+        weekdays = [day.weekday for day in self.days]
+        if len(weekdays) != len(set(weekdays)):
+            raise ValueError("Каждый день недели — не больше одного раза")
+        return self
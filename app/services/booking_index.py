@@ -0,0 +1,195 @@
+# app/services/booking_index.py
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple, Optional, Sequence
+
+from app.services.availability_service import BookingLike
+
+
+class _Interval(NamedTuple):
+    start: datetime
+    end: datetime
+    booking_id: int
+    expires_at: Optional[datetime]  # None — CONFIRMED (не истекает)
+
+
+@dataclass
+class _StaffIntervals:
+    items: list[_Interval] = field(default_factory=list)  # sorted по start
+    max_length: timedelta = timedelta(0)
+    loaded_at: float = 0.0
+
+
+class BookingIntervalIndex:
+    """
+    In-process индекс блокирующих бронирований: на каждого сотрудника —
+    отсортированный по start список интервалов [start, end).
+
+    Назначение — fast-fail precheck в create_booking ДО BEGIN IMMEDIATE:
+    очевидные коллизии (два клиента выбрали один популярный слот)
+    отсекаются без захвата write-lock'а.
+
+    Индекс — не источник истины:
+    - строится лениво из БД при первом обращении к сотруднику и
+      перестраивается по истечении ttl_seconds;
+    - поддерживается переходами BookingService (apply) в этом процессе;
+    - другие процессы в него не пишут, поэтому попадание в индекс
+      подтверждается обычным (не блокирующим) чтением has_overlap,
+      а промах всегда уходит на авторитетную проверку под блокировкой.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 300.0, max_staff: int = 10_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_staff = max_staff
+        self._lock = threading.Lock()
+        self._staff: OrderedDict[tuple[int, int], _StaffIntervals] = OrderedDict()
+        self._keys: dict[int, tuple[int, int]] = {}  # booking_id → (business_id, staff_id)
+        # lookups − loads — обращения, обслуженные из памяти;
+        # conflicts / clears — итог precheck (пересечение найдено / нет)
+        self.lookups = 0
+        self.loads = 0
+        self.conflicts = 0
+        self.clears = 0
+
+    # ---------- read ----------
+
+    def find_conflict(
+        self,
+        *,
+        business_id: int,
+        staff_id: int,
+        start_at: datetime,
+        end_at: datetime,
+        now: datetime,
+        loader: Callable[[], Sequence[BookingLike]],
+        exclude_booking_id: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Возвращает id блокирующей брони, пересекающей [start_at, end_at),
+        или None. loader() вызывается, если сотрудник ещё не загружен
+        или данные устарели. exclude_booking_id — сама переносимая бронь.
+        """
+        key = (business_id, staff_id)
+        with self._lock:
+            entry = self._staff.get(key)
+            fresh = entry is not None and time.monotonic() - entry.loaded_at < self._ttl
+        if not fresh:
+            entry = self._load(key, loader())
+
+        with self._lock:
+            if key in self._staff:
+                self._staff.move_to_end(key)
+            conflict = self._scan(entry, start_at, end_at, now, exclude_booking_id)
+            self.lookups += 1
+            if conflict is None:
+                self.clears += 1
+            else:
+                self.conflicts += 1
+            return conflict
+
+    # ---------- write ----------
+
+    def apply(self, booking: BookingLike) -> None:
+        """
+        Синхронизирует индекс с состоянием брони после commit:
+        блокирующая (HOLD/CONFIRMED, активная) — добавить/обновить,
+        иначе — удалить.
+        """
+        booking_id = booking.id
+        key = (booking.business_id, booking.staff_id)
+        with self._lock:
+            self._remove_locked(booking_id)
+            entry = self._staff.get(key)
+            if entry is None or not _is_blocking(booking):
+                return
+            self._insert_locked(entry, key, booking)
+
+    def invalidate(self, business_id: int, staff_id: int) -> None:
+        with self._lock:
+            entry = self._staff.pop((business_id, staff_id), None)
+            if entry is not None:
+                for item in entry.items:
+                    self._keys.pop(item.booking_id, None)
+
+    # ---------- internals ----------
+
+    def _load(self, key: tuple[int, int], bookings: Sequence[BookingLike]) -> _StaffIntervals:
+        entry = _StaffIntervals(loaded_at=time.monotonic())
+        with self._lock:
+            old = self._staff.pop(key, None)
+            if old is not None:
+                for item in old.items:
+                    self._keys.pop(item.booking_id, None)
+            for booking in bookings:
+                if _is_blocking(booking):
+                    self._insert_locked(entry, key, booking)
+            self._staff[key] = entry
+            while len(self._staff) > self._max_staff:
+                _, evicted = self._staff.popitem(last=False)
+                for item in evicted.items:
+                    self._keys.pop(item.booking_id, None)
+            self.loads += 1
+        return entry
+
+    def _insert_locked(
+        self, entry: _StaffIntervals, key: tuple[int, int], booking: BookingLike,
+    ) -> None:
+        expires_at = booking.expires_at if _status(booking) == "hold" else None
+        item = _Interval(booking.start_at, booking.end_at, booking.id, expires_at)
+        bisect.insort(entry.items, item)
+        entry.max_length = max(entry.max_length, item.end - item.start)
+        self._keys[booking.id] = key
+
+    def _remove_locked(self, booking_id: int) -> None:
+        key = self._keys.pop(booking_id, None)
+        if key is None:
+            return
+        entry = self._staff.get(key)
+        if entry is None:
+            return
+        entry.items = [i for i in entry.items if i.booking_id != booking_id]
+
+    @staticmethod
+    def _scan(
+        entry: _StaffIntervals,
+        start_at: datetime,
+        end_at: datetime,
+        now: datetime,
+        exclude_booking_id: Optional[int] = None,
+    ) -> Optional[int]:
+        items = entry.items
+        # Кандидаты: start < end_at. Идём назад, пока start ещё может
+        # дать пересечение (start > start_at - максимальная длина брони).
+        i = bisect.bisect_left(items, (end_at,)) - 1
+        lower = start_at - entry.max_length
+        while i >= 0 and items[i].start >= lower:
+            item = items[i]
+            if (
+                item.end > start_at
+                and item.booking_id != exclude_booking_id
+                and (item.expires_at is None or item.expires_at > now)
+            ):
+                return item.booking_id
+            i -= 1
+        return None
+
+
+def _status(booking: BookingLike) -> str:
+    return booking.status.value if hasattr(booking.status, "value") else booking.status
+
+
+def _is_blocking(booking: BookingLike) -> bool:
+    if getattr(booking, "is_active", True) is False:
+        return False
+    return _status(booking) in ("hold", "confirmed")
+
+
+# Индекс процесса
+booking_index = BookingIntervalIndex()
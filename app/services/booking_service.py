@@ -2,12 +2,35 @@
 
 from __future__ import annotations
 
+import sqlite3
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta, time
-from typing import Optional
+from time import perf_counter
+from typing import Callable, Iterator, NamedTuple, Optional, Sequence, TypeVar
 
-from sqlalchemy import text
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
+from app.core.config import (
+    BUSY_RETRY_BASE_DELAY_SECONDS,
+    BUSY_RETRY_DEADLINE_SECONDS,
+    BUSY_RETRY_MAX_ATTEMPTS,
+    BUSY_RETRY_MAX_DELAY_SECONDS,
+)
+from app.core.events import event_bus
+from app.core.metrics import booking_events
+from app.core.versions import change_versions
+from app.db.retry import (
+    SQLITE_BUSY_TIMEOUT_MS,
+    BusyRetryPolicy,
+    busy_timeout_ms,
+    is_database_locked,
+    run_with_busy_retry,
+    write_lock_stats,
+)
 from app.models.booking import Booking, BookingStatus
 from app.models.staff import Staff
 from app.models.service import Service
@@ -22,6 +45,15 @@ from app.repositories import (
     time_off as time_off_repo,
     customers as customers_repo,
 )
+from app.schemas.booking import BookingRead
+from app.services.booking_index import booking_index
+from app.services.idempotency import (
+    IdempotencyRequest,
+    check_replay,
+    stage_response,
+)
+from app.services.recurrence import Blocker, RecurrenceRule, find_conflicts
+from app.services.slot_tokens import verify_slot_token
 
 # HOLD живёт 10 минут
 HOLD_TTL_MINUTES = 10
@@ -35,6 +67,20 @@ MIN_LEAD_TIME_MINUTES = 60
 # Шаг сетки слотов (минуты). start_at должен быть кратен этому значению.
 SLOT_STEP_MINUTES = 15
 
+# Максимум позиций в одной корзине (create_bookings)
+MAX_CART_ITEMS = 10
+
+# Серии (create_series): горизонт и максимум повторений. Повторения
+# за BOOKING_HORIZON_DAYS видны в слотах (series=true) и переносятся
+# в пределах SERIES_HORIZON_DAYS
+SERIES_HORIZON_DAYS = 365
+MAX_SERIES_OCCURRENCES = 52
+
+# Максимум броней в одной массовой операции (bulk_transition)
+MAX_BULK_BOOKINGS = 500
+
+T = TypeVar("T")
+
 
 class BookingError(Exception):
     """Базовое исключение для ошибок бронирования."""
@@ -56,6 +102,99 @@ class BookingStateError(BookingError):
     pass
 
 
+class BookingBusyError(BookingError):
+    """БД занята (SQLITE_BUSY) дольше дедлайна повторов."""
+    pass
+
+
+@dataclass(frozen=True)
+class CartItem:
+    """Позиция корзины для create_bookings."""
+    staff_id: int
+    service_id: int
+    start_at: datetime
+    slot_token: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SeriesConflict:
+    """Повторение серии, которое не удалось забронировать."""
+    start_at: datetime
+    end_at: datetime
+    reason: str
+
+
+@dataclass
+class SeriesResult:
+    created: list[Booking]
+    conflicts: list[SeriesConflict]
+
+
+@dataclass(frozen=True)
+class BulkItemResult:
+    """Итог массовой операции по одной брони. status — None, если бронь не найдена."""
+    booking_id: int
+    ok: bool
+    status: Optional[BookingStatus]
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkResult:
+    updated: list[Booking]
+    expired: list[Booking]
+    results: list[BulkItemResult]
+
+
+class _BulkTransition(NamedTuple):
+    from_statuses: tuple[BookingStatus, ...]
+    to_status: BookingStatus
+    event: str
+    verb: str
+
+
+_BULK_TRANSITIONS = {
+    "cancel": _BulkTransition(
+        (BookingStatus.HOLD, BookingStatus.CONFIRMED),
+        BookingStatus.CANCELLED,
+        "booking.cancelled",
+        "отменить",
+    ),
+    "confirm": _BulkTransition(
+        (BookingStatus.HOLD,),
+        BookingStatus.CONFIRMED,
+        "booking.confirmed",
+        "подтвердить",
+    ),
+}
+
+
+class _PreviousSlot(NamedTuple):
+    """Где была бронь до переноса (для событий reschedule)."""
+    staff_id: int
+    start_at: datetime
+    end_at: datetime
+
+
+class _PlannedItem(NamedTuple):
+    # Значения снимаются ДО BEGIN IMMEDIATE: после его rollback
+    # ORM-объекты expired, и обращение к ним — лишние SELECT под блокировкой
+    item: CartItem
+    staff_service_id: int
+    price: int
+    duration: int
+    end_at: datetime
+
+
+@contextmanager
+def _cart_item(number: int) -> Iterator[None]:
+    """Добавляет номер позиции корзины (с 1) к сообщению ошибки."""
+    try:
+        yield
+    except BookingError as e:
+        raise type(e)(f"Позиция {number}: {e}") from None
+
+
 class BookingService:
     """
     Сервисный слой для создания, подтверждения и отмены бронирований.
@@ -64,6 +203,14 @@ class BookingService:
     для предотвращения конкурентных записей.
     """
 
+    def __init__(self, *, retry_policy: Optional[BusyRetryPolicy] = None) -> None:
+        self._retry_policy = retry_policy or BusyRetryPolicy(
+            max_attempts=BUSY_RETRY_MAX_ATTEMPTS,
+            base_delay=BUSY_RETRY_BASE_DELAY_SECONDS,
+            max_delay=BUSY_RETRY_MAX_DELAY_SECONDS,
+            deadline=BUSY_RETRY_DEADLINE_SECONDS,
+        )
+
     # ------------------------------------------------------------------ #
     #  CREATE
     # ------------------------------------------------------------------ #
@@ -81,16 +228,65 @@ class BookingService:
         customer_phone: str,
         customer_email: Optional[str] = None,
         comment: Optional[str] = None,
+        slot_token: Optional[str] = None,
+        idempotency: Optional[IdempotencyRequest] = None,
     ) -> Booking:
         """
         Создаёт бронирование.
 
         1. Бизнес-правила (прошлое, горизонт, lead time, alignment,
-           staff_service, рабочие часы, перерывы, time_off)
-        2. BEGIN IMMEDIATE → проверка пересечений → INSERT → COMMIT
+           staff_service, рабочие часы, перерывы, time_off).
+           Рабочие часы, перерывы и time_off не перечитываются, если
+           передан действительный slot_token (см. slot_tokens.py)
+        2. Fast-fail по in-memory индексу броней (без блокировки)
+        3. BEGIN IMMEDIATE → get-or-create customer → проверка пересечений
+           → INSERT → COMMIT
+
+        При «database is locked» вся единица работы (включая валидацию)
+        повторяется с backoff — см. _run_mutation.
+
+        idempotency: если ответ на этот Idempotency-Key уже сохранён —
+        IdempotentReplay до валидации и BEGIN IMMEDIATE; иначе ответ
+        сохраняется тем же COMMIT, что и бронирование.
         """
+        booking = self._run_mutation(session, lambda: self._create_booking(
+            session,
+            business_id=business_id,
+            staff_id=staff_id,
+            service_id=service_id,
+            start_at=start_at,
+            confirm=confirm,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            customer_email=customer_email,
+            comment=comment,
+            slot_token=slot_token,
+            idempotency=idempotency,
+        ))
+        self._on_changed(booking, "booking.created")
+        return booking
+
+    def _create_booking(
+        self,
+        session: Session,
+        *,
+        business_id: int,
+        staff_id: int,
+        service_id: int,
+        start_at: datetime,
+        confirm: bool,
+        customer_name: str,
+        customer_phone: str,
+        customer_email: Optional[str],
+        comment: Optional[str],
+        slot_token: Optional[str],
+        idempotency: Optional[IdempotencyRequest],
+    ) -> Booking:
         now = datetime.utcnow()
 
+        # --- 0. Повтор запроса с тем же Idempotency-Key ---
+        check_replay(session, idempotency, business_id=business_id, now=now)
+
         # --- 1. Resolve staff_service (нужен для end_at) ---
         # Проверка принадлежности staff и service к business_id
         staff_service = self._resolve_staff_service(
@@ -100,41 +296,61 @@ class BookingService:
             service_id=service_id,
         )
 
+        staff_service_id = staff_service.id
         duration_minutes = staff_service.duration
         price = staff_service.price
         end_at = start_at + timedelta(minutes=duration_minutes)
 
         # --- 2. Все бизнес-проверки (read-only, до BEGIN IMMEDIATE) ---
+        # Токен слота подтверждает, что расписание уже проверено
+        # эндпоинтом слотов и с тех пор не менялось
+        schedule_verified = verify_slot_token(
+            slot_token,
+            business_id=business_id,
+            staff_id=staff_id,
+            service_id=service_id,
+            start_at=start_at,
+            duration_minutes=duration_minutes,
+            now=now,
+        )
         self._validate_business_rules(
             session,
             now=now,
             staff_id=staff_id,
             start_at=start_at,
             end_at=end_at,
+            check_schedule=not schedule_verified,
         )
 
-        # --- 3. Get-or-create customer ---
-        customer = customers_repo.get_by_phone(
-            session, business_id=business_id, phone=customer_phone,
+        # --- 3. Fast-fail: очевидная коллизия по in-memory индексу ---
+        # Подтверждаем обычным чтением (индекс может отставать от других
+        # процессов) и отказываем, не занимая write-lock
+        self._precheck_overlap(
+            session,
+            now=now,
+            business_id=business_id,
+            staff_id=staff_id,
+            start_at=start_at,
+            end_at=end_at,
         )
-        if customer is None:
-            customer = Customer(
+
+        # --- 4. Конкурентная запись: BEGIN IMMEDIATE ---
+        self._begin_immediate(session)
+
+        try:
+            # Конкурентный повтор с тем же ключом мог успеть закоммитить
+            check_replay(session, idempotency, business_id=business_id)
+
+            # Get-or-create customer — внутри транзакции: _begin_immediate
+            # откатывает всё, что было сделано до него
+            customer = self._get_or_create_customer(
+                session,
                 business_id=business_id,
                 name=customer_name,
                 phone=customer_phone,
                 email=customer_email,
             )
-            customers_repo.create(session, customer)
-        else:
-            # Обновляем имя/email если переданы новые значения
-            customer.name = customer_name
-            if customer_email is not None:
-                customer.email = customer_email
-
-        # --- 4. Конкурентная запись: BEGIN IMMEDIATE ---
-        self._begin_immediate(session)
 
-        try:
             # Проверка пересечений внутри эксклюзивной транзакции
             if bookings_repo.has_overlap(
                 session,
@@ -156,7 +372,7 @@ class BookingService:
             booking = Booking(
                 business_id=business_id,
                 staff_id=staff_id,
-                staff_service_id=staff_service.id,
+                staff_service_id=staff_service_id,
                 customer_id=customer.id,
                 start_at=start_at,
                 end_at=end_at,
@@ -169,30 +385,544 @@ class BookingService:
             )
 
             bookings_repo.create(session, booking)
+            self._stage_response(session, idempotency, booking, status_code=201)
             session.commit()
-            return booking
+        except Exception:
+            session.rollback()
+            raise
+
+        return booking
+
+    # ------------------------------------------------------------------ #
+    #  CART (несколько броней одной транзакцией)
+    # ------------------------------------------------------------------ #
+
+    def create_bookings(
+        self,
+        session: Session,
+        *,
+        business_id: int,
+        items: Sequence[CartItem],
+        confirm: bool = False,
+        customer_name: str,
+        customer_phone: str,
+        customer_email: Optional[str] = None,
+        comment: Optional[str] = None,
+        idempotency: Optional[IdempotencyRequest] = None,
+    ) -> list[Booking]:
+        """
+        Создаёт несколько бронирований одного клиента («всё или ничего»).
+
+        1. Bulk-валидация: сотрудники, услуги и связки, затем рабочие часы
+           и отгулы всех позиций — по одному запросу на таблицу
+        2. Позиции корзины не пересекаются друг с другом по времени
+        3. Один BEGIN IMMEDIATE: get-or-create customer → одна выборка
+           броней всех сотрудников корзины → проверка пересечений
+           → INSERT всех → COMMIT. Любая ошибка откатывает всю корзину.
+
+        В сообщении ошибки указан номер позиции (с 1).
+        """
+        bookings = self._run_mutation(session, lambda: self._create_bookings(
+            session,
+            business_id=business_id,
+            items=items,
+            confirm=confirm,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            customer_email=customer_email,
+            comment=comment,
+            idempotency=idempotency,
+        ))
+        for booking in bookings:
+            self._on_changed(booking, "booking.created")
+        return bookings
+
+    def _create_bookings(
+        self,
+        session: Session,
+        *,
+        business_id: int,
+        items: Sequence[CartItem],
+        confirm: bool,
+        customer_name: str,
+        customer_phone: str,
+        customer_email: Optional[str],
+        comment: Optional[str],
+        idempotency: Optional[IdempotencyRequest],
+    ) -> list[Booking]:
+        now = datetime.utcnow()
+        check_replay(session, idempotency, business_id=business_id, now=now)
 
+        if not items:
+            raise BookingError("Корзина пуста")
+        if len(items) > MAX_CART_ITEMS:
+            raise BookingError(f"В корзине не больше {MAX_CART_ITEMS} позиций")
+
+        # --- 1. Связки staff ↔ service всех позиций (bulk) ---
+        staff_services = self._resolve_staff_services(
+            session, business_id=business_id, items=items,
+        )
+        planned = [
+            _PlannedItem(
+                item=item,
+                staff_service_id=ss.id,
+                price=ss.price,
+                duration=ss.duration,
+                end_at=item.start_at + timedelta(minutes=ss.duration),
+            )
+            for item, ss in zip(items, staff_services)
+        ]
+
+        # --- 2. Позиции не пересекаются друг с другом ---
+        self._check_cart_collisions(planned)
+
+        # --- 3. Бизнес-правила: дешёвые — по позиции, расписание — bulk ---
+        unverified: list[tuple[int, CartItem, datetime]] = []
+        for number, (item, _, _, duration, end_at) in enumerate(planned, 1):
+            with _cart_item(number):
+                self._validate_business_rules(
+                    session,
+                    now=now,
+                    staff_id=item.staff_id,
+                    start_at=item.start_at,
+                    end_at=end_at,
+                    check_schedule=False,
+                )
+            if not verify_slot_token(
+                item.slot_token,
+                business_id=business_id,
+                staff_id=item.staff_id,
+                service_id=item.service_id,
+                start_at=item.start_at,
+                duration_minutes=duration,
+                now=now,
+            ):
+                unverified.append((number, item, end_at))
+        if unverified:
+            self._validate_schedule_bulk(session, unverified)
+
+        # --- 4. Fast-fail по in-memory индексу ---
+        for number, p in enumerate(planned, 1):
+            with _cart_item(number):
+                self._precheck_overlap(
+                    session,
+                    now=now,
+                    business_id=business_id,
+                    staff_id=p.item.staff_id,
+                    start_at=p.item.start_at,
+                    end_at=p.end_at,
+                )
+
+        # --- 5. Один BEGIN IMMEDIATE на всю корзину ---
+        self._begin_immediate(session)
+
+        try:
+            check_replay(session, idempotency, business_id=business_id)
+
+            customer = self._get_or_create_customer(
+                session,
+                business_id=business_id,
+                name=customer_name,
+                phone=customer_phone,
+                email=customer_email,
+            )
+
+            # Одна выборка блокирующих броней по всем сотрудникам корзины
+            existing = bookings_repo.get_blocking_for_staff_ids_and_period(
+                session,
+                staff_ids={item.staff_id for item in items},
+                start=min(item.start_at for item in items),
+                end=max(p.end_at for p in planned),
+                business_id=business_id,
+            )
+            for number, p in enumerate(planned, 1):
+                for other in existing:
+                    if (
+                        other.staff_id == p.item.staff_id
+                        and other.start_at < p.end_at
+                        and other.end_at > p.item.start_at
+                    ):
+                        raise SlotUnavailableError(
+                            f"Позиция {number}: слот пересекается "
+                            f"с существующим бронированием"
+                        )
+
+            status = BookingStatus.CONFIRMED if confirm else BookingStatus.HOLD
+            expires_at = (
+                None if confirm
+                else datetime.utcnow() + timedelta(minutes=HOLD_TTL_MINUTES)
+            )
+            bookings = [
+                Booking(
+                    business_id=business_id,
+                    staff_id=p.item.staff_id,
+                    staff_service_id=p.staff_service_id,
+                    customer_id=customer.id,
+                    start_at=p.item.start_at,
+                    end_at=p.end_at,
+                    price=p.price,
+                    duration_min=p.duration,
+                    status=status,
+                    expires_at=expires_at,
+                    customer_name=customer_name,
+                    comment=comment,
+                )
+                for p in planned
+            ]
+            bookings_repo.create_many(session, bookings)
+
+            if idempotency is not None:
+                stage_response(
+                    session,
+                    idempotency,
+                    business_id=business_id,
+                    status_code=201,
+                    body=[
+                        BookingRead.model_validate(b).model_dump(mode="json")
+                        for b in bookings
+                    ],
+                )
+            session.commit()
         except Exception:
             session.rollback()
             raise
 
+        return bookings
+
+    @staticmethod
+    def _check_cart_collisions(planned: Sequence[_PlannedItem]) -> None:
+        """
+        Позиции одной корзины не пересекаются по времени: один клиент
+        не может быть у двух мастеров сразу (и тем более дважды у одного).
+        """
+        ordered = sorted(
+            enumerate(planned, 1), key=lambda entry: entry[1].item.start_at,
+        )
+        prev_number, prev_end = None, None
+        for number, p in ordered:
+            if prev_end is not None and p.item.start_at < prev_end:
+                raise SlotUnavailableError(
+                    f"Позиции {prev_number} и {number} пересекаются по времени"
+                )
+            if prev_end is None or p.end_at > prev_end:
+                prev_number, prev_end = number, p.end_at
+
+    # ------------------------------------------------------------------ #
+    #  SERIES (повторяющиеся бронирования)
+    # ------------------------------------------------------------------ #
+
+    def create_series(
+        self,
+        session: Session,
+        *,
+        business_id: int,
+        staff_id: int,
+        service_id: int,
+        start_at: datetime,
+        rule: RecurrenceRule,
+        confirm: bool = False,
+        customer_name: str,
+        customer_phone: str,
+        customer_email: Optional[str] = None,
+        comment: Optional[str] = None,
+        idempotency: Optional[IdempotencyRequest] = None,
+    ) -> SeriesResult:
+        """
+        Серия бронирований одного клиента по правилу (weekly / biweekly).
+
+        1. Правило разворачивается в повторения (не больше
+           MAX_SERIES_OCCURRENCES, не дальше SERIES_HORIZON_DAYS)
+        2. Дешёвые правила (прошлое, lead time, горизонт, alignment) —
+           в памяти по каждому повторению
+        3. Рабочие часы, отгулы и блокирующие брони за весь период серии —
+           по одному запросу, затем один sweep по всем повторениям
+        4. BEGIN IMMEDIATE → get-or-create customer → повторная выборка
+           броней и sweep → INSERT принятых одним executemany → COMMIT
+
+        В отличие от корзины — не «всё или ничего»: повторения с
+        конфликтами не создаются и возвращаются в conflicts с причиной.
+        """
+        result = self._run_mutation(session, lambda: self._create_series(
+            session,
+            business_id=business_id,
+            staff_id=staff_id,
+            service_id=service_id,
+            start_at=start_at,
+            rule=rule,
+            confirm=confirm,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            customer_email=customer_email,
+            comment=comment,
+            idempotency=idempotency,
+        ))
+        for booking in result.created:
+            self._on_changed(booking, "booking.created")
+        return result
+
+    def _create_series(
+        self,
+        session: Session,
+        *,
+        business_id: int,
+        staff_id: int,
+        service_id: int,
+        start_at: datetime,
+        rule: RecurrenceRule,
+        confirm: bool,
+        customer_name: str,
+        customer_phone: str,
+        customer_email: Optional[str],
+        comment: Optional[str],
+        idempotency: Optional[IdempotencyRequest],
+    ) -> SeriesResult:
+        now = datetime.utcnow()
+        check_replay(session, idempotency, business_id=business_id, now=now)
+
+        staff_service = self._resolve_staff_service(
+            session,
+            business_id=business_id,
+            staff_id=staff_id,
+            service_id=service_id,
+        )
+        staff_service_id = staff_service.id
+        price = staff_service.price
+        duration_minutes = staff_service.duration
+        length = timedelta(minutes=duration_minutes)
+
+        try:
+            starts = rule.expand(start_at, limit=MAX_SERIES_OCCURRENCES)
+        except ValueError as e:
+            raise BookingError(str(e)) from None
+        intervals = [(start, start + length) for start in starts]
+        span_start, span_end = intervals[0][0], intervals[-1][1]
+
+        # --- 1. Дешёвые правила — в памяти ---
+        conflicts: dict[int, str] = {}
+        for index, (start, end) in enumerate(intervals):
+            try:
+                self._validate_business_rules(
+                    session,
+                    now=now,
+                    staff_id=staff_id,
+                    start_at=start,
+                    end_at=end,
+                    check_schedule=False,
+                    horizon_days=SERIES_HORIZON_DAYS,
+                )
+            except SlotUnavailableError as e:
+                conflicts[index] = str(e)
+
+        # --- 2. Рабочие часы: один запрос на все дни недели серии ---
+        wh_by_weekday: dict[int, list[WorkingHours]] = defaultdict(list)
+        for wh in working_hours_repo.get_for_staff_ids_and_weekdays(
+            session,
+            staff_ids=[staff_id],
+            weekdays={start.weekday() for start in starts},
+        ):
+            wh_by_weekday[wh.weekday].append(wh)
+        for index, (start, end) in enumerate(intervals):
+            if index in conflicts:
+                continue
+            try:
+                self._check_working_hours(
+                    wh_by_weekday.get(start.weekday(), []),
+                    start_at=start,
+                    end_at=end,
+                )
+            except SlotUnavailableError as e:
+                conflicts[index] = str(e)
+
+        # --- 3. Отгулы и брони за весь период → один sweep ---
+        blockers = [
+            Blocker(t.start_at, t.end_at, "Слот пересекает отгул/выходной сотрудника")
+            for t in time_off_repo.get_for_staff_and_period(
+                session, staff_id=staff_id, start=span_start, end=span_end,
+            )
+        ]
+        blockers += self._booking_blockers(bookings_repo.get_blocking_for_staff_and_period(
+            session,
+            staff_id=staff_id,
+            start=span_start,
+            end=span_end,
+            business_id=business_id,
+        ))
+        for index, reason in find_conflicts(intervals, blockers).items():
+            conflicts.setdefault(index, reason)
+
+        accepted = [i for i in range(len(intervals)) if i not in conflicts]
+        created: list[Booking] = []
+
+        # --- 4. Запись принятых повторений под BEGIN IMMEDIATE ---
+        if accepted:
+            self._begin_immediate(session)
+            try:
+                check_replay(session, idempotency, business_id=business_id)
+
+                customer = self._get_or_create_customer(
+                    session,
+                    business_id=business_id,
+                    name=customer_name,
+                    phone=customer_phone,
+                    email=customer_email,
+                )
+
+                # Брони, появившиеся после первой выборки
+                locked_blockers = self._booking_blockers(
+                    bookings_repo.get_blocking_for_staff_and_period(
+                        session,
+                        staff_id=staff_id,
+                        start=intervals[accepted[0]][0],
+                        end=intervals[accepted[-1]][1],
+                        business_id=business_id,
+                    )
+                )
+                late = find_conflicts([intervals[i] for i in accepted], locked_blockers)
+                for position, reason in late.items():
+                    conflicts[accepted[position]] = reason
+                accepted = [i for i in accepted if i not in conflicts]
+
+                status = BookingStatus.CONFIRMED if confirm else BookingStatus.HOLD
+                expires_at = (
+                    None if confirm
+                    else datetime.utcnow() + timedelta(minutes=HOLD_TTL_MINUTES)
+                )
+                if accepted:
+                    created = bookings_repo.insert_many(session, [
+                        {
+                            "business_id": business_id,
+                            "staff_id": staff_id,
+                            "staff_service_id": staff_service_id,
+                            "customer_id": customer.id,
+                            "start_at": intervals[i][0],
+                            "end_at": intervals[i][1],
+                            "price": price,
+                            "duration_min": duration_minutes,
+                            "status": status,
+                            "expires_at": expires_at,
+                            "customer_name": customer_name,
+                            "comment": comment,
+                        }
+                        for i in accepted
+                    ])
+
+                result = self._series_result(created, intervals, conflicts)
+                if created and idempotency is not None:
+                    stage_response(
+                        session,
+                        idempotency,
+                        business_id=business_id,
+                        status_code=201,
+                        body=self._series_body(result),
+                    )
+                created_ids = [b.id for b in created]
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+            # После commit объекты expired — обновляем одним запросом,
+            # а не SELECT на каждую бронь при сериализации и событиях
+            if created_ids:
+                bookings_repo.get_by_ids(session, created_ids)
+            return result
+
+        return self._series_result(created, intervals, conflicts)
+
+    @staticmethod
+    def _booking_blockers(bookings: Sequence[Booking]) -> list[Blocker]:
+        return [
+            Blocker(b.start_at, b.end_at, "Слот пересекается с существующим бронированием")
+            for b in bookings
+        ]
+
+    @staticmethod
+    def _series_result(
+        created: list[Booking],
+        intervals: Sequence[tuple[datetime, datetime]],
+        conflicts: dict[int, str],
+    ) -> SeriesResult:
+        return SeriesResult(
+            created=created,
+            conflicts=[
+                SeriesConflict(
+                    start_at=intervals[i][0],
+                    end_at=intervals[i][1],
+                    reason=conflicts[i],
+                )
+                for i in sorted(conflicts)
+            ],
+        )
+
+    @staticmethod
+    def _series_body(result: SeriesResult) -> dict:
+        """Снимок ответа API (BookingSeriesRead) для Idempotency-Key."""
+        return {
+            "created": [
+                BookingRead.model_validate(b).model_dump(mode="json")
+                for b in result.created
+            ],
+            "conflicts": [
+                {
+                    "start_at": c.start_at.isoformat(),
+                    "end_at": c.end_at.isoformat(),
+                    "reason": c.reason,
+                }
+                for c in result.conflicts
+            ],
+        }
+
     # ------------------------------------------------------------------ #
     #  CONFIRM
     # ------------------------------------------------------------------ #
 
     def confirm_booking(
-        self, session: Session, booking_id: int, *, business_id: int,
+        self,
+        session: Session,
+        booking_id: int,
+        *,
+        business_id: int,
+        idempotency: Optional[IdempotencyRequest] = None,
     ) -> Booking:
         """
         Подтверждает HOLD-бронирование.
         Проверяет, что HOLD ещё не истёк.
         """
-        booking = bookings_repo.get_by_id(
-            session, booking_id, business_id=business_id,
-        )
-        if booking is None or not booking.is_active:
-            raise BookingNotFoundError(f"Бронирование {booking_id} не найдено")
+        booking = self._run_mutation(session, lambda: self._confirm_booking(
+            session, booking_id, business_id=business_id, idempotency=idempotency,
+        ))
+        self._on_changed(booking, "booking.confirmed")
+        return booking
+
+    def _confirm_booking(
+        self,
+        session: Session,
+        booking_id: int,
+        *,
+        business_id: int,
+        idempotency: Optional[IdempotencyRequest],
+    ) -> Booking:
+        check_replay(session, idempotency, business_id=business_id)
+        booking = self._get_active_booking(session, booking_id, business_id)
+        self._check_can_confirm(session, booking)
+
+        self._begin_immediate(session)
+        try:
+            # Статус мог измениться, пока мы ждали блокировку
+            check_replay(session, idempotency, business_id=business_id)
+            self._check_can_confirm(session, booking)
+            booking.status = BookingStatus.CONFIRMED
+            booking.expires_at = None
+            session.flush()
+            self._stage_response(session, idempotency, booking, status_code=200)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        return booking
 
+    def _check_can_confirm(self, session: Session, booking: Booking) -> None:
         if booking.status != BookingStatus.HOLD:
             raise BookingStateError(
                 f"Нельзя подтвердить бронирование в статусе {booking.status.value}"
@@ -203,49 +933,440 @@ class BookingService:
             # Автоматически помечаем как EXPIRED
             booking.status = BookingStatus.EXPIRED
             session.commit()
+            self._on_changed(booking, "booking.expired")
             raise BookingStateError("HOLD истёк, бронирование переведено в EXPIRED")
 
+    # ------------------------------------------------------------------ #
+    #  CANCEL
+    # ------------------------------------------------------------------ #
+
+    def cancel_booking(
+        self,
+        session: Session,
+        booking_id: int,
+        *,
+        business_id: int,
+        idempotency: Optional[IdempotencyRequest] = None,
+    ) -> Booking:
+        """
+        Отменяет бронирование (HOLD или CONFIRMED → CANCELLED).
+        """
+        booking = self._run_mutation(session, lambda: self._cancel_booking(
+            session, booking_id, business_id=business_id, idempotency=idempotency,
+        ))
+        self._on_changed(booking, "booking.cancelled")
+        return booking
+
+    def _cancel_booking(
+        self,
+        session: Session,
+        booking_id: int,
+        *,
+        business_id: int,
+        idempotency: Optional[IdempotencyRequest],
+    ) -> Booking:
+        check_replay(session, idempotency, business_id=business_id)
+        booking = self._get_active_booking(session, booking_id, business_id)
+        self._check_can_cancel(booking)
+
         self._begin_immediate(session)
         try:
-            booking.status = BookingStatus.CONFIRMED
+            # Статус мог измениться, пока мы ждали блокировку
+            check_replay(session, idempotency, business_id=business_id)
+            self._check_can_cancel(booking)
+            booking.status = BookingStatus.CANCELLED
             booking.expires_at = None
+            session.flush()
+            self._stage_response(session, idempotency, booking, status_code=200)
             session.commit()
-            return booking
         except Exception:
             session.rollback()
             raise
 
+        return booking
+
+    @staticmethod
+    def _check_can_cancel(booking: Booking) -> None:
+        if booking.status not in (BookingStatus.HOLD, BookingStatus.CONFIRMED):
+            raise BookingStateError(
+                f"Нельзя отменить бронирование в статусе {booking.status.value}"
+            )
+
     # ------------------------------------------------------------------ #
-    #  CANCEL
+    #  BULK CANCEL / CONFIRM
     # ------------------------------------------------------------------ #
 
-    def cancel_booking(
-        self, session: Session, booking_id: int, *, business_id: int,
+    def bulk_transition(
+        self,
+        session: Session,
+        *,
+        action: str,
+        business_id: int,
+        booking_ids: Optional[Sequence[int]] = None,
+        staff_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        statuses: Optional[Sequence[BookingStatus]] = None,
+        idempotency: Optional[IdempotencyRequest] = None,
+    ) -> BulkResult:
+        """
+        Массовая отмена (action="cancel": HOLD / CONFIRMED → CANCELLED)
+        или подтверждение (action="confirm": HOLD → CONFIRMED; истёкшие
+        HOLD, как в confirm_booking, переводятся в EXPIRED).
+
+        Брони выбираются либо списком booking_ids, либо фильтром
+        staff_id + [start, end) по началу + statuses. Переход — один
+        set-based UPDATE под одним BEGIN IMMEDIATE (вместо BEGIN/COMMIT
+        на каждую бронь); results — итог по каждой выбранной брони.
+        После commit — те же события и инвалидации, что у одиночных
+        cancel_booking / confirm_booking.
+        """
+        transition = _BULK_TRANSITIONS[action]
+        result = self._run_mutation(session, lambda: self._transition_many(
+            session,
+            transition,
+            business_id=business_id,
+            booking_ids=booking_ids,
+            staff_id=staff_id,
+            start=start,
+            end=end,
+            statuses=statuses,
+            idempotency=idempotency,
+        ))
+
+        changed = result.updated + result.expired
+        if changed:
+            # После commit объекты expired — перечитываем одним запросом
+            bookings_repo.get_by_ids(session, [b.id for b in changed])
+        for booking in result.expired:
+            self._on_changed(booking, "booking.expired")
+        for booking in result.updated:
+            self._on_changed(booking, transition.event)
+        return result
+
+    def _transition_many(
+        self,
+        session: Session,
+        transition: _BulkTransition,
+        *,
+        business_id: int,
+        booking_ids: Optional[Sequence[int]],
+        staff_id: Optional[int],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        statuses: Optional[Sequence[BookingStatus]],
+        idempotency: Optional[IdempotencyRequest],
+    ) -> BulkResult:
+        check_replay(session, idempotency, business_id=business_id)
+
+        if booking_ids is not None:
+            candidate_ids = list(dict.fromkeys(booking_ids))
+        else:
+            candidate_ids = bookings_repo.get_ids_for_staff_and_period(
+                session,
+                business_id=business_id,
+                staff_id=staff_id,
+                start=start,
+                end=end,
+                statuses=statuses or transition.from_statuses,
+                limit=MAX_BULK_BOOKINGS + 1,
+            )
+        if len(candidate_ids) > MAX_BULK_BOOKINGS:
+            raise BookingError(
+                f"Не больше {MAX_BULK_BOOKINGS} броней за одну операцию, сузьте фильтр"
+            )
+        if not candidate_ids:
+            return BulkResult(updated=[], expired=[], results=[])
+
+        now = datetime.utcnow()
+        self._begin_immediate(session)
+        try:
+            check_replay(session, idempotency, business_id=business_id)
+            expired_ids: list[int] = []
+            if transition.to_status == BookingStatus.CONFIRMED:
+                expired_ids = bookings_repo.update_status_many(
+                    session,
+                    business_id=business_id,
+                    booking_ids=candidate_ids,
+                    from_statuses=(BookingStatus.HOLD,),
+                    to_status=BookingStatus.EXPIRED,
+                    now=now,
+                    hold_expired=True,
+                    clear_expires_at=False,
+                )
+            updated_ids = bookings_repo.update_status_many(
+                session,
+                business_id=business_id,
+                booking_ids=candidate_ids,
+                from_statuses=transition.from_statuses,
+                to_status=transition.to_status,
+                now=now,
+                hold_expired=(
+                    False if transition.to_status == BookingStatus.CONFIRMED else None
+                ),
+            )
+            current = {
+                b.id: b for b in bookings_repo.get_active_by_ids(
+                    session, business_id=business_id, booking_ids=candidate_ids,
+                )
+            }
+            result = self._bulk_result(
+                transition, candidate_ids, current, set(updated_ids), set(expired_ids),
+            )
+            if idempotency is not None:
+                stage_response(
+                    session,
+                    idempotency,
+                    business_id=business_id,
+                    status_code=200,
+                    body=self._bulk_body(result),
+                )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        return result
+
+    @staticmethod
+    def _bulk_result(
+        transition: _BulkTransition,
+        candidate_ids: Sequence[int],
+        current: dict[int, Booking],
+        updated_ids: set[int],
+        expired_ids: set[int],
+    ) -> BulkResult:
+        result = BulkResult(updated=[], expired=[], results=[])
+        for booking_id in candidate_ids:
+            booking = current.get(booking_id)
+            if booking is None:
+                result.results.append(BulkItemResult(
+                    booking_id, False, None, f"Бронирование {booking_id} не найдено",
+                ))
+            elif booking_id in updated_ids:
+                result.updated.append(booking)
+                result.results.append(BulkItemResult(booking_id, True, booking.status))
+            elif booking_id in expired_ids:
+                result.expired.append(booking)
+                result.results.append(BulkItemResult(
+                    booking_id, False, booking.status,
+                    "HOLD истёк, бронирование переведено в EXPIRED",
+                ))
+            else:
+                result.results.append(BulkItemResult(
+                    booking_id, False, booking.status,
+                    f"Нельзя {transition.verb} бронирование в статусе {booking.status.value}",
+                ))
+        return result
+
+    @staticmethod
+    def _bulk_body(result: BulkResult) -> dict:
+        """Снимок ответа API (BookingBulkRead) для Idempotency-Key."""
+        return {
+            "updated": [
+                BookingRead.model_validate(b).model_dump(mode="json")
+                for b in result.updated
+            ],
+            "results": [
+                {
+                    "booking_id": r.booking_id,
+                    "ok": r.ok,
+                    "status": r.status.value if r.status is not None else None,
+                    "error": r.error,
+                }
+                for r in result.results
+            ],
+        }
+
+    # ------------------------------------------------------------------ #
+    #  RESCHEDULE
+    # ------------------------------------------------------------------ #
+
+    def reschedule_booking(
+        self,
+        session: Session,
+        booking_id: int,
+        *,
+        business_id: int,
+        start_at: datetime,
+        staff_id: Optional[int] = None,
+        slot_token: Optional[str] = None,
+        idempotency: Optional[IdempotencyRequest] = None,
     ) -> Booking:
         """
-        Отменяет бронирование (HOLD или CONFIRMED → CANCELLED).
+        Переносит бронь (HOLD или CONFIRMED) на другое время и/или
+        к другому сотруднику той же услуги.
+
+        В отличие от cancel + create — одна транзакция: старый слот
+        освобождается тем же COMMIT, которым занимается новый, а сама
+        бронь не мешает себе при проверке пересечений (exclude_booking_id).
+        Снимок цены и длительности, клиент и статус сохраняются;
+        HOLD сохраняет свой expires_at.
         """
-        booking = bookings_repo.get_by_id(
-            session, booking_id, business_id=business_id,
+        booking, previous = self._run_mutation(
+            session,
+            lambda: self._reschedule_booking(
+                session,
+                booking_id,
+                business_id=business_id,
+                start_at=start_at,
+                staff_id=staff_id,
+                slot_token=slot_token,
+                idempotency=idempotency,
+            ),
+        )
+        self._on_changed(booking, "booking.rescheduled", previous=previous)
+        return booking
+
+    def _reschedule_booking(
+        self,
+        session: Session,
+        booking_id: int,
+        *,
+        business_id: int,
+        start_at: datetime,
+        staff_id: Optional[int],
+        slot_token: Optional[str],
+        idempotency: Optional[IdempotencyRequest],
+    ) -> tuple[Booking, _PreviousSlot]:
+        now = datetime.utcnow()
+        check_replay(session, idempotency, business_id=business_id, now=now)
+
+        booking = self._get_active_booking(session, booking_id, business_id)
+        self._check_can_reschedule(booking, now=now)
+
+        previous_staff_id = booking.staff_id
+        target_staff_id = staff_id if staff_id is not None else previous_staff_id
+        service_id = booking.staff_service.service_id
+        duration_minutes = booking.duration_min
+        end_at = start_at + timedelta(minutes=duration_minutes)
+
+        # Другой сотрудник — нужна его связка с той же услугой
+        staff_service_id = booking.staff_service_id
+        if target_staff_id != previous_staff_id:
+            staff_service_id = self._resolve_staff_service(
+                session,
+                business_id=business_id,
+                staff_id=target_staff_id,
+                service_id=service_id,
+            ).id
+
+        schedule_verified = verify_slot_token(
+            slot_token,
+            business_id=business_id,
+            staff_id=target_staff_id,
+            service_id=service_id,
+            start_at=start_at,
+            duration_minutes=duration_minutes,
+            now=now,
+        )
+        # Бронь уже за горизонтом одиночной брони — повторение серии:
+        # переносится в пределах горизонта серий
+        horizon_days = BOOKING_HORIZON_DAYS
+        if booking.start_at > now + timedelta(days=BOOKING_HORIZON_DAYS):
+            horizon_days = SERIES_HORIZON_DAYS
+        self._validate_business_rules(
+            session,
+            now=now,
+            staff_id=target_staff_id,
+            start_at=start_at,
+            end_at=end_at,
+            check_schedule=not schedule_verified,
+            horizon_days=horizon_days,
+        )
+        self._precheck_overlap(
+            session,
+            now=now,
+            business_id=business_id,
+            staff_id=target_staff_id,
+            start_at=start_at,
+            end_at=end_at,
+            exclude_booking_id=booking_id,
         )
-        if booking is None or not booking.is_active:
-            raise BookingNotFoundError(f"Бронирование {booking_id} не найдено")
 
+        self._begin_immediate(session)
+        try:
+            # Бронь могли отменить/перенести, пока мы ждали блокировку
+            check_replay(session, idempotency, business_id=business_id)
+            self._check_can_reschedule(booking, now=datetime.utcnow())
+            # Старый слот — после блокировки: бронь могли перенести, пока ждали
+            previous = _PreviousSlot(booking.staff_id, booking.start_at, booking.end_at)
+
+            if bookings_repo.has_overlap(
+                session,
+                staff_id=target_staff_id,
+                start_at=start_at,
+                end_at=end_at,
+                exclude_booking_id=booking_id,
+                business_id=business_id,
+            ):
+                raise SlotUnavailableError(
+                    "Слот пересекается с существующим бронированием"
+                )
+
+            booking.staff_id = target_staff_id
+            booking.staff_service_id = staff_service_id
+            booking.start_at = start_at
+            booking.end_at = end_at
+            session.flush()
+            self._stage_response(session, idempotency, booking, status_code=200)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        return booking, previous
+
+    @staticmethod
+    def _check_can_reschedule(booking: Booking, *, now: datetime) -> None:
         if booking.status not in (BookingStatus.HOLD, BookingStatus.CONFIRMED):
             raise BookingStateError(
-                f"Нельзя отменить бронирование в статусе {booking.status.value}"
+                f"Нельзя перенести бронирование в статусе {booking.status.value}"
             )
+        if booking.status == BookingStatus.HOLD and (
+            booking.expires_at is not None and booking.expires_at <= now
+        ):
+            raise BookingStateError("HOLD истёк, перенос невозможен")
+        if booking.start_at <= now:
+            raise BookingStateError("Нельзя перенести уже начавшееся бронирование")
+
+    # ------------------------------------------------------------------ #
+    #  EXPIRE (фоновая задача)
+    # ------------------------------------------------------------------ #
+
+    def expire_stale_holds(
+        self, session: Session, *, now: Optional[datetime] = None,
+    ) -> list[Booking]:
+        """
+        Переводит все истёкшие HOLD в EXPIRED и публикует booking.expired.
+
+        Поиск кандидатов — обычное чтение; BEGIN IMMEDIATE берётся,
+        только если есть что обновлять.
+        """
+        now = now or datetime.utcnow()
+        expired = self._run_mutation(
+            session, lambda: self._expire_stale_holds(session, now=now),
+        )
+        for booking in expired:
+            self._on_changed(booking, "booking.expired")
+        return expired
+
+    def _expire_stale_holds(self, session: Session, *, now: datetime) -> list[Booking]:
+        if not bookings_repo.get_expired_holds(session, now=now, limit=1):
+            return []
 
         self._begin_immediate(session)
         try:
-            booking.status = BookingStatus.CANCELLED
-            booking.expires_at = None
+            expired = bookings_repo.get_expired_holds(session, now=now)
+            for booking in expired:
+                booking.status = BookingStatus.EXPIRED
             session.commit()
-            return booking
         except Exception:
             session.rollback()
             raise
 
+        return expired
+
     # ------------------------------------------------------------------ #
     #  BUSINESS RULES (все проверки до BEGIN IMMEDIATE)
     # ------------------------------------------------------------------ #
@@ -258,6 +1379,8 @@ class BookingService:
         staff_id: int,
         start_at: datetime,
         end_at: datetime,
+        check_schedule: bool = True,
+        horizon_days: int = BOOKING_HORIZON_DAYS,
     ) -> None:
         """
         Все бизнес-проверки, не требующие блокировки БД.
@@ -266,10 +1389,10 @@ class BookingService:
         Порядок проверок (от дешёвых к дорогим):
         1. Не в прошлом
         2. Lead time (минимум MIN_LEAD_TIME_MINUTES до start_at)
-        3. Горизонт (не дальше BOOKING_HORIZON_DAYS)
+        3. Горизонт (не дальше horizon_days, по умолчанию BOOKING_HORIZON_DAYS)
         4. Slot alignment (start_at кратен SLOT_STEP_MINUTES)
-        5. Рабочие часы + перерывы
-        6. Time off
+        5. Рабочие часы + перерывы  ┐ только при check_schedule
+        6. Time off                 ┘ (запросы к БД)
         """
         # 1. Нельзя бронировать в прошлом
         if start_at <= now:
@@ -284,10 +1407,10 @@ class BookingService:
             )
 
         # 3. Горизонт
-        horizon_limit = now + timedelta(days=BOOKING_HORIZON_DAYS)
+        horizon_limit = now + timedelta(days=horizon_days)
         if start_at > horizon_limit:
             raise SlotUnavailableError(
-                f"Бронирование возможно не дальше {BOOKING_HORIZON_DAYS} дней вперёд"
+                f"Бронирование возможно не дальше {horizon_days} дней вперёд"
             )
 
         # 4. Slot alignment
@@ -297,6 +1420,9 @@ class BookingService:
                 f"(например, 10:00, 10:15, 10:30, 10:45)"
             )
 
+        if not check_schedule:
+            return
+
         # 5. Рабочие часы + перерывы
         BookingService._validate_working_hours(
             session,
@@ -372,7 +1498,18 @@ class BookingService:
         wh_list = working_hours_repo.get_for_staff_and_weekday(
             session, staff_id=staff_id, weekday=weekday,
         )
+        BookingService._check_working_hours(
+            wh_list, start_at=start_at, end_at=end_at,
+        )
 
+    @staticmethod
+    def _check_working_hours(
+        wh_list: Sequence[WorkingHours],
+        *,
+        start_at: datetime,
+        end_at: datetime,
+    ) -> None:
+        """Проверка по уже загруженным рабочим часам дня start_at."""
         if not wh_list:
             raise SlotUnavailableError(
                 f"У сотрудника нет рабочих часов на {start_at.strftime('%A')}"
@@ -421,6 +1558,274 @@ class BookingService:
                 "Слот пересекает отгул/выходной сотрудника"
             )
 
+    @staticmethod
+    def _validate_schedule_bulk(
+        session: Session,
+        checks: Sequence[tuple[int, CartItem, datetime]],
+    ) -> None:
+        """
+        Рабочие часы, перерывы и отгулы для нескольких позиций корзины:
+        один запрос к working_hours и один к time_off на всех сотрудников.
+        checks — (номер позиции, позиция, end_at).
+        """
+        staff_ids = {item.staff_id for _, item, _ in checks}
+        working_hours = working_hours_repo.get_for_staff_ids_and_weekdays(
+            session,
+            staff_ids=staff_ids,
+            weekdays={item.start_at.weekday() for _, item, _ in checks},
+        )
+        wh_by_day: dict[tuple[int, int], list[WorkingHours]] = defaultdict(list)
+        for wh in working_hours:
+            wh_by_day[(wh.staff_id, wh.weekday)].append(wh)
+
+        time_offs = time_off_repo.get_for_staff_ids_and_period(
+            session,
+            staff_ids=staff_ids,
+            start=min(item.start_at for _, item, _ in checks),
+            end=max(end_at for _, _, end_at in checks),
+        )
+
+        for number, item, end_at in checks:
+            with _cart_item(number):
+                BookingService._check_working_hours(
+                    wh_by_day.get((item.staff_id, item.start_at.weekday()), []),
+                    start_at=item.start_at,
+                    end_at=end_at,
+                )
+                for time_off in time_offs:
+                    if (
+                        time_off.staff_id == item.staff_id
+                        and time_off.start_at < end_at
+                        and time_off.end_at > item.start_at
+                    ):
+                        raise SlotUnavailableError(
+                            "Слот пересекает отгул/выходной сотрудника"
+                        )
+
+    @staticmethod
+    def _resolve_staff_services(
+        session: Session,
+        *,
+        business_id: int,
+        items: Sequence[CartItem],
+    ) -> list[StaffService]:
+        """
+        Bulk-вариант _resolve_staff_service: по одному запросу на staff,
+        services и staff_services. Возвращает связки в порядке items.
+        """
+        staff_ids = {item.staff_id for item in items}
+        service_ids = {item.service_id for item in items}
+        known_staff = set(session.scalars(
+            select(Staff.id).where(
+                Staff.id.in_(staff_ids), Staff.business_id == business_id,
+            )
+        ))
+        known_services = set(session.scalars(
+            select(Service.id).where(
+                Service.id.in_(service_ids), Service.business_id == business_id,
+            )
+        ))
+        links = {
+            (ss.staff_id, ss.service_id): ss
+            for ss in staff_services_repo.get_for_staff_ids(
+                session, staff_ids=staff_ids,
+            )
+        }
+
+        resolved = []
+        for number, item in enumerate(items, 1):
+            with _cart_item(number):
+                if item.staff_id not in known_staff:
+                    raise BookingNotFoundError(
+                        f"Сотрудник staff_id={item.staff_id} не найден в бизнесе {business_id}"
+                    )
+                if item.service_id not in known_services:
+                    raise BookingNotFoundError(
+                        f"Услуга service_id={item.service_id} не найдена в бизнесе {business_id}"
+                    )
+                ss = links.get((item.staff_id, item.service_id))
+                if ss is None:
+                    raise BookingNotFoundError(
+                        f"Активная связка staff_id={item.staff_id}, "
+                        f"service_id={item.service_id} не найдена"
+                    )
+                if ss.duration <= 0:
+                    raise BookingError("StaffService.duration должен быть > 0")
+                resolved.append(ss)
+        return resolved
+
+    @staticmethod
+    def _precheck_overlap(
+        session: Session,
+        *,
+        now: datetime,
+        business_id: int,
+        staff_id: int,
+        start_at: datetime,
+        end_at: datetime,
+        exclude_booking_id: Optional[int] = None,
+    ) -> None:
+        """
+        Проверка пересечений ДО BEGIN IMMEDIATE по booking_index.
+        Промах индекса ничего не гарантирует — авторитетная проверка
+        остаётся внутри блокировки.
+        """
+        conflict_id = booking_index.find_conflict(
+            business_id=business_id,
+            staff_id=staff_id,
+            start_at=start_at,
+            end_at=end_at,
+            now=now,
+            loader=lambda: bookings_repo.get_blocking_for_staff_and_period(
+                session,
+                staff_id=staff_id,
+                start=now,
+                end=now + timedelta(days=BOOKING_HORIZON_DAYS + 1),
+                business_id=business_id,
+            ),
+            exclude_booking_id=exclude_booking_id,
+        )
+        if conflict_id is None:
+            return
+        if bookings_repo.has_overlap(
+            session,
+            staff_id=staff_id,
+            start_at=start_at,
+            end_at=end_at,
+            exclude_booking_id=exclude_booking_id,
+            business_id=business_id,
+        ):
+            raise SlotUnavailableError(
+                "Слот пересекается с существующим бронированием"
+            )
+
+    @staticmethod
+    def _get_active_booking(
+        session: Session, booking_id: int, business_id: int,
+    ) -> Booking:
+        booking = bookings_repo.get_by_id(
+            session, booking_id, business_id=business_id,
+        )
+        if booking is None or not booking.is_active:
+            raise BookingNotFoundError(f"Бронирование {booking_id} не найдено")
+        return booking
+
+    @staticmethod
+    def _get_or_create_customer(
+        session: Session,
+        *,
+        business_id: int,
+        name: str,
+        phone: str,
+        email: Optional[str],
+    ) -> Customer:
+        customer = customers_repo.get_by_phone(
+            session, business_id=business_id, phone=phone,
+        )
+        if customer is None:
+            customer = Customer(
+                business_id=business_id,
+                name=name,
+                phone=phone,
+                email=email,
+            )
+            customers_repo.create(session, customer)
+        else:
+            # Обновляем имя/email если переданы новые значения
+            customer.name = name
+            if email is not None:
+                customer.email = email
+        return customer
+
+    @staticmethod
+    def _stage_response(
+        session: Session,
+        idempotency: Optional[IdempotencyRequest],
+        booking: Booking,
+        *,
+        status_code: int,
+    ) -> None:
+        """Снимок ответа API (BookingRead) для Idempotency-Key."""
+        if idempotency is None:
+            return
+        stage_response(
+            session,
+            idempotency,
+            business_id=booking.business_id,
+            status_code=status_code,
+            body=BookingRead.model_validate(booking).model_dump(mode="json"),
+        )
+
+    def _run_mutation(self, session: Session, unit: Callable[[], T]) -> T:
+        """
+        Выполняет мутирующую единицу работы (валидация + BEGIN IMMEDIATE
+        + запись). Если SQLite вернул «database is locked» (busy_timeout
+        истёк на BEGIN IMMEDIATE или COMMIT), единица целиком повторяется
+        с экспоненциальным backoff и jitter — валидация и проверка
+        пересечений выполняются заново. Если дедлайн исчерпан —
+        BookingBusyError (API отдаёт 503).
+        """
+        try:
+            return run_with_busy_retry(
+                unit,
+                policy=self._retry_policy,
+                before_retry=session.rollback,
+            )
+        except (DBAPIError, sqlite3.OperationalError) as e:
+            if not is_database_locked(e):
+                raise
+            session.rollback()
+            raise BookingBusyError(
+                "База данных занята, повторите запрос позже"
+            ) from e
+
+    @staticmethod
+    def _on_changed(
+        booking: Booking, event: str, *, previous: Optional[_PreviousSlot] = None,
+    ) -> None:
+        """
+        Вызывается ПОСЛЕ commit: обновляет booking_index, увеличивает
+        версии данных (ETag) бизнеса и сотрудника и публикует событие
+        для SSE-подписчиков.
+        Для HOLD регистрирует момент истечения — тогда слот освободится
+        без записи в БД.
+        previous — слот до переноса: событие несёт и его день/время
+        (previous_*), чтобы клиент, показывающий старый день, узнал об
+        освободившемся слоте. Если бронь ушла от другого сотрудника,
+        его версия тоже увеличивается, и его подписчики получают событие.
+        """
+        staff_ids = [booking.staff_id]
+        if previous is not None and previous.staff_id != booking.staff_id:
+            staff_ids.append(previous.staff_id)
+        moved_from = {}
+        if previous is not None:
+            moved_from = {
+                "previous_staff_id": previous.staff_id,
+                "previous_day": previous.start_at.date().isoformat(),
+                "previous_start_at": previous.start_at.isoformat(),
+                "previous_end_at": previous.end_at.isoformat(),
+            }
+
+        booking_events.inc(event)
+        booking_index.apply(booking)
+        change_versions.bump(booking.business_id, staff_ids)
+        if booking.status == BookingStatus.HOLD and booking.expires_at is not None:
+            change_versions.expire_at(
+                booking.business_id, booking.staff_id, booking.expires_at,
+            )
+        for staff_id in staff_ids:
+            event_bus.publish(
+                event,
+                business_id=booking.business_id,
+                staff_id=staff_id,
+                booking_id=booking.id,
+                status=booking.status.value,
+                day=booking.start_at.date().isoformat(),
+                start_at=booking.start_at.isoformat(),
+                end_at=booking.end_at.isoformat(),
+                **moved_from,
+            )
+
     @staticmethod
     def _begin_immediate(session: Session) -> None:
         """
@@ -442,4 +1847,18 @@ class BookingService:
         # Получаем сырое DBAPI-соединение и начинаем IMMEDIATE
         raw_conn = session.connection().connection.dbapi_connection
         raw_conn.isolation_level = None  # выключаем autocommit pysqlite
-        raw_conn.execute("BEGIN IMMEDIATE")
+        # Внутри повторов ждём write-lock не дольше остатка их дедлайна
+        timeout_ms = busy_timeout_ms()
+        if timeout_ms != SQLITE_BUSY_TIMEOUT_MS:
+            raw_conn.execute(f"PRAGMA busy_timeout={timeout_ms}")
+        started = perf_counter()
+        acquired = False
+        try:
+            raw_conn.execute("BEGIN IMMEDIATE")
+            acquired = True
+        finally:
+            write_lock_stats.record_wait(
+                perf_counter() - started, acquired=acquired,
+            )
+            if timeout_ms != SQLITE_BUSY_TIMEOUT_MS:
+                raw_conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
@@ -0,0 +1,295 @@
+# app/services/csv_import.py
+
+from __future__ import annotations
+
+import csv
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Hashable, Iterable, Optional, TextIO
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import IMPORT_CHUNK_SIZE, IMPORT_MAX_REPORTED_ERRORS
+from app.core.versions import change_versions
+from app.repositories import customers as customers_repo
+from app.repositories.services import ServiceRepository
+from app.repositories.staff import StaffRepository
+from app.schemas.customer import CustomerCreate
+from app.schemas.services import ServiceCreate
+from app.schemas.staff import StaffCreate
+from app.services.schedule_service import notify_schedule_changed
+
+
+class ImportFormatError(Exception):
+    """Файл нельзя импортировать целиком (неизвестная сущность, нет колонок)."""
+    pass
+
+
+@dataclass(frozen=True)
+class RowError:
+    line: int
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """
+    Итог импорта. inserted — новые записи, updated — строки, совпавшие
+    по естественному ключу с существующей записью (или с более ранней
+    строкой файла). В errors — не больше IMPORT_MAX_REPORTED_ERRORS строк,
+    failed считает все.
+    """
+    entity: str
+    total: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    chunks: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+    def fail(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(line=line, message=message))
+
+
+# ------------------------------------------------------------------ #
+#  Импортёры сущностей: схема строки, естественный ключ, пакетная запись
+# ------------------------------------------------------------------ #
+
+class _Importer(ABC):
+    schema: type[BaseModel]
+
+    def prepare(self, session: Session, *, business_id: int) -> None:
+        """Загружает справочники до первого пакета (и после отката пакета)."""
+
+    @abstractmethod
+    def key(self, row: BaseModel) -> Hashable:
+        """Естественный ключ строки: по нему сопоставляются существующие записи."""
+
+    @abstractmethod
+    def write(
+        self, session: Session, *, business_id: int, rows: list[BaseModel],
+    ) -> int:
+        """Пишет пакет (уникальные ключи) без commit. Возвращает число новых записей."""
+
+    def staff_ids(self) -> Iterable[int]:
+        """Сотрудники, чьи ETag нужно инвалидировать после импорта."""
+        return ()
+
+    def schedule_changed_staff_ids(self) -> Iterable[int]:
+        """Сотрудники, чья доступность изменилась (is_active из CSV)."""
+        return ()
+
+
+class _CustomerImporter(_Importer):
+    """Клиенты: ключ (business_id, phone), запись — INSERT ... ON CONFLICT."""
+    schema = CustomerCreate
+
+    def key(self, row: CustomerCreate) -> Hashable:
+        return row.phone
+
+    def write(self, session, *, business_id, rows):
+        existing = customers_repo.get_ids_by_phones(
+            session, business_id=business_id, phones=[row.phone for row in rows],
+        )
+        customers_repo.upsert_many(
+            session,
+            business_id=business_id,
+            rows=[row.model_dump() for row in rows],
+        )
+        return sum(1 for row in rows if row.phone not in existing)
+
+
+class _LookupImporter(_Importer):
+    """
+    Сотрудники и услуги: уникального ограничения в БД нет, поэтому ключ
+    сопоставляется со справочником {ключ: id}, загруженным один раз
+    (у бизнеса их десятки). Совпавшие — пакетный UPDATE по id только
+    колонок, заполненных в строке: пустая ячейка не стирает сохранённое
+    значение, а умолчание схемы (is_active=True) не активирует запись.
+    Новые — пакетный INSERT.
+    """
+    repository: type
+
+    def __init__(self) -> None:
+        self._ids: dict[Hashable, int] = {}
+        self._activity_changed: set[int] = set()
+
+    def prepare(self, session, *, business_id):
+        self._ids = self.repository.get_ids_by_name(session, business_id=business_id)
+
+    def write(self, session, *, business_id, rows):
+        updates = []
+        inserts = []
+        new_keys = []
+        for row in rows:
+            known_id = self._ids.get(self.key(row))
+            if known_id is None:
+                inserts.append({**row.model_dump(), "business_id": business_id})
+                new_keys.append(self.key(row))
+            else:
+                values = row.model_dump(exclude_unset=True, exclude_none=True)
+                updates.append({**values, "id": known_id})
+                if "is_active" in values:
+                    self._activity_changed.add(known_id)
+
+        if updates:
+            self.repository.update_many(session, updates)
+        if inserts:
+            new_ids = self.repository.insert_many(session, inserts)
+            self._ids.update(zip(new_keys, new_ids))
+        return len(inserts)
+
+
+class _StaffImporter(_LookupImporter):
+    """Сотрудники: ключ (first_name, last_name)."""
+    schema = StaffCreate
+    repository = StaffRepository
+
+    def key(self, row: StaffCreate) -> Hashable:
+        return (row.first_name, row.last_name)
+
+    def staff_ids(self) -> Iterable[int]:
+        return self._ids.values()
+
+    def schedule_changed_staff_ids(self) -> Iterable[int]:
+        return self._activity_changed
+
+
+class _ServiceImporter(_LookupImporter):
+    """Услуги: ключ name."""
+    schema = ServiceCreate
+    repository = ServiceRepository
+
+    def key(self, row: ServiceCreate) -> Hashable:
+        return row.name
+
+
+IMPORTERS = {
+    "customers": _CustomerImporter,
+    "staff": _StaffImporter,
+    "services": _ServiceImporter,
+}
+
+
+# ------------------------------------------------------------------ #
+#  Потоковый импорт
+# ------------------------------------------------------------------ #
+
+def import_csv(
+    session: Session,
+    *,
+    business_id: int,
+    entity: str,
+    stream: TextIO,
+    chunk_size: Optional[int] = None,
+) -> ImportReport:
+    """
+    Читает CSV (первая строка — заголовок) построчно, не загружая файл
+    целиком. Строки проверяются схемой сущности; невалидные попадают
+    в отчёт с номером строки файла. Валидные копятся в пакет по
+    chunk_size строк: пакет пишется executemany и фиксируется своим
+    COMMIT. Ошибка записи откатывает только свой пакет — его строки
+    попадают в отчёт, импорт продолжается.
+    """
+    importer_cls = IMPORTERS.get(entity)
+    if importer_cls is None:
+        raise ImportFormatError(f"Неизвестная сущность: {entity}")
+    importer = importer_cls()
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+
+    reader = csv.DictReader(stream)
+    try:
+        header = reader.fieldnames or []
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(f"Не удалось прочитать заголовок: {e}")
+    columns = {name.strip() for name in header if name}
+    required = {
+        name for name, info in importer.schema.model_fields.items()
+        if info.is_required()
+    }
+    missing = sorted(required - columns)
+    if missing:
+        raise ImportFormatError(
+            f"Нет обязательных колонок: {', '.join(missing)}"
+        )
+
+    report = ImportReport(entity=entity)
+    importer.prepare(session, business_id=business_id)
+    chunk: list[tuple[int, BaseModel]] = []
+
+    rows = iter(reader)
+    while True:
+        try:
+            raw = next(rows)
+        except StopIteration:
+            break
+        except (UnicodeDecodeError, csv.Error) as e:
+            # Дальше файл не читается: записываем накопленное и выходим
+            report.fail(reader.line_num + 1, f"Не удалось прочитать строку: {e}")
+            break
+
+        report.total += 1
+        values = {
+            key.strip(): value.strip()
+            for key, value in raw.items()
+            if key and isinstance(value, str) and value.strip()
+        }
+        try:
+            chunk.append((reader.line_num, importer.schema.model_validate(values)))
+        except ValidationError as e:
+            report.fail(reader.line_num, _format_errors(e))
+            continue
+
+        if len(chunk) >= chunk_size:
+            _write_chunk(session, importer, chunk, business_id=business_id, report=report)
+            chunk = []
+
+    if chunk:
+        _write_chunk(session, importer, chunk, business_id=business_id, report=report)
+
+    if report.inserted or report.updated:
+        change_versions.bump(business_id, importer.staff_ids())
+    for staff_id in importer.schedule_changed_staff_ids():
+        notify_schedule_changed(business_id=business_id, staff_id=staff_id)
+    return report
+
+
+def _write_chunk(
+    session: Session,
+    importer: _Importer,
+    chunk: list[tuple[int, BaseModel]],
+    *,
+    business_id: int,
+    report: ImportReport,
+) -> None:
+    # Повтор ключа внутри пакета — побеждает последняя строка
+    unique: dict[Hashable, BaseModel] = {}
+    for _, row in chunk:
+        unique[importer.key(row)] = row
+
+    try:
+        created = importer.write(
+            session, business_id=business_id, rows=list(unique.values()),
+        )
+        session.commit()
+    except DBAPIError as e:
+        session.rollback()
+        importer.prepare(session, business_id=business_id)
+        for line, _ in chunk:
+            report.fail(line, f"Пакет не записан: {e.orig}")
+        return
+
+    report.chunks += 1
+    report.inserted += created
+    report.updated += len(chunk) - created
+
+
+def _format_errors(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
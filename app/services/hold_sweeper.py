@@ -0,0 +1,49 @@
+# app/services/hold_sweeper.py
+
+import asyncio
+import logging
+
+from app.db.session import SessionLocal
+from app.services.booking_service import BookingService
+from app.services.idempotency import purge_expired
+
+logger = logging.getLogger(__name__)
+
+_booking_service = BookingService()
+
+
+def sweep_expired_holds() -> int:
+    """Один проход: переводит истёкшие HOLD в EXPIRED. Возвращает их число."""
+    session = SessionLocal()
+    try:
+        return len(_booking_service.expire_stale_holds(session))
+    finally:
+        session.close()
+
+
+def purge_expired_idempotency_keys() -> int:
+    """Один проход: удаляет сохранённые ответы Idempotency-Key с истёкшим TTL."""
+    session = SessionLocal()
+    try:
+        return purge_expired(session)
+    finally:
+        session.close()
+
+
+async def run_hold_sweeper(interval_seconds: int) -> None:
+    """
+    Фоновая задача приложения: раз в interval_seconds освобождает слоты
+    истёкших HOLD, чтобы SSE-подписчики узнали об этом без опроса,
+    и удаляет истёкшие Idempotency-Key.
+    Работа с БД — в threadpool, чтобы не блокировать event loop.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(sweep_expired_holds)
+        except Exception:
+            logger.exception("HOLD sweeper failed")
+        try:
+            await asyncio.to_thread(purge_expired_idempotency_keys)
+        except Exception:
+            logger.exception("Idempotency-Key purge failed")
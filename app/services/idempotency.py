@@ -0,0 +1,142 @@
+# app/services/idempotency.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import IDEMPOTENCY_TTL_HOURS
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories import idempotency_keys as idempotency_keys_repo
+
+
+class IdempotencyKeyMismatchError(Exception):
+    """Ключ уже использован для запроса с другим телом/эндпоинтом."""
+    pass
+
+
+class IdempotentReplay(Exception):
+    """
+    Запрос с этим ключом уже выполнен — вместо повторного выполнения
+    нужно вернуть сохранённый ответ.
+    """
+
+    def __init__(self, status_code: int, body: Any) -> None:
+        super().__init__("idempotent replay")
+        self.status_code = status_code
+        self.body = body
+
+
+@dataclass(frozen=True)
+class IdempotencyRequest:
+    key: str
+    endpoint: str
+    fingerprint: str
+
+
+def make_request(key: str, *, endpoint: str, payload: Any) -> IdempotencyRequest:
+    """Fingerprint — sha256 от эндпоинта и канонического JSON запроса."""
+    canonical = json.dumps(
+        {"endpoint": endpoint, "payload": payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return IdempotencyRequest(
+        key=key,
+        endpoint=endpoint,
+        fingerprint=hashlib.sha256(canonical.encode()).hexdigest(),
+    )
+
+
+class IdempotencyStats:
+    """Счётчики процесса: сохранённые ответы, повторы, конфликты ключей."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stored = 0
+        self.replayed = 0
+        self.mismatched = 0
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+idempotency_stats = IdempotencyStats()
+
+
+def check_replay(
+    session: Session,
+    request: Optional[IdempotencyRequest],
+    *,
+    business_id: int,
+    now: Optional[datetime] = None,
+) -> None:
+    """
+    Если ответ на этот ключ уже сохранён — IdempotentReplay с ним.
+    Тот же ключ с другим запросом — IdempotencyKeyMismatchError.
+    Обычное чтение по уникальному индексу, без блокировок.
+    """
+    if request is None:
+        return
+    record = idempotency_keys_repo.get_active(
+        session,
+        business_id=business_id,
+        key=request.key,
+        now=now or datetime.utcnow(),
+    )
+    if record is None:
+        return
+    if record.fingerprint != request.fingerprint:
+        idempotency_stats.incr("mismatched")
+        raise IdempotencyKeyMismatchError(
+            "Idempotency-Key уже использован для другого запроса"
+        )
+    idempotency_stats.incr("replayed")
+    raise IdempotentReplay(record.status_code, json.loads(record.response_body))
+
+
+def stage_response(
+    session: Session,
+    request: Optional[IdempotencyRequest],
+    *,
+    business_id: int,
+    status_code: int,
+    body: Any,
+) -> None:
+    """
+    Добавляет ответ в текущую транзакцию — он фиксируется тем же COMMIT,
+    что и сама операция. Сохраняются только успешные ответы: после
+    ошибки клиент может повторить запрос с тем же ключом.
+    """
+    if request is None:
+        return
+    now = datetime.utcnow()
+    idempotency_keys_repo.create(session, IdempotencyKey(
+        business_id=business_id,
+        key=request.key,
+        endpoint=request.endpoint,
+        fingerprint=request.fingerprint,
+        status_code=status_code,
+        response_body=json.dumps(body, default=str),
+        created_at=now,
+        expires_at=now + timedelta(hours=IDEMPOTENCY_TTL_HOURS),
+    ))
+    idempotency_stats.incr("stored")
+
+
+def purge_expired(session: Session, *, now: Optional[datetime] = None) -> int:
+    """Удаляет ключи с истёкшим TTL. Пишет, только если есть что удалять."""
+    now = now or datetime.utcnow()
+    if not idempotency_keys_repo.has_expired(session, now=now):
+        return 0
+    deleted = idempotency_keys_repo.delete_expired(session, now=now)
+    session.commit()
+    return deleted
@@ -0,0 +1,83 @@
+# app/services/recurrence.py
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional, Sequence
+
+# Шаг повторения по правилу
+FREQUENCY_STEPS = {
+    "weekly": timedelta(weeks=1),
+    "biweekly": timedelta(weeks=2),
+}
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    Правило серии: frequency (weekly / biweekly) и ровно одно из
+    count (число повторений) или until (последний день включительно).
+    """
+    frequency: str
+    count: Optional[int] = None
+    until: Optional[date] = None
+
+    def expand(self, first_start: datetime, *, limit: int) -> list[datetime]:
+        """
+        Начала всех повторений, начиная с first_start. Не больше limit —
+        защита от until на годы вперёд.
+        """
+        step = FREQUENCY_STEPS.get(self.frequency)
+        if step is None:
+            raise ValueError(f"Неизвестная периодичность: {self.frequency}")
+        if (self.count is None) == (self.until is None):
+            raise ValueError("Нужно указать ровно одно из count или until")
+
+        total = min(self.count, limit) if self.count is not None else limit
+        starts: list[datetime] = []
+        current = first_start
+        while len(starts) < total:
+            if self.until is not None and current.date() > self.until:
+                break
+            starts.append(current)
+            current += step
+        return starts
+
+
+@dataclass(frozen=True)
+class Blocker:
+    """Занятый интервал [start, end): бронь или отгул; reason — для отчёта."""
+    start: datetime
+    end: datetime
+    reason: str
+
+
+def find_conflicts(
+    intervals: Sequence[tuple[datetime, datetime]],
+    blockers: Sequence[Blocker],
+) -> dict[int, str]:
+    """
+    Один проход (sweep) по интервалам серии и занятым интервалам,
+    отсортированным по началу. Возвращает {индекс интервала: причина}
+    для интервалов, которые пересекаются хотя бы с одним blocker.
+
+    intervals должны быть упорядочены по началу и не пересекаться
+    друг с другом (повторения одной серии). O((n + m) log m).
+    """
+    ordered = sorted(blockers, key=lambda b: b.start)
+    active: list[tuple[datetime, int, Blocker]] = []  # heap по end
+    conflicts: dict[int, str] = {}
+    j = 0
+    for index, (start, end) in enumerate(intervals):
+        # Всё, что начинается до конца интервала, — кандидаты
+        while j < len(ordered) and ordered[j].start < end:
+            heapq.heappush(active, (ordered[j].end, j, ordered[j]))
+            j += 1
+        # Закончившиеся до начала интервала не пересекут и следующие
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        if active:
+            conflicts[index] = active[0][2].reason
+    return conflicts
@@ -1,8 +1,10 @@
 # app/services/schedule_service.py
 
+from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.repositories import (
@@ -11,7 +13,12 @@ from app.repositories import (
     bookings as bookings_repo,
     staff_services as staff_services_repo,
 )
+from app.core.events import event_bus
+from app.core.tracing import span
+from app.core.versions import change_versions
 from app.models.staff import Staff
+from app.models.time_off import TimeOff
+from app.models.working_hours import WorkingHours
 from app.services.availability_service import AvailabilityService
 from app.services.availability_service import Slot
 from app.services.booking_service import (
@@ -42,6 +49,7 @@ class ScheduleService:
         service_id: int,
         day: date,
         now: Optional[datetime] = None,
+        horizon_days: int = BOOKING_HORIZON_DAYS,
     ) -> List[Slot]:
         """
         Возвращает список слотов для записи.
@@ -50,11 +58,11 @@ class ScheduleService:
             если передан — слоты в прошлом и ближе lead time
             будут отброшены (удобно для "сегодня").
 
-        Если day за пределами горизонта — возвращает пустой список.
+        Если day за пределами горизонта (horizon_days) — возвращает пустой список.
         """
-        # Горизонт: дни за пределами BOOKING_HORIZON_DAYS → пустой список
+        # Горизонт: дни за пределами horizon_days → пустой список
         if now is not None:
-            horizon_date = (now + timedelta(days=BOOKING_HORIZON_DAYS)).date()
+            horizon_date = (now + timedelta(days=horizon_days)).date()
             if day > horizon_date:
                 return []
 
@@ -68,38 +76,43 @@ class ScheduleService:
         day_end = day_start + timedelta(days=1)
 
         # Проверка принадлежности staff к business
-        staff = session.get(Staff, staff_id)
+        with span("db.staff"):
+            staff = session.get(Staff, staff_id)
         if staff is None or staff.business_id != business_id:
             raise LookupError(
                 f"Staff {staff_id} not found in business {business_id}"
             )
 
         # 1️⃣ Данные из БД (repositories)
-        working_hours = working_hours_repo.get_for_staff_and_weekday(
-            session=session,
-            staff_id=staff_id,
-            weekday=day.weekday(),
-        )
+        with span("db.working_hours"):
+            working_hours = working_hours_repo.get_for_staff_and_weekday(
+                session=session,
+                staff_id=staff_id,
+                weekday=day.weekday(),
+            )
 
-        time_off = time_off_repo.get_for_staff_and_period(
-            session=session,
-            staff_id=staff_id,
-            start=day_start,
-            end=day_end,
-        )
+        with span("db.time_off"):
+            time_off = time_off_repo.get_for_staff_and_period(
+                session=session,
+                staff_id=staff_id,
+                start=day_start,
+                end=day_end,
+            )
 
-        bookings = bookings_repo.get_blocking_for_staff_and_period(
-            session=session,
-            staff_id=staff_id,
-            start=day_start,
-            end=day_end,
-            business_id=business_id,
-        )
+        with span("db.bookings"):
+            bookings = bookings_repo.get_blocking_for_staff_and_period(
+                session=session,
+                staff_id=staff_id,
+                start=day_start,
+                end=day_end,
+                business_id=business_id,
+            )
 
-        staff_services = staff_services_repo.get_for_staff(
-            session=session,
-            staff_id=staff_id,
-        )
+        with span("db.staff_services"):
+            staff_services = staff_services_repo.get_for_staff(
+                session=session,
+                staff_id=staff_id,
+            )
 
         # 2️⃣ Длительность услуги (доменное правило)
         service_duration_minutes = resolve_service_duration_minutes(
@@ -109,15 +122,16 @@ class ScheduleService:
         )
 
         # 3️⃣ Расчёт слотов (чистая бизнес-логика)
-        slots = self._availability.get_slots_for_day(
-            target_day=day,
-            staff_id=staff_id,
-            service_duration_minutes=service_duration_minutes,
-            working_hours=working_hours,
-            time_off=time_off,
-            bookings=bookings,
-            now=effective_now,
-        )
+        with span("availability"):
+            slots = self._availability.get_slots_for_day(
+                target_day=day,
+                staff_id=staff_id,
+                service_duration_minutes=service_duration_minutes,
+                working_hours=working_hours,
+                time_off=time_off,
+                bookings=bookings,
+                now=effective_now,
+            )
 
         return slots
     
@@ -143,3 +157,173 @@ def resolve_service_duration_minutes(
             f"StaffService not found for staff_id={staff_id}, service_id={service_id}"
         )
 
+
+def replace_working_week(
+    session: Session,
+    *,
+    business_id: int,
+    staff_id: int,
+    days: Sequence[dict],
+) -> List[WorkingHours]:
+    """
+    Заменяет недельный шаблон рабочих часов сотрудника одной транзакцией
+    (upsert по uq_staff_weekday, отсутствующие дни деактивируются).
+    Производные данные (ETag, slot-токены, SSE) инвалидируются один раз.
+    """
+    staff = session.get(Staff, staff_id)
+    if staff is None or staff.business_id != business_id:
+        raise LookupError(
+            f"Staff {staff_id} not found in business {business_id}"
+        )
+
+    try:
+        working_hours_repo.upsert_week(
+            session, business_id=business_id, staff_id=staff_id, days=days,
+        )
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    notify_schedule_changed(business_id=business_id, staff_id=staff_id)
+    return working_hours_repo.list_for_staff(session, staff_id=staff_id)
+
+
+@dataclass(frozen=True)
+class TimeOffConflict:
+    """Действующая бронь, которая попала в новый отгул."""
+    booking_id: int
+    staff_id: int
+    start_at: datetime
+    end_at: datetime
+    status: str
+    customer_id: int
+    time_off_id: int
+
+
+@dataclass
+class TimeOffResult:
+    created: list[TimeOff]
+    conflicts: list[TimeOffConflict]
+
+
+def add_time_off(
+    session: Session,
+    *,
+    business_id: int,
+    staff_ids: Sequence[int],
+    ranges: Sequence[tuple[datetime, datetime]],
+    reason: Optional[str] = None,
+) -> TimeOffResult:
+    """
+    Создаёт отгулы «каждый диапазон × каждый сотрудник» одной транзакцией
+    (один executemany INSERT). Брони не отменяются: в отчёт попадают
+    действующие брони (confirmed и живые hold), пересекающие новые отгулы, —
+    их находит один запрос по всем сотрудникам и общему периоду.
+    """
+    known_staff = set(session.scalars(
+        select(Staff.id).where(
+            Staff.id.in_(staff_ids), Staff.business_id == business_id,
+        )
+    ))
+    missing = [staff_id for staff_id in staff_ids if staff_id not in known_staff]
+    if missing:
+        raise LookupError(
+            f"Staff {missing[0]} not found in business {business_id}"
+        )
+
+    rows = [
+        {
+            "business_id": business_id,
+            "staff_id": staff_id,
+            "start_at": start_at,
+            "end_at": end_at,
+            "reason": reason,
+            "is_active": True,
+            "created_at": datetime.utcnow(),
+        }
+        for staff_id in staff_ids
+        for start_at, end_at in ranges
+    ]
+    try:
+        created = time_off_repo.insert_many(session, rows)
+        blocking = bookings_repo.get_blocking_for_staff_ids_and_period(
+            session,
+            staff_ids=staff_ids,
+            start=min(start for start, _ in ranges),
+            end=max(end for _, end in ranges),
+            business_id=business_id,
+        )
+        conflicts = _time_off_conflicts(created, blocking)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    for staff_id in staff_ids:
+        notify_schedule_changed(business_id=business_id, staff_id=staff_id)
+    # После commit объекты expired — обновляем одним запросом
+    created = time_off_repo.get_by_ids(session, [t.id for t in created])
+    return TimeOffResult(created=created, conflicts=conflicts)
+
+
+def cancel_time_off(
+    session: Session,
+    *,
+    business_id: int,
+    time_off_id: int,
+) -> TimeOff:
+    """Снимает отгул (is_active=False): слоты снова доступны."""
+    time_off = time_off_repo.get_by_id(
+        session, time_off_id, business_id=business_id,
+    )
+    if time_off is None:
+        raise LookupError(f"TimeOff {time_off_id} not found")
+    if time_off.is_active:
+        time_off.is_active = False
+        session.commit()
+        session.refresh(time_off)
+        notify_schedule_changed(
+            business_id=business_id, staff_id=time_off.staff_id,
+        )
+    return time_off
+
+
+def _time_off_conflicts(time_off, bookings) -> list[TimeOffConflict]:
+    """
+    Пары «бронь — новый отгул» в памяти: отгулы группируются по
+    сотруднику, каждая бронь сверяется только с отгулами своего
+    сотрудника (диапазонов в запросе немного).
+    Пересечение полуинтервалов [start, end).
+    """
+    by_staff: dict[int, list[TimeOff]] = {}
+    for item in time_off:
+        by_staff.setdefault(item.staff_id, []).append(item)
+
+    conflicts: list[TimeOffConflict] = []
+    for booking in sorted(bookings, key=lambda b: (b.start_at, b.id)):
+        for item in by_staff.get(booking.staff_id, ()):
+            if item.start_at < booking.end_at and booking.start_at < item.end_at:
+                conflicts.append(TimeOffConflict(
+                    booking_id=booking.id,
+                    staff_id=booking.staff_id,
+                    start_at=booking.start_at,
+                    end_at=booking.end_at,
+                    status=booking.status.value,
+                    customer_id=booking.customer_id,
+                    time_off_id=item.id,
+                ))
+                break
+    return conflicts
+
+
+def notify_schedule_changed(*, business_id: int, staff_id: int) -> None:
+    """
+    Вызывается ПОСЛЕ commit изменений расписания сотрудника
+    (рабочие часы, отгулы, привязка услуг): инвалидирует ETag
+    и выданные slot-токены, публикует событие для SSE-подписчиков.
+    """
+    change_versions.bump_schedule(business_id, staff_id)
+    event_bus.publish(
+        "schedule.changed", business_id=business_id, staff_id=staff_id,
+    )
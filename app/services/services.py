@@ -3,6 +3,7 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.versions import change_versions
 from app.repositories.services import ServiceRepository
 from app.schemas.services import ServiceCreate, ServiceUpdate
 
@@ -11,7 +12,9 @@ class ServiceService:
 
     @staticmethod
     def create_service(db: Session, data: ServiceCreate, *, business_id: int):
-        return ServiceRepository.create(db, data, business_id=business_id)
+        service = ServiceRepository.create(db, data, business_id=business_id)
+        change_versions.bump(business_id)
+        return service
 
     @staticmethod
     def get_service(db: Session, service_id: int, *, business_id: int):
@@ -36,9 +39,13 @@ class ServiceService:
         business_id: int,
     ):
         service = ServiceService.get_service(db, service_id, business_id=business_id)
-        return ServiceRepository.update(db, service, data)
+        service = ServiceRepository.update(db, service, data)
+        change_versions.bump(business_id)
+        return service
 
     @staticmethod
     def delete_service(db: Session, service_id: int, *, business_id: int):
         service = ServiceService.get_service(db, service_id, business_id=business_id)
-        return ServiceRepository.soft_delete(db, service)
+        service = ServiceRepository.soft_delete(db, service)
+        change_versions.bump(business_id)
+        return service
@@ -0,0 +1,137 @@
+# app/services/slot_tokens.py
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import SLOT_TOKEN_TTL_SECONDS
+from app.core.security import SECRET_KEY
+from app.core.versions import change_versions
+
+# Отдельный ключ, производный от SECRET_KEY: подпись токена слота
+# не взаимозаменяема с подписью JWT
+_KEY = hmac.new(SECRET_KEY.encode(), b"slot-token", hashlib.sha256).digest()
+
+
+class SlotTokenStats:
+    """Счётчики процесса: принятые и отвергнутые токены."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+slot_token_stats = SlotTokenStats()
+
+
+def token_window(now: datetime) -> int:
+    """
+    Номер окна выдачи токенов. Внутри окна токены детерминированы —
+    ответ со слотами можно отдавать по ETag (304).
+    """
+    return _timestamp(now) // SLOT_TOKEN_TTL_SECONDS
+
+
+def issue_slot_token(
+    *,
+    business_id: int,
+    staff_id: int,
+    service_id: int,
+    start_at: datetime,
+    duration_minutes: int,
+    schedule_version: int,
+    now: datetime,
+) -> str:
+    """
+    Токен «этот слот прошёл проверки расписания»:
+    "<epoch>.<schedule_version>.<expires>.<hmac>".
+
+    Подпись связывает staff, service, start, длительность, epoch процесса
+    и версию расписания сотрудника. schedule_version нужно прочитать
+    ДО расчёта слотов — иначе изменение расписания во время расчёта
+    останется незамеченным. Действует от SLOT_TOKEN_TTL_SECONDS
+    до 2 × SLOT_TOKEN_TTL_SECONDS.
+    """
+    epoch = change_versions.epoch
+    expires = (token_window(now) + 2) * SLOT_TOKEN_TTL_SECONDS
+    signature = _sign(
+        business_id, staff_id, service_id, start_at, duration_minutes,
+        epoch, schedule_version, expires,
+    )
+    return f"{epoch}.{schedule_version}.{expires}.{signature}"
+
+
+def verify_slot_token(
+    token: Optional[str],
+    *,
+    business_id: int,
+    staff_id: int,
+    service_id: int,
+    start_at: datetime,
+    duration_minutes: int,
+    now: datetime,
+) -> bool:
+    """
+    True — токен выдан этим процессом для этого слота, не истёк,
+    и расписание сотрудника с тех пор не менялось.
+    Любое несовпадение — False (вызывающий делает полную проверку).
+
+    При нескольких воркерах всегда False: изменение расписания в другом
+    процессе не увеличивает версию в этом, и токен пропустил бы бронь
+    в новый отгул или за пределы новых рабочих часов.
+    """
+    if not token:
+        return False
+    if not change_versions.authoritative:
+        slot_token_stats.incr("rejected")
+        return False
+    try:
+        epoch, version_s, expires_s, signature = token.split(".")
+        version, expires = int(version_s), int(expires_s)
+    except ValueError:
+        slot_token_stats.incr("rejected")
+        return False
+
+    expected = _sign(
+        business_id, staff_id, service_id, start_at, duration_minutes,
+        epoch, version, expires,
+    )
+    valid = (
+        hmac.compare_digest(signature, expected)
+        and epoch == change_versions.epoch
+        and version == change_versions.schedule(business_id, staff_id)
+        and expires > _timestamp(now)
+    )
+    slot_token_stats.incr("accepted" if valid else "rejected")
+    return valid
+
+
+def _sign(
+    business_id: int,
+    staff_id: int,
+    service_id: int,
+    start_at: datetime,
+    duration_minutes: int,
+    epoch: str,
+    version: int,
+    expires: int,
+) -> str:
+    message = (
+        f"{business_id}|{staff_id}|{service_id}|{start_at.isoformat()}|"
+        f"{duration_minutes}|{epoch}|{version}|{expires}"
+    )
+    return hmac.new(_KEY, message.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def _timestamp(moment: datetime) -> int:
+    # now в проекте — naive UTC (datetime.utcnow())
+    return int(moment.replace(tzinfo=timezone.utc).timestamp())
@@ -1,6 +1,7 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.versions import change_versions
 from app.repositories.staff import StaffRepository
 from app.schemas.staff import StaffCreate, StaffUpdate
 
@@ -9,7 +10,9 @@ class StaffService:
 
     @staticmethod
     def create_staff(db: Session, data: StaffCreate, *, business_id: int):
-        return StaffRepository.create(db, data, business_id=business_id)
+        staff = StaffRepository.create(db, data, business_id=business_id)
+        change_versions.bump(business_id, (staff.id,))
+        return staff
 
     @staticmethod
     def get_staff(db: Session, staff_id: int, *, business_id: int):
@@ -34,9 +37,13 @@ class StaffService:
         business_id: int,
     ):
         staff = StaffService.get_staff(db, staff_id, business_id=business_id)
-        return StaffRepository.update(db, staff, data)
+        staff = StaffRepository.update(db, staff, data)
+        change_versions.bump(business_id, (staff_id,))
+        return staff
 
     @staticmethod
     def delete_staff(db: Session, staff_id: int, *, business_id: int):
         staff = StaffService.get_staff(db, staff_id, business_id=business_id)
-        return StaffRepository.soft_delete(db, staff)
+        staff = StaffRepository.soft_delete(db, staff)
+        change_versions.bump(business_id, (staff_id,))
+        return staff
@@ -0,0 +1,247 @@
+# benchmarks/availability.py
+
+"""
+Микро-бенчмарк AvailabilityService на синтетических расписаниях.
+
+    python -m benchmarks.availability
+    python -m benchmarks.availability --save benchmarks/baselines/availability.json
+    python -m benchmarks.availability --compare benchmarks/baselines/availability.json
+
+Каждый сценарий задаёт число рабочих диапазонов, перерывов, отгулов,
+броней, шаг сетки и длительность услуги. Данные генерируются
+детерминированно (random.Random(seed)), поэтому прогоны сравнимы между
+собой. --compare завершается с кодом 1, если минимальное время
+какого-либо замера выросло больше чем на --threshold или если
+изменилось число диапазонов/слотов (оптимизация не должна менять
+результат).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import timeit
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Optional
+
+from app.services.availability_service import AvailabilityService
+from benchmarks.common import compare, load_results, print_comparison, save_results
+
+TARGET_DAY = date(2026, 3, 2)  # понедельник
+STAFF_ID = 1
+
+
+# ===== синтетические данные (по контрактам *Like из availability_service) =====
+
+@dataclass
+class WorkingHoursFake:
+    staff_id: int
+    weekday: int
+    start_time: time
+    end_time: time
+    break_start: Optional[time] = None
+    break_end: Optional[time] = None
+    is_active: bool = True
+
+
+@dataclass
+class TimeOffFake:
+    staff_id: int
+    start_at: datetime
+    end_at: datetime
+    is_active: bool = True
+
+
+@dataclass
+class BookingFake:
+    staff_id: int
+    start_at: datetime
+    end_at: datetime
+    status: str
+    is_active: bool = True
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    working_ranges: int
+    breaks: int
+    time_off: int
+    bookings: int
+    step_minutes: int = 15
+    duration_minutes: int = 30
+
+
+SCENARIOS = [
+    Scenario("empty-day", working_ranges=1, breaks=0, time_off=0, bookings=0),
+    Scenario("typical", working_ranges=1, breaks=1, time_off=1, bookings=12),
+    Scenario("busy", working_ranges=2, breaks=2, time_off=2, bookings=40),
+    Scenario("split-shifts", working_ranges=6, breaks=3, time_off=4, bookings=30),
+    Scenario("fine-grid", working_ranges=1, breaks=1, time_off=1, bookings=12,
+             step_minutes=5, duration_minutes=15),
+    Scenario("long-service", working_ranges=1, breaks=1, time_off=1, bookings=4,
+             duration_minutes=120),
+    Scenario("heavy-bookings", working_ranges=2, breaks=2, time_off=5, bookings=200),
+    Scenario("noisy-inputs", working_ranges=2, breaks=1, time_off=50, bookings=1000),
+]
+
+
+def _at(minutes: int) -> datetime:
+    return datetime.combine(TARGET_DAY, time.min) + timedelta(minutes=minutes)
+
+
+def _clock(minutes: int) -> time:
+    return (datetime.min + timedelta(minutes=minutes)).time()
+
+
+def generate(scenario: Scenario, *, seed: int = 42) -> dict:
+    """
+    Входные данные get_*_for_day для одного дня сотрудника STAFF_ID.
+    Рабочий день 07:00–22:00 делится на working_ranges смен с зазорами;
+    перерыв — в середине первых breaks смен. Отгулы ставятся случайно
+    на 5-минутную сетку; ~20% броней — другого сотрудника или
+    неблокирующего статуса.
+    """
+    rng = random.Random(seed)
+    day_start, day_end = 7 * 60, 22 * 60
+    span = (day_end - day_start) // scenario.working_ranges
+
+    working_hours = []
+    for i in range(scenario.working_ranges):
+        start = day_start + i * span
+        end = start + span - (15 if scenario.working_ranges > 1 else 0)
+        wh = WorkingHoursFake(STAFF_ID, TARGET_DAY.weekday(), _clock(start), _clock(end))
+        if i < scenario.breaks and end - start >= 120:
+            middle = (start + end) // 2 // 5 * 5
+            wh.break_start, wh.break_end = _clock(middle), _clock(middle + 30)
+        working_hours.append(wh)
+    # Остальные дни недели — отфильтровываются движком
+    for weekday in range(7):
+        if weekday != TARGET_DAY.weekday():
+            working_hours.append(
+                WorkingHoursFake(STAFF_ID, weekday, time(9, 0), time(18, 0))
+            )
+
+    time_off = []
+    for _ in range(scenario.time_off):
+        start = rng.randrange(day_start - 120, day_end, 5)
+        time_off.append(TimeOffFake(
+            STAFF_ID, _at(start), _at(start + rng.choice((30, 60, 120, 240))),
+        ))
+
+    # Брони дня идут подряд с небольшими зазорами (как реальная запись);
+    # те, что не поместились в день, уходят на соседние дни — движок
+    # должен их отсечь
+    bookings = []
+    cursor = day_start
+    for _ in range(scenario.bookings):
+        duration = rng.choice((30, 45, 60, 90))
+        cursor += rng.choice((0, 15, 30, 45, 60, 120))
+        start = cursor if cursor + duration <= day_end else cursor + rng.choice((-1, 1)) * 24 * 60
+        cursor += duration
+        roll = rng.random()
+        status = "confirmed" if roll < 0.65 else "hold" if roll < 0.8 else "cancelled"
+        staff_id = STAFF_ID if rng.random() < 0.95 else STAFF_ID + 1
+        bookings.append(BookingFake(staff_id, _at(start), _at(start + duration), status))
+
+    return {
+        "target_day": TARGET_DAY,
+        "staff_id": STAFF_ID,
+        "working_hours": working_hours,
+        "time_off": time_off,
+        "bookings": bookings,
+    }
+
+
+# ===== замеры =====
+
+def measure(fn: Callable[[], object], *, repeat: int) -> dict:
+    """
+    timeit: число вызовов подбирается autorange (≥ 0.2 с на повтор),
+    затем repeat повторов. Время — микросекунды на вызов.
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    per_call = [total / number * 1e6 for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median_us": round(statistics.median(per_call), 3),
+        "min_us": round(min(per_call), 3),
+        "calls": number * repeat,
+    }
+
+
+def run(scenarios, *, repeat: int, seed: int) -> dict[str, dict]:
+    results = {}
+    for scenario in scenarios:
+        service = AvailabilityService(slot_step_minutes=scenario.step_minutes)
+        data = generate(scenario, seed=seed)
+
+        ranges = service.get_available_ranges_for_day(**data)
+        results[f"{scenario.name}/ranges"] = {
+            **measure(lambda: service.get_available_ranges_for_day(**data), repeat=repeat),
+            "output": len(ranges),
+        }
+
+        slots = service.get_slots_for_day(
+            **data, service_duration_minutes=scenario.duration_minutes,
+        )
+        results[f"{scenario.name}/slots"] = {
+            **measure(
+                lambda: service.get_slots_for_day(
+                    **data, service_duration_minutes=scenario.duration_minutes,
+                ),
+                repeat=repeat,
+            ),
+            "output": len(slots),
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк AvailabilityService")
+    parser.add_argument("--scenario", action="append", help="только эти сценарии (можно несколько)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", metavar="PATH", help="записать результаты (baseline) в JSON")
+    parser.add_argument("--compare", metavar="PATH", help="сравнить с baseline из JSON")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="допустимый рост времени (0.15 = +15%%)")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    if not scenarios:
+        parser.error(f"нет сценариев; доступны: {', '.join(s.name for s in SCENARIOS)}")
+
+    results = run(scenarios, repeat=args.repeat, seed=args.seed)
+
+    if args.save:
+        save_results(args.save, results, benchmark="availability", seed=args.seed)
+
+    if not args.compare:
+        for name, metrics in results.items():
+            print(
+                f"{name:<28} min {metrics['min_us']:>9.1f} µs  "
+                f"median {metrics['median_us']:>9.1f} µs  output={metrics['output']}"
+            )
+        return 0
+
+    baseline = load_results(args.compare)
+    # Минимум устойчивее медианы к шуму соседних процессов
+    print_comparison(baseline, results, key="min_us")
+    regressions = compare(baseline, results, compare_keys=("min_us",), threshold=args.threshold)
+    changed = [
+        name for name, metrics in results.items()
+        if name in baseline and baseline[name].get("output") != metrics["output"]
+    ]
+    for r in regressions:
+        print(f"REGRESSION {r.name}: {r.baseline:.1f} → {r.current:.1f} µs (×{r.ratio:.2f})")
+    for name in changed:
+        print(f"OUTPUT CHANGED {name}: {baseline[name]['output']} → {results[name]['output']}")
+    return 1 if regressions or changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
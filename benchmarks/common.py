@@ -0,0 +1,135 @@
+# benchmarks/common.py
+
+"""
+Общие части бенчмарков: перцентили, JSON-результаты и сравнение
+с baseline. Формат файла результатов:
+
+    {"meta": {...}, "results": {"<имя>": {"<метрика>": число, ...}}}
+
+Сравниваются только метрики из compare_keys (время — «меньше = лучше»).
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Mapping, Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Перцентиль q (0..100) с линейной интерполяцией, как numpy по умолчанию."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples_ms: Sequence[float]) -> dict:
+    """p50/p95/p99/max в миллисекундах по выборке длительностей."""
+    return {
+        "n": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 4),
+        "p95_ms": round(percentile(samples_ms, 95), 4),
+        "p99_ms": round(percentile(samples_ms, 99), 4),
+        "max_ms": round(max(samples_ms, default=0.0), 4),
+    }
+
+
+# Границы корзин гистограммы латентности, мс (последняя корзина — «больше»)
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def histogram(samples_ms: Sequence[float], bounds: Sequence[float] = HISTOGRAM_BOUNDS_MS) -> dict:
+    """Число замеров в корзинах «≤ граница» (не кумулятивно) и «> последней»."""
+    counts = {f"le_{bound}": 0 for bound in bounds}
+    counts["gt_max"] = 0
+    for value in samples_ms:
+        for bound in bounds:
+            if value <= bound:
+                counts[f"le_{bound}"] += 1
+                break
+        else:
+            counts["gt_max"] += 1
+    return counts
+
+
+def environment() -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def save_results(path: str | Path, results: Mapping[str, dict], **meta) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"meta": {**environment(), **meta}, "results": dict(results)}
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+
+
+def load_results(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text())["results"]
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def compare(
+    baseline: Mapping[str, dict],
+    current: Mapping[str, dict],
+    *,
+    compare_keys: Iterable[str],
+    threshold: float,
+) -> list[Regression]:
+    """
+    Метрики, выросшие больше чем на threshold (0.15 = +15%) относительно
+    baseline. Сценарии, которых нет в одном из наборов, пропускаются.
+    """
+    regressions = []
+    keys = tuple(compare_keys)
+    for name, metrics in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in keys:
+            if key not in base or key not in metrics:
+                continue
+            if metrics[key] > base[key] * (1 + threshold):
+                regressions.append(Regression(name, key, base[key], metrics[key]))
+    return regressions
+
+
+def print_comparison(
+    baseline: Mapping[str, dict],
+    current: Mapping[str, dict],
+    *,
+    key: str,
+) -> None:
+    """Таблица «baseline → текущее (изменение)» по одной метрике."""
+    width = max((len(name) for name in current), default=10)
+    for name, metrics in current.items():
+        base = baseline.get(name, {}).get(key)
+        value = metrics.get(key)
+        if base is None or value is None:
+            print(f"{name:<{width}}  {'—':>12}  {value!s:>12}")
+            continue
+        change = (value / base - 1) * 100 if base else float("inf")
+        print(f"{name:<{width}}  {base:>12.3f}  {value:>12.3f}  {change:+7.1f}%")
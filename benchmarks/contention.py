@@ -0,0 +1,406 @@
+# benchmarks/contention.py
+
+"""
+Нагрузка на путь записи BookingService несколькими процессами над одним
+файлом SQLite (WAL, busy_timeout, BEGIN IMMEDIATE, повторы с backoff):
+
+    DATABASE_URL=sqlite:///./contention.db python -m benchmarks.contention
+    DATABASE_URL=sqlite:///./contention.db python -m benchmarks.contention --workers 8 --duration 20
+    DATABASE_URL=sqlite:///./contention.db python -m benchmarks.contention --save benchmarks/baselines/contention.json
+    DATABASE_URL=sqlite:///./contention.db python -m benchmarks.contention --compare benchmarks/baselines/contention.json
+
+Сценарии (каждый — на заново созданной БД):
+    overlap  — все процессы бронируют одних и тех же --hot-staff
+               сотрудников и подтверждают/отменяют чужие брони:
+               конфликты слотов и статусов + борьба за write-lock;
+    disjoint — у каждого процесса свой сотрудник: конфликтов по данным
+               нет, остаётся только общий write-lock файла.
+
+Процесс выполняет create_booking / confirm_booking / cancel_booking
+в пропорции --mix. Итог: пропускная способность, латентность по
+операциям, распределение ожидания BEGIN IMMEDIATE, доля 409
+(SlotUnavailableError, BookingStateError), 503 (BookingBusyError)
+и «database is locked», вышедших наружу мимо повторов. После прогона
+блокирующие брони (CONFIRMED и неистёкшие HOLD) проверяются на
+пересечения у одного сотрудника — любое пересечение даёт код 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import random
+import sqlite3
+import sys
+import time as clock
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import DATABASE_URL
+from app.db.retry import is_database_locked, write_lock_stats
+from app.db.session import SessionLocal, engine
+from app.models import business, business_user, customer, service, time_off, user  # noqa: F401 — регистрация мапперов
+from app.models.booking import Booking, BookingStatus
+from app.models.service import Service
+from app.models.staff import Staff
+from app.models.staff_service import StaffService
+from app.models.working_hours import WorkingHours
+from app.services.booking_service import (
+    BookingBusyError,
+    BookingNotFoundError,
+    BookingService,
+    BookingStateError,
+    SlotUnavailableError,
+)
+from benchmarks.common import compare, load_results, print_comparison, save_results, summarize
+from benchmarks.dataset import DEFAULT_DATABASE_URL, _insert_returning_ids, migrate
+
+BUSINESS_ID = 1  # «Default Business» из миграций
+WORK_START, WORK_END = time(8, 0), time(20, 0)
+SERVICE_DURATIONS = (30, 60)
+CUSTOMER_PHONES = 50  # общий пул: get-or-create клиента тоже конкурирует
+ACTIONS = ("create", "confirm", "cancel")
+SCENARIOS = ("overlap", "disjoint")
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    scenario: str
+    workers: int
+    duration: float
+    hot_staff: int
+    days: int
+    mix: tuple[int, int, int]
+    confirm_ratio: float
+    seed: int
+
+
+@dataclass
+class WorkerReport:
+    """Результат одного процесса (передаётся через очередь — только простые типы)."""
+    latencies_ms: dict[str, list[float]] = field(default_factory=lambda: {a: [] for a in ACTIONS})
+    lock_waits_ms: list[float] = field(default_factory=list)
+    outcomes: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    retries: int = 0
+    gave_up: int = 0
+    hold_seconds_total: float = 0.0
+    hold_seconds_max: float = 0.0
+
+
+# ===== подготовка БД =====
+
+def seed(*, staff: int) -> dict:
+    """Услуги 30/60 мин и staff сотрудников, работающих ежедневно 08:00–20:00."""
+    with engine.connect() as conn:
+        service_ids = _insert_returning_ids(conn, Service.__table__, [
+            {"business_id": BUSINESS_ID, "name": f"Услуга {d} мин",
+             "duration_minutes": d, "price": 1000, "is_active": True}
+            for d in SERVICE_DURATIONS
+        ])
+        staff_ids = _insert_returning_ids(conn, Staff.__table__, [
+            {"business_id": BUSINESS_ID, "first_name": f"Мастер {i}", "last_name": None,
+             "phone": f"+7800000{i:04d}", "is_active": True}
+            for i in range(1, staff + 1)
+        ])
+        conn.execute(StaffService.__table__.insert(), [
+            {"staff_id": staff_id, "service_id": service_id, "price": 1000,
+             "duration": duration, "is_active": True}
+            for staff_id in staff_ids
+            for service_id, duration in zip(service_ids, SERVICE_DURATIONS)
+        ])
+        conn.execute(WorkingHours.__table__.insert(), [
+            {"business_id": BUSINESS_ID, "staff_id": staff_id, "weekday": weekday,
+             "start_time": WORK_START, "end_time": WORK_END,
+             "break_start": None, "break_end": None, "is_active": True}
+            for staff_id in staff_ids
+            for weekday in range(7)
+        ])
+        conn.commit()
+    return {"staff_ids": staff_ids, "service_ids": service_ids}
+
+
+def find_double_bookings(*, now: datetime) -> list[tuple[int, int, int]]:
+    """
+    Пары пересекающихся блокирующих броней одного сотрудника
+    (тот же критерий, что и has_overlap): [(staff_id, id1, id2)].
+    """
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(Booking.staff_id, Booking.id, Booking.start_at, Booking.end_at)
+            .where(
+                Booking.is_active == True,
+                or_(
+                    Booking.status == BookingStatus.CONFIRMED,
+                    (Booking.status == BookingStatus.HOLD) & (Booking.expires_at > now),
+                ),
+            )
+            .order_by(Booking.staff_id, Booking.start_at)
+        ).all()
+
+    overlaps = []
+    latest: dict[int, tuple[int, datetime]] = {}  # staff_id → (id, max end_at)
+    for staff_id, booking_id, start_at, end_at in rows:
+        previous = latest.get(staff_id)
+        if previous is not None and start_at < previous[1]:
+            overlaps.append((staff_id, previous[0], booking_id))
+        if previous is None or end_at > previous[1]:
+            latest[staff_id] = (booking_id, end_at)
+    return overlaps
+
+
+# ===== процесс-нагрузчик =====
+
+def _worker(index: int, config: RunConfig, targets: dict, barrier, queue) -> None:
+    rng = random.Random(config.seed * 1000 + index)
+    service = BookingService()
+    report = WorkerReport()
+
+    if config.scenario == "overlap":
+        staff_ids = targets["staff_ids"][:config.hot_staff]
+    else:
+        staff_ids = [targets["staff_ids"][index]]
+    service_ids = targets["service_ids"]
+    grid = [
+        (day, minutes)
+        for day in range(2, config.days + 2)
+        for minutes in range(WORK_START.hour * 60, WORK_END.hour * 60 - max(SERVICE_DURATIONS) + 1, 15)
+    ]
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    holds: list[int] = []      # свои HOLD — кандидаты на подтверждение
+    active: list[int] = []     # свои HOLD/CONFIRMED — кандидаты на отмену
+    max_seen_id = 0
+
+    def pick(own: list[int]) -> Optional[int]:
+        # overlap: любые брони (id последовательны), в т.ч. чужие
+        if config.scenario == "overlap" and max_seen_id and rng.random() < 0.5:
+            return rng.randint(1, max_seen_id)
+        return own.pop(rng.randrange(len(own))) if own else None
+
+    barrier.wait()
+    deadline = clock.perf_counter() + config.duration
+    while clock.perf_counter() < deadline:
+        action = rng.choices(ACTIONS, config.mix)[0]
+        booking_id = None
+        if action == "confirm":
+            booking_id = pick(holds)
+        elif action == "cancel":
+            booking_id = pick(active)
+        if action != "create" and booking_id is None:
+            action = "create"
+
+        wait_before = write_lock_stats.wait_seconds_total
+        acquired_before = write_lock_stats.acquired
+        started = clock.perf_counter()
+        session = SessionLocal()
+        try:
+            if action == "create":
+                day, minutes = rng.choice(grid)
+                confirm = rng.random() < config.confirm_ratio
+                booking = service.create_booking(
+                    session,
+                    business_id=BUSINESS_ID,
+                    staff_id=rng.choice(staff_ids),
+                    service_id=rng.choice(service_ids),
+                    start_at=today + timedelta(days=day, minutes=minutes),
+                    confirm=confirm,
+                    customer_name=f"Клиент {index}",
+                    customer_phone=f"+7900{rng.randrange(CUSTOMER_PHONES):07d}",
+                )
+                max_seen_id = max(max_seen_id, booking.id)
+                active.append(booking.id)
+                if not confirm:
+                    holds.append(booking.id)
+            elif action == "confirm":
+                service.confirm_booking(session, booking_id, business_id=BUSINESS_ID)
+            else:
+                service.cancel_booking(session, booking_id, business_id=BUSINESS_ID)
+            outcome = "ok"
+        except (SlotUnavailableError, BookingStateError):
+            outcome = "conflict_409"
+        except BookingNotFoundError:
+            outcome = "not_found_404"
+        except BookingBusyError:
+            outcome = "busy_503"
+        except (DBAPIError, sqlite3.OperationalError) as e:
+            if not is_database_locked(e):
+                raise
+            outcome = "locked"
+        except Exception as e:
+            outcome = "error"
+            report.errors[f"{type(e).__name__}: {e}"[:200]] += 1
+        finally:
+            session.close()
+
+        report.latencies_ms[action].append((clock.perf_counter() - started) * 1000)
+        report.outcomes[f"{action}.{outcome}"] += 1
+        if write_lock_stats.acquired != acquired_before:
+            report.lock_waits_ms.append((write_lock_stats.wait_seconds_total - wait_before) * 1000)
+
+    report.retries = write_lock_stats.retries
+    report.gave_up = write_lock_stats.gave_up
+    report.hold_seconds_total = write_lock_stats.hold_seconds_total
+    report.hold_seconds_max = write_lock_stats.hold_seconds_max
+    queue.put(report)
+
+
+# ===== прогон сценария =====
+
+def run_scenario(config: RunConfig) -> dict[str, dict]:
+    migrate(reset=True)
+    staff = config.workers if config.scenario == "disjoint" else config.hot_staff
+    targets = seed(staff=staff)
+
+    # spawn: у каждого процесса своё подключение и свой пул движка
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(config.workers + 1)
+    queue = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, args=(i, config, targets, barrier, queue))
+        for i in range(config.workers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    started = clock.perf_counter()
+    reports = [queue.get() for _ in processes]
+    elapsed = clock.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    outcomes = sum((r.outcomes for r in reports), Counter())
+    errors = sum((r.errors for r in reports), Counter())
+    ops = sum(outcomes.values())
+    writes_ok = sum(n for key, n in outcomes.items() if key.endswith(".ok"))
+    conflicts = sum(n for key, n in outcomes.items() if key.endswith(".conflict_409"))
+    busy = sum(n for key, n in outcomes.items() if key.endswith(".busy_503"))
+    locked = sum(n for key, n in outcomes.items() if key.endswith(".locked"))
+    double_bookings = find_double_bookings(now=datetime.utcnow())
+
+    results = {}
+    for action in ACTIONS:
+        samples = [ms for r in reports for ms in r.latencies_ms[action]]
+        results[f"{config.scenario}/{action}"] = {
+            **summarize(samples),
+            **{key.split(".", 1)[1]: n for key, n in outcomes.items() if key.startswith(action + ".")},
+        }
+    results[f"{config.scenario}/lock_wait"] = summarize([ms for r in reports for ms in r.lock_waits_ms])
+    results[f"{config.scenario}/total"] = {
+        "workers": config.workers,
+        "staff": staff,
+        "seconds": round(elapsed, 2),
+        "ops": ops,
+        "ops_per_s": round(ops / elapsed, 1),
+        "writes_ok_per_s": round(writes_ok / elapsed, 1),
+        "conflict_rate": round(conflicts / ops, 4) if ops else 0.0,
+        "busy_503": busy,
+        "locked": locked,
+        "retries": sum(r.retries for r in reports),
+        "gave_up": sum(r.gave_up for r in reports),
+        "lock_hold_ms_max": round(max(r.hold_seconds_max for r in reports) * 1000, 3),
+        "lock_hold_ms_total": round(sum(r.hold_seconds_total for r in reports) * 1000, 1),
+        "errors": sum(errors.values()),
+        "double_bookings": len(double_bookings),
+    }
+    for message, n in errors.most_common(5):
+        print(f"  error ×{n}: {message}")
+    for staff_id, first, second in double_bookings[:10]:
+        print(f"  DOUBLE BOOKING staff {staff_id}: {first} ↔ {second}")
+    return results
+
+
+def _print_scenario(name: str, results: dict[str, dict]) -> None:
+    total = results[f"{name}/total"]
+    wait = results[f"{name}/lock_wait"]
+    print(
+        f"[{name}] {total['workers']} процессов, {total['staff']} сотр.: "
+        f"{total['ops_per_s']} оп/с (успешных {total['writes_ok_per_s']}/с), "
+        f"409 {total['conflict_rate']:.1%}, 503 {total['busy_503']}, locked {total['locked']}, "
+        f"повторов {total['retries']}, двойных броней {total['double_bookings']}"
+    )
+    print(
+        f"  lock wait  p50 {wait['p50_ms']:>8.2f}  p95 {wait['p95_ms']:>8.2f}  "
+        f"p99 {wait['p99_ms']:>8.2f}  max {wait['max_ms']:>8.2f} ms  (hold max {total['lock_hold_ms_max']} ms)"
+    )
+    for action in ACTIONS:
+        m = results[f"{name}/{action}"]
+        counts = ", ".join(f"{k}={v}" for k, v in m.items() if not k.endswith("_ms") and k != "n")
+        print(
+            f"  {action:<8}   p50 {m['p50_ms']:>8.2f}  p95 {m['p95_ms']:>8.2f}  "
+            f"p99 {m['p99_ms']:>8.2f}  max {m['max_ms']:>8.2f} ms  n={m['n']} ({counts})"
+        )
+
+
+def _parse_mix(value: str) -> tuple[int, int, int]:
+    weights = dict(part.split("=") for part in value.split(","))
+    unknown = set(weights) - set(ACTIONS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"неизвестные операции: {', '.join(sorted(unknown))}")
+    return tuple(int(weights.get(action, 0)) for action in ACTIONS)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Конкурентная запись броней несколькими процессами")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0, help="секунд на сценарий")
+    parser.add_argument("--hot-staff", type=int, default=2, help="сотрудников в сценарии overlap")
+    parser.add_argument("--days", type=int, default=14, help="дней, на которые бронируют")
+    parser.add_argument("--mix", type=_parse_mix, default="create=60,confirm=25,cancel=15")
+    parser.add_argument("--confirm-ratio", type=float, default=0.3,
+                        help="доля create сразу в CONFIRMED (остальные — HOLD)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--force", action="store_true", help="разрешить запись в app.db по умолчанию")
+    args = parser.parse_args(argv)
+
+    if DATABASE_URL == DEFAULT_DATABASE_URL and not args.force:
+        parser.error("DATABASE_URL указывает на app.db; задайте отдельный файл или --force")
+    if not DATABASE_URL.startswith("sqlite"):
+        parser.error("бенчмарк рассчитан на SQLite (BEGIN IMMEDIATE, WAL)")
+
+    results = {}
+    for scenario in args.scenario or SCENARIOS:
+        config = RunConfig(
+            scenario=scenario, workers=args.workers, duration=args.duration,
+            hot_staff=args.hot_staff, days=args.days, mix=args.mix,
+            confirm_ratio=args.confirm_ratio, seed=args.seed,
+        )
+        scenario_results = run_scenario(config)
+        _print_scenario(scenario, scenario_results)
+        results.update(scenario_results)
+
+    if args.save:
+        save_results(args.save, results, benchmark="contention", workers=args.workers,
+                     duration=args.duration, mix=list(args.mix), seed=args.seed)
+
+    failed = [name for name, m in results.items() if m.get("double_bookings")]
+    for name in failed:
+        print(f"DOUBLE BOOKING {name}: {results[name]['double_bookings']}")
+    if not args.compare:
+        return 1 if failed else 0
+
+    baseline = load_results(args.compare)
+    print_comparison(baseline, {k: m for k, m in results.items() if "p95_ms" in m}, key="p95_ms")
+    regressions = compare(baseline, results, compare_keys=("p50_ms", "p95_ms"), threshold=args.threshold)
+    # Пропускная способность — «больше = лучше»: сравниваем обратную величину
+    for name, metrics in results.items():
+        base = baseline.get(name, {}).get("ops_per_s")
+        if base and metrics.get("ops_per_s", base) < base / (1 + args.threshold):
+            print(f"REGRESSION {name} ops_per_s: {base} → {metrics['ops_per_s']}")
+            failed.append(name)
+    for r in regressions:
+        print(f"REGRESSION {r.name} {r.metric}: {r.baseline} → {r.current} (×{r.ratio:.2f})")
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
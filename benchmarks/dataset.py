@@ -0,0 +1,376 @@
+# benchmarks/dataset.py
+
+"""
+Генератор синтетической БД «большого» бизнеса для бенчмарков.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.dataset --bookings 2000000
+
+Схема создаётся миграциями (alembic upgrade head), данные вставляются
+пакетами (executemany по BATCH_SIZE строк, COMMIT на пакет). Данные
+детерминированы: тот же --seed и те же размеры дают ту же БД (кроме
+дат — окно броней строится от текущего дня).
+
+Владелец каждого бизнеса — owner<N>@bench.example.com с паролем BENCH_PASSWORD
+(для HTTP-бенчмарков).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time as clock
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Table, func, select
+from sqlalchemy.engine import Connection, make_url
+
+from app.core.config import DATABASE_URL
+from app.core.security import hash_password
+from app.db.session import engine
+from app.models.booking import Booking, BookingStatus
+from app.models.business import Business
+from app.models.business_user import BusinessRole, BusinessUser
+from app.models.customer import Customer
+from app.models.service import Service
+from app.models.staff import Staff
+from app.models.staff_service import StaffService
+from app.models.time_off import TimeOff
+from app.models.user import User
+from app.models.working_hours import WorkingHours
+
+BENCH_PASSWORD = "bench-password"
+BATCH_SIZE = 20_000
+SLOT_STEP_MINUTES = 15
+DEFAULT_DATABASE_URL = "sqlite:///./app.db"
+
+# Смены (начало, конец, перерыв) — как у типичного салона
+SHIFTS = [
+    (time(9, 0), time(18, 0), (time(13, 0), time(14, 0))),
+    (time(10, 0), time(20, 0), (time(14, 0), time(15, 0))),
+    (time(12, 0), time(21, 0), None),
+]
+SERVICE_DURATIONS = (30, 45, 60, 60, 90, 120)
+
+# Доли статусов: (статус, вес) для прошедших и будущих броней
+PAST_STATUSES = ((BookingStatus.CONFIRMED, 78), (BookingStatus.CANCELLED, 14), (BookingStatus.EXPIRED, 8))
+FUTURE_STATUSES = (
+    (BookingStatus.CONFIRMED, 82), (BookingStatus.CANCELLED, 12),
+    (BookingStatus.HOLD, 4), (BookingStatus.EXPIRED, 2),
+)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    businesses: int = 3
+    staff: int = 40             # на бизнес
+    services: int = 25          # на бизнес
+    customers: int = 20_000     # на бизнес
+    bookings: int = 300_000     # всего, приблизительно
+    past_days: int = 365
+    future_days: int = 30
+    seed: int = 1
+
+
+class _Writer:
+    """Копит строки таблицы и пишет их пакетами по BATCH_SIZE."""
+
+    def __init__(self, conn: Connection, table: Table) -> None:
+        self._conn = conn
+        self._table = table
+        self._rows: list[dict] = []
+        self.written = 0
+
+    def add(self, row: dict) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        self._conn.execute(self._table.insert(), self._rows)
+        self._conn.commit()
+        self.written += len(self._rows)
+        self._rows = []
+
+
+def _insert_returning_ids(conn: Connection, table: Table, rows: list[dict]) -> list[int]:
+    result = conn.execute(
+        table.insert().returning(table.c.id, sort_by_parameter_order=True), rows,
+    )
+    return list(result.scalars())
+
+
+def generate(conn: Connection, spec: DatasetSpec) -> dict:
+    rng = random.Random(spec.seed)
+    today = datetime.utcnow().date()
+    first_day = today - timedelta(days=spec.past_days)
+    days = [first_day + timedelta(days=i) for i in range(spec.past_days + spec.future_days)]
+    now = datetime.utcnow()
+
+    # Хэш пароля один на всех владельцев — bcrypt дорогой
+    password_hash = hash_password(BENCH_PASSWORD)
+    staff_days = []  # (business_id, staff_id, shift, offered [(ss_id, price, duration)], day)
+    customers_by_business: dict[int, list[tuple[int, str]]] = {}
+
+    for b in range(1, spec.businesses + 1):
+        user_id = _insert_returning_ids(conn, User.__table__, [{
+            "email": f"owner{b}@bench.example.com",
+            "hashed_password": password_hash,
+            "is_active": True,
+            "created_at": now,
+        }])[0]
+        business_id = _insert_returning_ids(conn, Business.__table__, [{
+            "name": f"Bench business {b}", "timezone": "UTC", "is_active": True,
+        }])[0]
+        conn.execute(BusinessUser.__table__.insert(), [{
+            "user_id": user_id, "business_id": business_id, "role": BusinessRole.OWNER,
+        }])
+
+        service_rows = [
+            {
+                "business_id": business_id,
+                "name": f"Услуга {i}",
+                "duration_minutes": rng.choice(SERVICE_DURATIONS),
+                "price": rng.randrange(500, 5000, 100),
+                "is_active": True,
+            }
+            for i in range(1, spec.services + 1)
+        ]
+        service_ids = _insert_returning_ids(conn, Service.__table__, service_rows)
+
+        staff_ids = _insert_returning_ids(conn, Staff.__table__, [
+            {
+                "business_id": business_id,
+                "first_name": f"Мастер {i}",
+                "last_name": None,
+                "phone": f"+7800{business_id:03d}{i:04d}",
+                "is_active": True,
+            }
+            for i in range(1, spec.staff + 1)
+        ])
+
+        customer_rows = [
+            {
+                "business_id": business_id,
+                "name": f"Клиент {i}",
+                "phone": f"+79{business_id:03d}{i:07d}",
+                "email": None,
+                "is_active": True,
+                "created_at": now,
+            }
+            for i in range(1, spec.customers + 1)
+        ]
+        customer_ids = _insert_returning_ids(conn, Customer.__table__, customer_rows)
+        customers_by_business[business_id] = [
+            (customer_id, row["name"]) for customer_id, row in zip(customer_ids, customer_rows)
+        ]
+
+        wh_rows, off_rows = [], []
+        for staff_id in staff_ids:
+            chosen = rng.sample(
+                list(zip(service_ids, service_rows)),
+                k=rng.randint(min(5, len(service_ids)), min(12, len(service_ids))),
+            )
+            ss_rows = [
+                {
+                    "staff_id": staff_id,
+                    "service_id": service_id,
+                    "price": int(row["price"]) + rng.choice((0, 0, 200, 500)),
+                    "duration": row["duration_minutes"],
+                    "is_active": True,
+                }
+                for service_id, row in chosen
+            ]
+            ss_ids = _insert_returning_ids(conn, StaffService.__table__, ss_rows)
+            offered = [(ss_id, row["price"], row["duration"]) for ss_id, row in zip(ss_ids, ss_rows)]
+
+            shift = rng.choice(SHIFTS)
+            workdays = sorted(rng.sample(range(7), k=rng.choice((5, 5, 6))))
+            for weekday in workdays:
+                brk = shift[2]
+                wh_rows.append({
+                    "business_id": business_id,
+                    "staff_id": staff_id,
+                    "weekday": weekday,
+                    "start_time": shift[0],
+                    "end_time": shift[1],
+                    "break_start": brk[0] if brk else None,
+                    "break_end": brk[1] if brk else None,
+                    "is_active": True,
+                })
+
+            # Отпуск 7–14 дней и несколько больничных
+            off_days: set[date] = set()
+            vacation_start = rng.choice(days)
+            vacation_length = rng.randint(7, 14)
+            off_rows.append(_time_off_row(business_id, staff_id, vacation_start, vacation_length, "vacation", now))
+            off_days.update(vacation_start + timedelta(days=i) for i in range(vacation_length))
+            for _ in range(rng.randint(1, 4)):
+                sick_day = rng.choice(days)
+                off_rows.append(_time_off_row(business_id, staff_id, sick_day, 1, "sick", now))
+                off_days.add(sick_day)
+
+            for day in days:
+                if day.weekday() in workdays and day not in off_days:
+                    staff_days.append((business_id, staff_id, shift, offered, day))
+
+        conn.execute(WorkingHours.__table__.insert(), wh_rows)
+        conn.execute(TimeOff.__table__.insert(), off_rows)
+        conn.commit()
+
+    bookings = _generate_bookings(conn, rng, spec, staff_days, customers_by_business, now=now, today=today)
+    return {
+        "businesses": spec.businesses,
+        "staff": spec.businesses * spec.staff,
+        "customers": spec.businesses * spec.customers,
+        "staff_days": len(staff_days),
+        "bookings": bookings,
+    }
+
+
+def _time_off_row(business_id, staff_id, first_day, days, reason, now) -> dict:
+    start = datetime.combine(first_day, time.min)
+    return {
+        "business_id": business_id,
+        "staff_id": staff_id,
+        "start_at": start,
+        "end_at": start + timedelta(days=days),
+        "is_active": True,
+        "reason": reason,
+        "created_at": now,
+    }
+
+
+def _generate_bookings(conn, rng, spec, staff_days, customers_by_business, *, now, today) -> int:
+    """
+    Рабочий день каждого сотрудника проходится по сетке 15 минут:
+    с вероятностью fill в текущую позицию ставится бронь случайной его
+    услуги (брони одного сотрудника не пересекаются), иначе — шаг сетки.
+    fill подбирается так, чтобы в сумме получилось около spec.bookings.
+    """
+    # Шаг с вероятностью fill занимает k позиций (бронь), иначе одну:
+    # броней на позицию r = fill / (1 + (k - 1) * fill) → fill = r / (1 - (k - 1) * r)
+    positions = sum(_shift_minutes(shift) for _, _, shift, _, _ in staff_days) // SLOT_STEP_MINUTES
+    k = sum(SERVICE_DURATIONS) / len(SERVICE_DURATIONS) / SLOT_STEP_MINUTES
+    r = spec.bookings / max(positions, 1)
+    fill = 1.0 if r * (k - 1) >= 1 else min(1.0, r / (1 - (k - 1) * r))
+
+    writer = _Writer(conn, Booking.__table__)
+    step = timedelta(minutes=SLOT_STEP_MINUTES)
+    for business_id, staff_id, shift, offered, day in staff_days:
+        customers = customers_by_business[business_id]
+        future = day >= today
+        statuses, weights = zip(*(FUTURE_STATUSES if future else PAST_STATUSES))
+        cursor = datetime.combine(day, shift[0])
+        day_end = datetime.combine(day, shift[1])
+        brk = (datetime.combine(day, shift[2][0]), datetime.combine(day, shift[2][1])) if shift[2] else None
+
+        while cursor < day_end:
+            if brk and brk[0] <= cursor < brk[1]:
+                cursor = brk[1]
+                continue
+            if rng.random() >= fill:
+                cursor += step
+                continue
+            ss_id, price, duration = rng.choice(offered)
+            end = cursor + timedelta(minutes=duration)
+            if end > day_end or (brk and cursor < brk[1] and end > brk[0]):
+                cursor += step
+                continue
+            status = rng.choices(statuses, weights)[0]
+            customer_id, customer_name = rng.choice(customers)
+            writer.add({
+                "business_id": business_id,
+                "staff_id": staff_id,
+                "staff_service_id": ss_id,
+                "customer_id": customer_id,
+                "start_at": cursor,
+                "end_at": end,
+                "is_active": True,
+                "price": price,
+                "duration_min": duration,
+                "status": status,
+                "expires_at": now + timedelta(minutes=rng.randint(1, 10)) if status == BookingStatus.HOLD else None,
+                "customer_name": customer_name,
+                "comment": None,
+                "created_at": min(now, cursor - timedelta(days=rng.randint(0, 21))),
+            })
+            cursor = end
+    writer.flush()
+    return writer.written
+
+
+def _shift_minutes(shift) -> int:
+    start, end, brk = shift
+    minutes = (end.hour * 60 + end.minute) - (start.hour * 60 + start.minute)
+    if brk:
+        minutes -= (brk[1].hour * 60 + brk[1].minute) - (brk[0].hour * 60 + brk[0].minute)
+    return minutes
+
+
+def _reset_sqlite(url: str) -> None:
+    database = make_url(url).database
+    if not database or database == ":memory:":
+        return
+    for suffix in ("", "-wal", "-shm"):
+        Path(database + suffix).unlink(missing_ok=True)
+
+
+def migrate(*, reset: bool = False) -> None:
+    """Схема БД из DATABASE_URL — миграциями; reset — сначала удалить файл SQLite."""
+    if reset:
+        engine.dispose()
+        _reset_sqlite(DATABASE_URL)
+    alembic_cfg = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
+    command.upgrade(alembic_cfg, "head")
+
+
+def main(argv=None) -> int:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description="Синтетическая БД для бенчмарков (DATABASE_URL)")
+    parser.add_argument("--businesses", type=int, default=defaults.businesses)
+    parser.add_argument("--staff", type=int, default=defaults.staff, help="сотрудников на бизнес")
+    parser.add_argument("--services", type=int, default=defaults.services, help="услуг на бизнес")
+    parser.add_argument("--customers", type=int, default=defaults.customers, help="клиентов на бизнес")
+    parser.add_argument("--bookings", type=int, default=defaults.bookings, help="броней всего (приблизительно)")
+    parser.add_argument("--past-days", type=int, default=defaults.past_days)
+    parser.add_argument("--future-days", type=int, default=defaults.future_days)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--reset", action="store_true", help="удалить файл БД перед генерацией")
+    parser.add_argument("--force", action="store_true", help="разрешить запись в app.db по умолчанию")
+    args = parser.parse_args(argv)
+
+    if DATABASE_URL == DEFAULT_DATABASE_URL and not args.force:
+        parser.error("DATABASE_URL указывает на app.db; задайте отдельный файл или --force")
+
+    spec = DatasetSpec(
+        businesses=args.businesses, staff=args.staff, services=args.services,
+        customers=args.customers, bookings=args.bookings,
+        past_days=args.past_days, future_days=args.future_days, seed=args.seed,
+    )
+
+    migrate(reset=args.reset)
+
+    started = clock.perf_counter()
+    with engine.connect() as conn:
+        # Миграции создают «Default Business», поэтому проверяем пользователей
+        if conn.scalar(select(func.count()).select_from(User.__table__)):
+            parser.error("БД уже содержит данные; используйте --reset")
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        summary = generate(conn, spec)
+        conn.exec_driver_sql("ANALYZE")
+        conn.commit()
+    elapsed = clock.perf_counter() - started
+
+    print(", ".join(f"{key}={value}" for key, value in summary.items()) + f" ({elapsed:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
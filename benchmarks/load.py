@@ -0,0 +1,315 @@
+# benchmarks/load.py
+
+"""
+Нагрузочный прогон полного конвейера запроса без сети: app.main.app
+вызывается через httpx.ASGITransport в том же процессе — с JWT,
+X-Business-ID, admission control, валидацией pydantic и сериализацией.
+
+    export DATABASE_URL=sqlite:///./bench.db          # см. benchmarks.dataset
+    python -m benchmarks.load --mix browse --concurrency 16 --duration 20
+    python -m benchmarks.load --mix "slots=70,booking.create=20,staff.list=10"
+    python -m benchmarks.load --mix mixed --save benchmarks/baselines/load.json
+    python -m benchmarks.load --mix mixed --compare benchmarks/baselines/load.json
+
+Нагрузка — --concurrency виртуальных пользователей (asyncio-задач) одного
+бизнеса (по умолчанию — с наибольшим числом броней), каждый в цикле
+выбирает операцию по весам смеси. Итог по маршрутам: число запросов,
+коды ответов, p50/p95/p99/max, гистограмма латентности; общий RPS.
+Первые --warmup секунд в статистику не входят.
+
+Лимиты admission control (TENANT_RATE_PER_SECOND, TENANT_BURST,
+TENANT_MAX_CONCURRENCY) действуют как в проде — 429/503 попадут
+в коды ответов; для замера «чистой» латентности поднимите их через
+переменные окружения. Lifespan приложения (фоновый sweeper HOLD)
+не запускается. booking.create пишет в БД (HOLD-брони).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time as clock
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core.config import DATABASE_URL
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.booking import Booking
+from app.models.business_user import BusinessRole, BusinessUser
+from app.models.customer import Customer
+from app.models.staff import Staff
+from app.models.staff_service import StaffService
+from app.models.user import User
+from benchmarks.common import compare, histogram, load_results, print_comparison, save_results, summarize
+from benchmarks.dataset import BENCH_PASSWORD
+
+API = "/api/v1"
+
+MIXES = {
+    # Клиентская витрина: поиск слотов и карточки
+    "browse": {"slots": 80, "staff.list": 10, "customers.get": 10},
+    # Запись: слоты с токенами → POST /bookings
+    "booking": {"slots": 50, "booking.create": 50},
+    # Панель администратора: списки
+    "dashboard": {"staff.list": 40, "customers.get": 40, "customers.list": 15, "bookings.list": 5},
+    "mixed": {
+        "slots": 55, "booking.create": 15, "staff.list": 10,
+        "customers.get": 15, "customers.list": 3, "bookings.list": 2,
+    },
+}
+
+
+@dataclass
+class Targets:
+    """Данные бизнеса, по которым генерируются запросы."""
+    business_id: int
+    owner_email: str
+    staff_services: list[tuple[int, int]]
+    staff_ids: list[int]
+    customers: list[tuple[int, str, str]]  # (id, name, phone)
+    booking_ids: list[int]                 # будущие брони (подтверждение, отмена, перенос)
+
+
+@dataclass
+class Recorder:
+    recording: bool = False
+    latencies_ms: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+
+    def add(self, route: str, elapsed_ms: float, status_code: int) -> None:
+        if self.recording:
+            self.latencies_ms[route].append(elapsed_ms)
+            self.statuses[route][status_code] += 1
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, targets: Targets, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.targets = targets
+        self.recorder = recorder
+        self.rng = rng
+
+    async def request(self, route: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = clock.perf_counter()
+        response = await self.client.request(method, API + url, **kwargs)
+        self.recorder.add(route, (clock.perf_counter() - started) * 1000, response.status_code)
+        return response
+
+    def _slots_params(self, *, tokens: bool) -> tuple[int, dict]:
+        staff_id, service_id = self.rng.choice(self.targets.staff_services)
+        day = datetime.utcnow().date() + timedelta(days=self.rng.randint(1, 14))
+        params = {"service_id": service_id, "day": day.isoformat()}
+        if tokens:
+            params["include_tokens"] = "true"
+        return staff_id, params
+
+    async def slots(self) -> None:
+        staff_id, params = self._slots_params(tokens=False)
+        await self.request("GET /schedule/staff/{id}/slots", "GET", f"/schedule/staff/{staff_id}/slots", params=params)
+
+    async def booking_create(self) -> None:
+        staff_id, params = self._slots_params(tokens=True)
+        response = await self.request(
+            "GET /schedule/staff/{id}/slots?include_tokens", "GET",
+            f"/schedule/staff/{staff_id}/slots", params=params,
+        )
+        if response.status_code != 200 or not response.json():
+            return
+        slot = self.rng.choice(response.json())
+        _, name, phone = self.rng.choice(self.targets.customers)
+        await self.request("POST /bookings", "POST", "/bookings", json={
+            "staff_id": staff_id,
+            "service_id": params["service_id"],
+            "start_at": slot["start"],
+            "customer": {"name": name, "phone": phone},
+            "slot_token": slot["token"],
+        })
+
+    async def staff_list(self) -> None:
+        await self.request("GET /staff", "GET", "/staff")
+
+    async def customers_get(self) -> None:
+        customer_id = self.rng.choice(self.targets.customers)[0]
+        await self.request("GET /customers/{id}", "GET", f"/customers/{customer_id}")
+
+    async def customers_list(self) -> None:
+        await self.request("GET /customers", "GET", "/customers")
+
+    async def bookings_list(self) -> None:
+        await self.request("GET /bookings", "GET", "/bookings")
+
+    def operation(self, name: str) -> Callable[[], Awaitable[None]]:
+        return getattr(self, name.replace(".", "_"))
+
+
+def businesses_by_size() -> list[int]:
+    """Бизнесы с бронями — от самого большого к меньшим."""
+    with SessionLocal() as session:
+        return list(session.scalars(
+            select(Booking.business_id)
+            .group_by(Booking.business_id)
+            .order_by(func.count().desc())
+        ))
+
+
+def load_targets(business_id: int | None) -> Targets:
+    if business_id is None:
+        business_id = businesses_by_size()[0]
+    with SessionLocal() as session:
+        owner_email = session.scalar(
+            select(User.email)
+            .join(BusinessUser, BusinessUser.user_id == User.id)
+            .where(BusinessUser.business_id == business_id, BusinessUser.role == BusinessRole.OWNER)
+            .limit(1)
+        )
+        staff_services = [tuple(row) for row in session.execute(
+            select(StaffService.staff_id, StaffService.service_id)
+            .join(Staff, Staff.id == StaffService.staff_id)
+            .where(Staff.business_id == business_id, StaffService.is_active == True)
+        )]
+        customers = [tuple(row) for row in session.execute(
+            select(Customer.id, Customer.name, Customer.phone)
+            .where(Customer.business_id == business_id)
+            .limit(2000)
+        )]
+        booking_ids = list(session.scalars(
+            select(Booking.id)
+            .where(Booking.business_id == business_id, Booking.start_at > datetime.utcnow())
+            .limit(2000)
+        ))
+    return Targets(
+        business_id=business_id,
+        owner_email=owner_email,
+        staff_services=staff_services,
+        staff_ids=sorted({staff_id for staff_id, _ in staff_services}),
+        customers=customers,
+        booking_ids=booking_ids,
+    )
+
+
+async def login(client: httpx.AsyncClient, targets: Targets) -> dict[str, str]:
+    """Заголовки запросов от имени владельца бизнеса."""
+    response = await client.post(f"{API}/auth/login", json={
+        "email": targets.owner_email, "password": BENCH_PASSWORD,
+    })
+    response.raise_for_status()
+    return {
+        "Authorization": f"Bearer {response.json()['access_token']}",
+        "X-Business-ID": str(targets.business_id),
+    }
+
+
+async def run(*, mix: dict[str, int], targets: Targets, concurrency: int,
+              duration: float, warmup: float, seed: int) -> tuple[Recorder, float]:
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        client.headers.update(await login(client, targets))
+
+        names, weights = list(mix), list(mix.values())
+        stop_at = clock.perf_counter() + warmup + duration
+
+        async def user_loop(index: int) -> None:
+            rng = random.Random(seed * 1000 + index)
+            user = VirtualUser(client, targets, recorder, rng)
+            while clock.perf_counter() < stop_at:
+                await user.operation(rng.choices(names, weights)[0])()
+
+        tasks = [asyncio.create_task(user_loop(i)) for i in range(concurrency)]
+        await asyncio.sleep(warmup)
+        recorder.recording = True
+        started = clock.perf_counter()
+        await asyncio.gather(*tasks)
+        elapsed = clock.perf_counter() - started
+    return recorder, elapsed
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    if value in MIXES:
+        return MIXES[value]
+    known = {name for mix in MIXES.values() for name in mix}
+    mix = {name: int(weight) for name, weight in (part.split("=") for part in value.split(","))}
+    unknown = set(mix) - known
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"неизвестные операции: {', '.join(sorted(unknown))}; доступны: {', '.join(sorted(known))}"
+        )
+    return mix
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон приложения через ASGI без сети")
+    parser.add_argument("--mix", type=_parse_mix, default="mixed",
+                        help=f"готовая смесь ({', '.join(MIXES)}) или «операция=вес,...»")
+    parser.add_argument("--concurrency", type=int, default=8, help="виртуальных пользователей")
+    parser.add_argument("--duration", type=float, default=15.0, help="секунд замера")
+    parser.add_argument("--warmup", type=float, default=2.0, help="секунд прогрева (не учитываются)")
+    parser.add_argument("--business-id", type=int)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--histogram", action="store_true", help="печатать гистограммы латентности")
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    targets = load_targets(args.business_id)
+    if targets.owner_email is None or not targets.staff_services:
+        parser.error("в БД нет бизнеса с владельцем и услугами сотрудников; см. benchmarks.dataset")
+    print(f"{DATABASE_URL}: business {targets.business_id}, {args.concurrency} пользователей, {args.duration:.0f} с")
+
+    recorder, elapsed = asyncio.run(run(
+        mix=args.mix, targets=targets, concurrency=args.concurrency,
+        duration=args.duration, warmup=args.warmup, seed=args.seed,
+    ))
+
+    results = {}
+    total = 0
+    for route in sorted(recorder.latencies_ms):
+        samples = recorder.latencies_ms[route]
+        total += len(samples)
+        results[route] = {
+            **summarize(samples),
+            "rps": round(len(samples) / elapsed, 1),
+            "status": {str(code): n for code, n in sorted(recorder.statuses[route].items())},
+            "histogram_ms": histogram(samples),
+        }
+        m = results[route]
+        codes = " ".join(f"{code}×{n}" for code, n in m["status"].items())
+        print(
+            f"{route:<46} n={m['n']:<6} {m['rps']:>7.1f}/s  p50 {m['p50_ms']:>8.2f}  "
+            f"p95 {m['p95_ms']:>8.2f}  p99 {m['p99_ms']:>8.2f}  max {m['max_ms']:>8.2f} ms  [{codes}]"
+        )
+        if args.histogram:
+            print("    " + "  ".join(f"{k.replace('le_', '≤')}:{v}" for k, v in m["histogram_ms"].items() if v))
+    results["total"] = {"requests": total, "rps": round(total / elapsed, 1)}
+    print(f"итого: {total} запросов, {results['total']['rps']} запросов/с")
+
+    if args.save:
+        save_results(args.save, results, benchmark="load", database_url=DATABASE_URL,
+                     business_id=targets.business_id, mix=args.mix,
+                     concurrency=args.concurrency, duration=args.duration, seed=args.seed)
+    if not args.compare:
+        return 0
+
+    baseline = load_results(args.compare)
+    print_comparison(baseline, {k: m for k, m in results.items() if "p95_ms" in m}, key="p95_ms")
+    regressions = compare(baseline, results, compare_keys=("p50_ms", "p95_ms"), threshold=args.threshold)
+    for r in regressions:
+        print(f"REGRESSION {r.name} {r.metric}: {r.baseline} → {r.current} (×{r.ratio:.2f})")
+    base_rps = baseline.get("total", {}).get("rps")
+    slower = bool(base_rps) and results["total"]["rps"] < base_rps / (1 + args.threshold)
+    if slower:
+        print(f"REGRESSION total rps: {base_rps} → {results['total']['rps']}")
+    return 1 if regressions or slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+# benchmarks/reads.py
+
+"""
+Сквозной бенчмарк чтений на синтетической БД (см. benchmarks.dataset):
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.reads
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.reads --save benchmarks/baselines/reads.json
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.reads --compare benchmarks/baselines/reads.json
+
+Вызывает тот же код, что и эндпоинты (ScheduleService, репозитории),
+без HTTP. Каждый вызов — в отдельной сессии, как запрос. Для каждого
+сценария — p50/p95/p99/max и число SQL-запросов на вызов (по событию
+before_cursor_execute движка). Регрессия — рост p50/p95 больше
+--threshold или рост числа запросов на вызов.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import DATABASE_URL
+from app.db.session import SessionLocal, engine
+from app.models import business, business_user, service, time_off, user, working_hours  # noqa: F401 — регистрация мапперов
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.models.staff import Staff
+from app.models.staff_service import StaffService
+from app.repositories import bookings as bookings_repo, customers as customers_repo
+from app.services.schedule_service import ScheduleService
+from benchmarks.common import compare, load_results, print_comparison, save_results, summarize
+
+
+class QueryCounter:
+    """Считает SQL-запросы движка (все соединения процесса)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    iterations: int
+    # (session, rng, business_id, n) → n аргументов для call
+    prepare: Callable[[Session, random.Random, int, int], list]
+    call: Callable[[Session, int, Any], Any]
+
+
+_schedule_service = ScheduleService()
+
+
+def _prepare_slots(session, rng, business_id, n):
+    pairs = session.execute(
+        select(StaffService.staff_id, StaffService.service_id)
+        .join(Staff, Staff.id == StaffService.staff_id)
+        .where(Staff.business_id == business_id, StaffService.is_active == True)
+    ).all()
+    today = datetime.utcnow().date()
+    return [(*rng.choice(pairs), today + timedelta(days=rng.randint(1, 14))) for _ in range(n)]
+
+
+def _call_slots(session, business_id, args):
+    staff_id, service_id, day = args
+    return _schedule_service.get_slots_for_day(
+        session=session,
+        business_id=business_id,
+        staff_id=staff_id,
+        service_id=service_id,
+        day=day,
+        now=datetime.utcnow(),
+    )
+
+
+def _prepare_staff_days(session, rng, business_id, n):
+    staff_ids = list(session.scalars(select(Staff.id).where(Staff.business_id == business_id)))
+    today = datetime.utcnow().date()
+    return [(rng.choice(staff_ids), today + timedelta(days=rng.randint(-30, 14))) for _ in range(n)]
+
+
+def _call_staff_day(session, business_id, args):
+    staff_id, day = args
+    start = datetime.combine(day, datetime.min.time())
+    return bookings_repo.get_blocking_for_staff_and_period(
+        session, staff_id=staff_id, start=start, end=start + timedelta(days=1),
+        business_id=business_id,
+    )
+
+
+def _prepare_phones(session, rng, business_id, n):
+    phones = list(session.scalars(
+        select(Customer.phone).where(Customer.business_id == business_id)
+    ))
+    # Каждый десятый поиск — по несуществующему номеру (новый клиент)
+    return [rng.choice(phones) if i % 10 else f"+70000{i:06d}" for i in range(n)]
+
+
+def _call_phone(session, business_id, phone):
+    return customers_repo.get_by_phone(session, business_id=business_id, phone=phone)
+
+
+def _prepare_none(session, rng, business_id, n):
+    return [None] * n
+
+
+CASES = [
+    Case("schedule.slots", 300, _prepare_slots, _call_slots),
+    Case("bookings.staff_day", 500, _prepare_staff_days, _call_staff_day),
+    Case("customers.by_phone", 1000, _prepare_phones, _call_phone),
+    Case("customers.list", 10, _prepare_none,
+         lambda session, business_id, _: customers_repo.list_for_business(session, business_id=business_id)),
+    Case("bookings.list", 5, _prepare_none,
+         lambda session, business_id, _: bookings_repo.list_for_business(session, business_id=business_id)),
+]
+
+
+def run_case(case: Case, *, business_id: int, rng: random.Random, counter: QueryCounter,
+             iterations: int, warmup: int = 3) -> dict:
+    with SessionLocal() as session:
+        inputs = case.prepare(session, rng, business_id, iterations + warmup)
+
+    samples: list[float] = []
+    queries: list[int] = []
+    rows = 0
+    for i, args in enumerate(inputs):
+        with SessionLocal() as session:
+            before = counter.count
+            started = perf_counter()
+            result = case.call(session, business_id, args)
+            elapsed = (perf_counter() - started) * 1000
+        if i < warmup:
+            continue
+        samples.append(elapsed)
+        queries.append(counter.count - before)
+        rows += len(result) if isinstance(result, Sequence) else int(result is not None)
+
+    return {
+        **summarize(samples),
+        "queries_per_call": round(sum(queries) / len(queries), 2),
+        "rows_per_call": round(rows / len(samples), 1),
+    }
+
+
+def _largest_business(session: Session) -> int:
+    return session.execute(
+        select(Booking.business_id, func.count())
+        .group_by(Booking.business_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    ).first()[0]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк чтений на синтетической БД")
+    parser.add_argument("--case", action="append", help="только эти сценарии (можно несколько)")
+    parser.add_argument("--business-id", type=int, help="по умолчанию — бизнес с наибольшим числом броней")
+    parser.add_argument("--scale", type=float, default=1.0, help="множитель числа итераций")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CASES if not args.case or c.name in args.case]
+    with SessionLocal() as session:
+        business_id = args.business_id or _largest_business(session)
+        total = session.scalar(select(func.count()).select_from(Booking).where(Booking.business_id == business_id))
+    print(f"{DATABASE_URL}: business {business_id}, {total} bookings")
+
+    rng = random.Random(args.seed)
+    counter = QueryCounter()
+    results = {}
+    for case in cases:
+        iterations = max(1, int(case.iterations * args.scale))
+        results[case.name] = run_case(
+            case, business_id=business_id, rng=rng, counter=counter, iterations=iterations,
+        )
+        m = results[case.name]
+        print(
+            f"{case.name:<22} p50 {m['p50_ms']:>9.2f}  p95 {m['p95_ms']:>9.2f}  "
+            f"p99 {m['p99_ms']:>9.2f} ms  queries/call {m['queries_per_call']:<5} rows/call {m['rows_per_call']}"
+        )
+
+    if args.save:
+        save_results(args.save, results, benchmark="reads", database_url=DATABASE_URL,
+                     business_id=business_id, bookings=total)
+    if not args.compare:
+        return 0
+
+    baseline = load_results(args.compare)
+    print_comparison(baseline, results, key="p95_ms")
+    regressions = compare(baseline, results, compare_keys=("p50_ms", "p95_ms"), threshold=args.threshold)
+    regressions += compare(baseline, results, compare_keys=("queries_per_call",), threshold=0)
+    for r in regressions:
+        print(f"REGRESSION {r.name} {r.metric}: {r.baseline} → {r.current} (×{r.ratio:.2f})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
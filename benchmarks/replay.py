@@ -0,0 +1,286 @@
+# benchmarks/replay.py
+
+"""
+Воспроизведение записанного трафика (TRAFFIC_RECORD_PATH, см.
+app/core/traffic.py) против БД из DATABASE_URL — через ASGI в том же
+процессе, как benchmarks.load:
+
+    export DATABASE_URL=sqlite:///./bench.db
+    python -m benchmarks.replay traffic.jsonl                      # в исходном темпе
+    python -m benchmarks.replay traffic.jsonl --speed 4            # в 4 раза быстрее
+    python -m benchmarks.replay traffic.jsonl --save benchmarks/baselines/replay.json
+    # ... другая сборка ...
+    python -m benchmarks.replay traffic.jsonl --compare benchmarks/baselines/replay.json
+
+Запросы отправляются в моменты исходных ts (поделённые на --speed),
+не более --max-in-flight одновременно. Записанный трафик обезличен,
+а id из прода в синтетической БД не существуют, поэтому перед
+отправкой запрос переносится на набор данных:
+
+  - tenant: арендаторы записи по убыванию числа запросов → бизнесы БД
+    по убыванию числа броней (по кругу);
+  - staff_id / service_id / customer_id / booking_id (в пути, строке
+    запроса и теле) → устойчиво сопоставленные объекты того же бизнеса;
+    service_id выбирается среди услуг сопоставленного сотрудника;
+  - даты и время сдвигаются на (сегодня − день начала записи);
+  - «***» в имени/телефоне клиента → клиент из БД, токены и
+    комментарии отбрасываются.
+
+--keep-ids отключает сопоставление (БД — копия той, где писали трафик).
+Не воспроизводятся auth/*, SSE-поток и импорт CSV. Итог по маршрутам —
+p50/p95/p99/max и коды ответов рядом с записанными значениями;
+--compare сравнивает с результатом другой сборки.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time as clock
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+import httpx
+
+from app.core.config import DATABASE_URL
+from app.core.traffic import REDACTED
+from app.main import app
+from benchmarks.common import compare, load_results, print_comparison, save_results, summarize
+from benchmarks.load import Recorder, Targets, businesses_by_size, load_targets, login
+
+SKIP_ROUTES = re.compile(r"/auth/|/events/stream|/imports/")
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+_ID_KEYS = ("staff_id", "service_id", "customer_id", "booking_id")
+_DROP_KEYS = frozenset({"slot_token", "token", "comment", "reason", "email"})
+
+
+def read_trace(path: str, *, limit: Optional[int] = None) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    records = [r for r in records if not SKIP_ROUTES.search(r["route"])]
+    records.sort(key=lambda r: r["ts"])
+    return records[:limit] if limit else records
+
+
+class Remapper:
+    """Переносит записанный запрос на сущности синтетической БД."""
+
+    def __init__(self, records: list[dict], *, keep_ids: bool, seed: int) -> None:
+        self.keep_ids = keep_ids
+        self.rng = random.Random(seed)
+        self.day_shift = timedelta(0)
+        self.targets: dict[Optional[int], Targets] = {}
+        self._ids: dict[tuple, int] = {}
+
+        tenants = Counter(r.get("tenant") for r in records if r.get("tenant") is not None)
+        available = businesses_by_size()
+        if not available:
+            raise SystemExit("в БД нет бизнесов с бронями; см. benchmarks.dataset")
+        for i, (tenant, _) in enumerate(tenants.most_common()):
+            business_id = tenant if keep_ids else available[i % len(available)]
+            self.targets[tenant] = load_targets(business_id)
+        # Запросы без X-Business-ID (/me, /businesses) — от владельца первого бизнеса
+        self.targets[None] = next(iter(self.targets.values()), None) or load_targets(available[0])
+        if records and not keep_ids:
+            self.day_shift = date.today() - date.fromtimestamp(records[0]["ts"])
+
+    def request(self, record: dict) -> tuple[Targets, str, dict, Any]:
+        targets = self.targets[record.get("tenant")]
+        # Сотрудник из пути определяет допустимые услуги в строке запроса и теле
+        staff: dict[str, int] = {}
+        path_params = self._ids_in(record.get("path_params", {}), targets, staff)
+        url = record["route"].format(**path_params)
+        query = self._values(self._ids_in(record.get("query", {}), targets, staff), targets)
+        body = record.get("body")
+        if body is not None:
+            body = self._values(self._ids_in(body, targets, dict(staff)), targets)
+        return targets, url, query, body
+
+    def _ids_in(self, value: Any, targets: Targets, staff: dict[str, int]) -> Any:
+        """
+        Рекурсивно заменяет *_id (в т.ч. списки booking_ids/staff_ids).
+        staff["id"] — последний сопоставленный сотрудник: service_id
+        выбирается среди его услуг (каждый элемент корзины — свой).
+        """
+        if self.keep_ids:
+            return value
+        if isinstance(value, list):
+            return [self._ids_in(item, targets, dict(staff)) for item in value]
+        if not isinstance(value, dict):
+            return value
+        result = {}
+        for key in sorted(value, key=lambda k: k != "staff_id"):  # staff_id — первым
+            item = value[key]
+            kind = key[:-1] if key.endswith("_ids") else key
+            if kind in _ID_KEYS and item is not None:
+                items = item if isinstance(item, list) else [item]
+                mapped = [self._map(kind, int(i), targets, staff_id=staff.get("id")) for i in items]
+                if kind == "staff_id":
+                    staff["id"] = mapped[0]
+                result[key] = mapped if isinstance(item, list) else type(item)(mapped[0])
+            else:
+                result[key] = self._ids_in(item, targets, staff)
+        return result
+
+    def _map(self, kind: str, original: int, targets: Targets, *, staff_id: Optional[int]) -> int:
+        key = (targets.business_id, kind, original, staff_id if kind == "service_id" else None)
+        if key not in self._ids:
+            if kind == "staff_id":
+                pool = targets.staff_ids
+            elif kind == "service_id":
+                pool = sorted({sv for st, sv in targets.staff_services if staff_id in (None, st)})
+            elif kind == "customer_id":
+                pool = [c[0] for c in targets.customers]
+            else:
+                pool = targets.booking_ids
+            self._ids[key] = self.rng.choice(pool) if pool else original
+        return self._ids[key]
+
+    def _values(self, value: Any, targets: Targets) -> Any:
+        """Сдвиг дат, подстановка обезличенных полей клиента."""
+        if isinstance(value, list):
+            return [self._values(item, targets) for item in value]
+        if isinstance(value, dict):
+            result = {}
+            customer = self.rng.choice(targets.customers) if targets.customers else None
+            for key, item in value.items():
+                if key in _DROP_KEYS:
+                    continue
+                if item == REDACTED and customer is not None:
+                    result[key] = customer[2] if key == "phone" else customer[1]
+                else:
+                    result[key] = self._values(item, targets)
+            return result
+        if isinstance(value, str) and self.day_shift and _DATE.match(value):
+            return _shift(value, self.day_shift)
+        return value
+
+
+def _shift(value: str, delta: timedelta) -> str:
+    try:
+        if len(value) == 10:
+            return (date.fromisoformat(value) + delta).isoformat()
+        return (datetime.fromisoformat(value) + delta).isoformat()
+    except ValueError:
+        return value
+
+
+async def replay(records: list[dict], remapper: Remapper, *, speed: float,
+                 max_in_flight: int) -> tuple[Recorder, float, list[float]]:
+    recorder = Recorder(recording=True)
+    lag_ms: list[float] = []
+    limiter = asyncio.Semaphore(max_in_flight)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=120) as client:
+        headers = {}
+        for tenant, targets in remapper.targets.items():
+            headers[tenant] = await login(client, targets)
+        headers[None] = {"Authorization": headers[None]["Authorization"]}
+
+        async def issue(record: dict, scheduled: float) -> None:
+            async with limiter:
+                lag_ms.append(max(0.0, clock.perf_counter() - scheduled) * 1000)
+                _, url, query, body = remapper.request(record)
+                route = f"{record['method']} {record['route']}"
+                started = clock.perf_counter()
+                response = await client.request(
+                    record["method"], url, params=query, json=body,
+                    headers=headers[record.get("tenant")],
+                )
+                recorder.add(route, (clock.perf_counter() - started) * 1000, response.status_code)
+
+        tasks = []
+        origin = records[0]["ts"] if records else 0.0
+        started = clock.perf_counter()
+        for record in records:
+            scheduled = started + (record["ts"] - origin) / speed
+            delay = scheduled - clock.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(issue(record, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = clock.perf_counter() - started
+    return recorder, elapsed, lag_ms
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Воспроизведение записанного трафика")
+    parser.add_argument("trace", help="JSONL из TRAFFIC_RECORD_PATH")
+    parser.add_argument("--speed", type=float, default=1.0, help="множитель темпа (2 = вдвое быстрее)")
+    parser.add_argument("--max-in-flight", type=int, default=16,
+                        help="больше размера пула соединений БД — риск очереди за соединением")
+    parser.add_argument("--limit", type=int, help="только первые N запросов")
+    parser.add_argument("--keep-ids", action="store_true", help="не сопоставлять арендаторов, id и даты")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    records = read_trace(args.trace, limit=args.limit)
+    if not records:
+        parser.error("в журнале нет запросов для воспроизведения")
+    remapper = Remapper(records, keep_ids=args.keep_ids, seed=args.seed)
+    span = records[-1]["ts"] - records[0]["ts"]
+    print(
+        f"{DATABASE_URL}: {len(records)} запросов за {span:.1f} с записи, "
+        f"арендаторов {len(remapper.targets) - 1}, темп ×{args.speed}"
+    )
+
+    recorder, elapsed, lag_ms = asyncio.run(replay(
+        records, remapper, speed=args.speed, max_in_flight=args.max_in_flight,
+    ))
+
+    recorded: dict[str, list[float]] = {}
+    for record in records:
+        recorded.setdefault(f"{record['method']} {record['route']}", []).append(record.get("ms", 0.0))
+
+    results = {}
+    for route in sorted(recorder.latencies_ms):
+        samples = recorder.latencies_ms[route]
+        original = summarize(recorded.get(route, []))
+        results[route] = {
+            **summarize(samples),
+            "recorded_p50_ms": original["p50_ms"],
+            "recorded_p95_ms": original["p95_ms"],
+            "status": {str(code): n for code, n in sorted(recorder.statuses[route].items())},
+        }
+        m = results[route]
+        codes = " ".join(f"{code}×{n}" for code, n in m["status"].items())
+        print(
+            f"{route:<56} n={m['n']:<6} p50 {m['p50_ms']:>8.2f} ({m['recorded_p50_ms']:>8.2f})  "
+            f"p95 {m['p95_ms']:>8.2f} ({m['recorded_p95_ms']:>8.2f})  max {m['max_ms']:>8.2f} ms  [{codes}]"
+        )
+    lag = summarize(lag_ms)
+    results["total"] = {
+        "requests": len(records),
+        "seconds": round(elapsed, 2),
+        "rps": round(len(records) / elapsed, 1) if elapsed else 0.0,
+        "lag_p95_ms": lag["p95_ms"],
+    }
+    print(
+        f"итого: {len(records)} запросов за {elapsed:.1f} с ({results['total']['rps']}/с); "
+        f"отставание от расписания p95 {lag['p95_ms']:.1f} мс (в скобках — записанные значения)"
+    )
+
+    if args.save:
+        save_results(args.save, results, benchmark="replay", database_url=DATABASE_URL,
+                     trace=args.trace, speed=args.speed, seed=args.seed)
+    if not args.compare:
+        return 0
+
+    baseline = load_results(args.compare)
+    print_comparison(baseline, {k: m for k, m in results.items() if "p95_ms" in m}, key="p95_ms")
+    regressions = compare(baseline, results, compare_keys=("p50_ms", "p95_ms"), threshold=args.threshold)
+    for r in regressions:
+        print(f"REGRESSION {r.name} {r.metric}: {r.baseline} → {r.current} (×{r.ratio:.2f})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
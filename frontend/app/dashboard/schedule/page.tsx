@@ -112,24 +112,24 @@ export default function SchedulePage() {
     setSuccess("");
 
     try {
-      // Create new working hours for each enabled day
+      // Replace the whole weekly template in one request:
+      // disabled days are deactivated on the server
       const enabledDays = days.filter((d) => d.enabled);
 
-      for (const d of enabledDays) {
-        await api("/working-hours", {
-          method: "POST",
-          needsBusiness: true,
-          body: {
-            staff_id: Number(staffId),
+      await api<WorkingHoursEntry[]>("/working-hours/weekly", {
+        method: "PUT",
+        needsBusiness: true,
+        body: {
+          staff_id: Number(staffId),
+          days: enabledDays.map((d) => ({
             weekday: d.weekday,
             start_time: d.start_time + ":00",
             end_time: d.end_time + ":00",
             break_start: d.break_start ? d.break_start + ":00" : null,
             break_end: d.break_end ? d.break_end + ":00" : null,
-            is_active: true,
-          },
-        });
-      }
+          })),
+        },
+      });
 
       setSuccess("Schedule saved successfully");
     } catch (err) {
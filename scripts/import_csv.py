@@ -0,0 +1,51 @@
+"""
+Импорт клиентов, сотрудников или услуг из CSV напрямую в БД
+(без HTTP), например при переносе данных нового бизнеса.
+
+    python -m scripts.import_csv --business-id 1 customers clients.csv
+
+Печатает отчёт в JSON; код выхода 1, если были ошибочные строки.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+
+from app.db.session import SessionLocal
+# Все модели должны быть импортированы до первого запроса (relationship по имени)
+from app.models import user, business, service, staff, staff_service  # noqa: F401
+from app.models import booking, business_user, customer, working_hours, time_off  # noqa: F401
+from app.services.csv_import import IMPORTERS, ImportFormatError, import_csv
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("entity", choices=sorted(IMPORTERS))
+    parser.add_argument("path", help="CSV-файл в UTF-8, первая строка — заголовок")
+    parser.add_argument("--business-id", type=int, required=True)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    session = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = import_csv(
+                session,
+                business_id=args.business_id,
+                entity=args.entity,
+                stream=stream,
+                chunk_size=args.chunk_size,
+            )
+    except ImportFormatError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        session.close()
+
+    print(json.dumps(asdict(report), ensure_ascii=False, indent=2))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+from app.core.events import event_bus
+from app.services import booking_service
+from app.services.booking_service import BookingService
+
+
+def _bulk(api, owner, action, **body):
+    return api.post(f"/api/v1/bookings/bulk-{action}", json=body, headers=owner.headers)
+
+
+def test_bulk_cancel_reports_each_booking(api, owner, book, slot_at):
+    confirmed = book(slot_at(10)).json()
+    hold = book(slot_at(12), confirm=False).json()
+    cancelled = book(slot_at(14)).json()
+    api.post(f"/api/v1/bookings/{cancelled['id']}/cancel", json={}, headers=owner.headers)
+    missing_id = cancelled["id"] + 100
+
+    response = _bulk(
+        api, owner, "cancel",
+        booking_ids=[confirmed["id"], hold["id"], cancelled["id"], missing_id],
+    )
+
+    assert response.status_code == 200
+    assert sorted(b["id"] for b in response.json()["updated"]) == sorted([confirmed["id"], hold["id"]])
+    results = {r["booking_id"]: r for r in response.json()["results"]}
+    assert results[confirmed["id"]] == {"booking_id": confirmed["id"], "ok": True, "status": "cancelled", "error": None}
+    assert results[hold["id"]]["ok"] is True
+    assert results[cancelled["id"]]["ok"] is False
+    assert results[cancelled["id"]]["status"] == "cancelled"
+    assert "cancelled" in results[cancelled["id"]]["error"]
+    assert results[missing_id] == {"booking_id": missing_id, "ok": False, "status": None, "error": f"Бронирование {missing_id} не найдено"}
+
+
+def test_bulk_confirm_rejects_non_hold(api, owner, book, slot_at):
+    hold = book(slot_at(10), confirm=False).json()
+    confirmed = book(slot_at(12)).json()
+
+    response = _bulk(api, owner, "confirm", booking_ids=[hold["id"], confirmed["id"]])
+
+    assert response.status_code == 200
+    assert [b["id"] for b in response.json()["updated"]] == [hold["id"]]
+    results = {r["booking_id"]: r for r in response.json()["results"]}
+    assert results[hold["id"]]["status"] == "confirmed"
+    assert results[confirmed["id"]]["ok"] is False
+
+
+def test_bulk_by_filter_selects_staff_period_and_statuses(api, owner, master, make_master, book, slot_at):
+    other = make_master(owner, first_name="Olga")
+    first = book(slot_at(10), confirm=False).json()
+    second = book(slot_at(12)).json()
+    later = book(slot_at(10, days=2), confirm=False).json()
+    book(slot_at(15, days=3), confirm=False)  # после date_to
+    book(slot_at(16), confirm=False, staff=other)  # другой сотрудник
+
+    response = _bulk(
+        api, owner, "cancel",
+        staff_id=master.id,
+        date_from=slot_at(0).date().isoformat(),
+        date_to=slot_at(0, days=2).date().isoformat(),
+        statuses=["hold"],
+    )
+
+    assert response.status_code == 200
+    assert sorted(r["booking_id"] for r in response.json()["results"]) == sorted([first["id"], later["id"]])
+    assert all(r["ok"] for r in response.json()["results"])
+    listed = {b["id"]: b["status"] for b in api.get("/api/v1/bookings", headers=owner.headers).json()}
+    assert listed[second["id"]] == "confirmed"
+    assert sum(status == "hold" for status in listed.values()) == 2
+
+
+def test_bulk_size_limit(api, owner, master, book, slot_at, monkeypatch):
+    too_many = _bulk(api, owner, "cancel", booking_ids=list(range(1, booking_service.MAX_BULK_BOOKINGS + 2)))
+    assert too_many.status_code == 422
+
+    book(slot_at(10))
+    book(slot_at(12))
+    monkeypatch.setattr(booking_service, "MAX_BULK_BOOKINGS", 1)
+    response = _bulk(api, owner, "cancel", staff_id=master.id, date_from=slot_at(0).date().isoformat())
+
+    assert response.status_code == 400
+    assert "Не больше 1 броней" in response.json()["detail"]
+    listed = api.get("/api/v1/bookings", headers=owner.headers).json()
+    assert {b["status"] for b in listed} == {"confirmed"}
+
+
+def test_bulk_notifies_only_changed_bookings(api, owner, master, make_master, book, slot_at, monkeypatch):
+    other = make_master(owner, first_name="Olga")
+    idle = make_master(owner, first_name="Ivan")
+    mine = [book(slot_at(10)).json(), book(slot_at(12)).json()]
+    theirs = book(slot_at(10), staff=other).json()
+    rejected = book(slot_at(14), staff=idle).json()
+    api.post(f"/api/v1/bookings/{rejected['id']}/cancel", json={}, headers=owner.headers)
+
+    changed, published = [], []
+    on_changed = BookingService._on_changed
+
+    def _spy_changed(booking, event, **kwargs):
+        changed.append((booking.id, event))
+        on_changed(booking, event, **kwargs)
+
+    monkeypatch.setattr(BookingService, "_on_changed", staticmethod(_spy_changed))
+    monkeypatch.setattr(event_bus, "publish", lambda event, **data: published.append((event, data["staff_id"])))
+    versions = booking_service.change_versions
+    before = {s.id: versions.staff(owner.id, s.id) for s in (master, other, idle)}
+
+    response = _bulk(api, owner, "cancel", booking_ids=[b["id"] for b in [*mine, theirs, rejected]])
+
+    assert response.status_code == 200
+    expected = sorted(b["id"] for b in [*mine, theirs])
+    assert sorted(booking_id for booking_id, _ in changed) == expected
+    assert {event for _, event in changed} == {"booking.cancelled"}
+    assert sorted(published) == sorted(
+        [("booking.cancelled", master.id)] * 2 + [("booking.cancelled", other.id)]
+    )
+    assert versions.staff(owner.id, master.id) > before[master.id]
+    assert versions.staff(owner.id, other.id) > before[other.id]
+    assert versions.staff(owner.id, idle.id) == before[idle.id]
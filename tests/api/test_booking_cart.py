@@ -0,0 +1,66 @@
+from sqlalchemy import func, select
+
+from app.models.booking import Booking
+from app.models.customer import Customer
+from app.services.booking_service import BookingService
+
+
+def _cart(api, owner, master, *starts, headers=None):
+    body = {
+        "items": [
+            {"staff_id": master.id, "service_id": master.service_id, "start_at": start.isoformat()}
+            for start in starts
+        ],
+        "confirm": True,
+        "customer": {"name": "Cart Client", "phone": "+79000000002"},
+    }
+    return api.post("/api/v1/bookings/batch", json=body, headers={**owner.headers, **(headers or {})})
+
+
+def _count(db, model):
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def test_cart_creates_all_items(api, db, owner, master, slot_at):
+    response = _cart(api, owner, master, slot_at(10), slot_at(12))
+
+    assert response.status_code == 201
+    assert [item["start_at"] for item in response.json()] == [slot_at(10).isoformat(), slot_at(12).isoformat()]
+    assert _count(db, Booking) == 2
+
+
+def test_conflict_on_second_item_rolls_back_whole_cart(api, db, owner, master, book, slot_at, monkeypatch):
+    assert book(slot_at(12)).status_code == 201
+    customers_before = _count(db, Customer)
+    # Без fast-fail конфликт находится внутри BEGIN IMMEDIATE — после
+    # того, как клиент корзины уже создан
+    monkeypatch.setattr(BookingService, "_precheck_overlap", staticmethod(lambda *a, **kw: None))
+
+    response = _cart(api, owner, master, slot_at(10), slot_at(12, 30))
+
+    assert response.status_code == 409
+    assert "Позиция 2" in response.json()["detail"]
+    assert _count(db, Booking) == 1
+    assert _count(db, Customer) == customers_before
+    # Первая позиция не заняла слот
+    assert book(slot_at(10)).status_code == 201
+
+
+def test_cart_items_overlapping_each_other_are_rejected(api, db, owner, master, slot_at):
+    response = _cart(api, owner, master, slot_at(10), slot_at(10, 30))
+
+    assert response.status_code == 409
+    assert "Позиции 1 и 2" in response.json()["detail"]
+    assert _count(db, Booking) == 0
+
+
+def test_cart_replay_with_idempotency_key(api, db, owner, master, slot_at):
+    headers = {"Idempotency-Key": "cart-1"}
+
+    first = _cart(api, owner, master, slot_at(10), slot_at(12), headers=headers)
+    second = _cart(api, owner, master, slot_at(10), slot_at(12), headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.json() == first.json()
+    assert _count(db, Booking) == 2
@@ -0,0 +1,68 @@
+from app.services.booking_service import BOOKING_HORIZON_DAYS, SERIES_HORIZON_DAYS
+
+
+def _series(api, owner, master, start_at, **extra):
+    body = {
+        "staff_id": master.id,
+        "service_id": master.service_id,
+        "start_at": start_at.isoformat(),
+        "frequency": "weekly",
+        "confirm": True,
+        "customer": {"name": "Regular", "phone": "+79000000003"},
+        **extra,
+    }
+    return api.post("/api/v1/bookings/series", json=body, headers=owner.headers)
+
+
+def test_series_books_months_ahead(api, owner, master, slot_at):
+    response = _series(api, owner, master, slot_at(10), count=26)
+
+    assert response.status_code == 201
+    assert len(response.json()["created"]) == 26
+    assert response.json()["conflicts"] == []
+
+
+def test_series_stops_at_series_horizon(api, owner, master, slot_at):
+    start = slot_at(10, days=SERIES_HORIZON_DAYS - 10)
+
+    response = _series(api, owner, master, start, count=4)
+
+    assert response.status_code == 201
+    assert len(response.json()["created"]) == 2
+    assert all(f"{SERIES_HORIZON_DAYS} дней" in c["reason"] for c in response.json()["conflicts"])
+
+
+def test_occurrence_past_booking_horizon_is_visible_and_movable(api, owner, master, slot_at):
+    days = (BOOKING_HORIZON_DAYS // 7 + 2) * 7 + 1
+    series = _series(api, owner, master, slot_at(10), count=days // 7 + 1).json()
+    far = series["created"][-1]
+    assert far["start_at"] == slot_at(10, days=days).isoformat()
+
+    url = f"/api/v1/schedule/staff/{master.id}/slots?service_id={master.service_id}&day={slot_at(0, days=days).date()}"
+    assert api.get(url, headers=owner.headers).status_code == 400
+    slots = api.get(url + "&series=true", headers=owner.headers)
+    assert slots.status_code == 200
+    starts = {slot["start"] for slot in slots.json()}
+    assert slot_at(10, days=days).isoformat() not in starts
+    assert slot_at(14, days=days).isoformat() in starts
+
+    moved = api.post(
+        f"/api/v1/bookings/{far['id']}/reschedule",
+        json={"start_at": slot_at(14, days=days).isoformat()},
+        headers=owner.headers,
+    )
+    assert moved.status_code == 200
+    assert moved.json()["start_at"] == slot_at(14, days=days).isoformat()
+
+
+def test_single_booking_cannot_move_past_booking_horizon(api, owner, book, slot_at):
+    booking = book(slot_at(10)).json()
+
+    moved = api.post(
+        f"/api/v1/bookings/{booking['id']}/reschedule",
+        json={"start_at": slot_at(10, days=BOOKING_HORIZON_DAYS + 7).isoformat()},
+        headers=owner.headers,
+    )
+
+    assert moved.status_code == 409
+    assert f"{BOOKING_HORIZON_DAYS} дней" in moved.json()["detail"]
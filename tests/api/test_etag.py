@@ -0,0 +1,33 @@
+from app.api import etag
+from app.core.versions import ChangeVersions
+
+
+def test_conditional_get_revalidates_after_change(api, owner):
+    first = api.get("/api/v1/staff", headers=owner.headers)
+    assert first.status_code == 200
+    tag = first.headers["etag"]
+
+    cached = api.get("/api/v1/staff", headers={**owner.headers, "If-None-Match": tag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == tag
+
+    created = api.post("/api/v1/staff", json={"first_name": "Anna"}, headers=owner.headers)
+    assert created.status_code == 201
+
+    fresh = api.get("/api/v1/staff", headers={**owner.headers, "If-None-Match": tag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != tag
+    assert [item["first_name"] for item in fresh.json()] == ["Anna"]
+
+
+def test_no_304_when_versions_are_not_shared(api, owner, monkeypatch):
+    monkeypatch.setattr(etag, "change_versions", ChangeVersions(authoritative=False))
+    tag = api.get("/api/v1/staff", headers=owner.headers).headers["etag"]
+
+    response = api.get("/api/v1/staff", headers={**owner.headers, "If-None-Match": tag})
+
+    assert response.status_code == 200
+
+
+def test_epoch_differs_between_processes():
+    assert ChangeVersions().epoch != ChangeVersions().epoch
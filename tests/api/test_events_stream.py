@@ -0,0 +1,11 @@
+from app.api.v1.endpoints import events
+from app.core.versions import ChangeVersions
+
+
+def test_stream_refused_with_several_workers(api, owner, monkeypatch):
+    monkeypatch.setattr(events, "change_versions", ChangeVersions(authoritative=False))
+
+    response = api.get("/api/v1/events/stream", headers=owner.headers)
+
+    assert response.status_code == 503
+    assert "WEB_CONCURRENCY" in response.json()["detail"]
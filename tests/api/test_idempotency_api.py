@@ -0,0 +1,43 @@
+from sqlalchemy import func, select
+
+from app.models.booking import Booking
+
+
+def _count_bookings(db):
+    return db.scalar(select(func.count()).select_from(Booking))
+
+
+def test_replay_returns_stored_response_without_second_insert(db, book, slot_at):
+    headers = {"Idempotency-Key": "create-1"}
+
+    first = book(slot_at(10), headers=headers)
+    second = book(slot_at(10), headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.json() == first.json()
+    assert _count_bookings(db) == 1
+
+
+def test_same_key_with_different_body_is_rejected(db, book, slot_at):
+    headers = {"Idempotency-Key": "create-1"}
+
+    assert book(slot_at(10), headers=headers).status_code == 201
+    response = book(slot_at(12), headers=headers)
+
+    assert response.status_code == 422
+    assert _count_bookings(db) == 1
+
+
+def test_keys_are_scoped_to_business(db, book, slot_at, make_owner, make_master):
+    other = make_owner("other@example.com")
+    other_master = make_master(other, first_name="Olga")
+    headers = {"Idempotency-Key": "create-1"}
+
+    first = book(slot_at(10), headers=headers)
+    second = book(slot_at(10), headers=headers, business=other, staff=other_master)
+
+    assert first.status_code == second.status_code == 201
+    assert "idempotent-replayed" not in second.headers
+    assert second.json()["business_id"] == other.id
+    assert _count_bookings(db) == 2
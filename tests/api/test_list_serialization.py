@@ -0,0 +1,30 @@
+from pydantic import TypeAdapter
+
+from app.api.serialization import json_list_response
+from app.models.customer import Customer
+from app.schemas.customer import CustomerRead
+
+
+def test_chunks_are_joined_into_one_array():
+    adapter = TypeAdapter(list[dict])
+
+    response = json_list_response(adapter, iter([[{"a": 1}, {"a": 2}], [], [{"a": 3}]]))
+
+    assert response.body == b'[{"a":1},{"a":2},{"a":3}]'
+    assert json_list_response(adapter, iter([])).body == b"[]"
+
+
+def test_customers_list_matches_response_model(api, db, owner):
+    customers = [
+        Customer(business_id=owner.id, name=f"Client {i}", phone=f"+7900000000{i}", email=None, is_active=i != 2)
+        for i in range(4)
+    ]
+    db.add_all(customers)
+    db.commit()
+    expected = [CustomerRead.model_validate(c).model_dump(mode="json") for c in customers if c.is_active]
+
+    response = api.get("/api/v1/customers", headers=owner.headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert sorted(response.json(), key=lambda item: item["id"]) == sorted(expected, key=lambda item: item["id"])
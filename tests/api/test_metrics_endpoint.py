@@ -0,0 +1,25 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import metrics
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(metrics.router)
+    return TestClient(app)
+
+
+def test_metrics_require_token_when_configured(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "s3cret")
+    client = _client()
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "booking_index_lookups_total" in response.text
+
+
+def test_metrics_route_disabled_by_default(api):
+    assert api.get("/metrics").status_code == 404
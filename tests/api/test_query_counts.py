@@ -0,0 +1,42 @@
+from app.models.business_user import BusinessRole, BusinessUser
+from app.models.service import Service
+from app.models.staff import Staff
+from app.models.staff_service import StaffService
+from app.models.user import User
+
+
+def test_list_business_users_does_not_query_per_member(api, db, owner, max_queries):
+    for i in range(5):
+        member = User(email=f"admin{i}@example.com", hashed_password="-")
+        db.add(member)
+        db.flush()
+        db.add(BusinessUser(user_id=member.id, business_id=owner.id, role=BusinessRole.ADMIN))
+    db.commit()
+
+    # auth + membership + список
+    with max_queries(3):
+        response = api.get("/api/v1/business-users", headers=owner.headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 6
+    assert all(item["email"] for item in response.json())
+
+
+def test_list_services_for_staff_does_not_load_service_per_row(api, db, owner, max_queries):
+    master = Staff(business_id=owner.id, first_name="Anna")
+    db.add(master)
+    db.flush()
+    for i in range(5):
+        svc = Service(business_id=owner.id, name=f"Service {i}", duration_minutes=30, price=100)
+        db.add(svc)
+        db.flush()
+        db.add(StaffService(staff_id=master.id, service_id=svc.id, price=100, duration=30, is_active=i != 4))
+    db.commit()
+    url = f"/api/v1/staff/{master.id}/services"
+
+    # auth + membership + сотрудник + услуги
+    with max_queries(4):
+        response = api.get(url, headers=owner.headers)
+
+    assert response.status_code == 200
+    assert [item["service_name"] for item in response.json()] == [f"Service {i}" for i in range(4)]
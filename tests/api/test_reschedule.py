@@ -0,0 +1,77 @@
+import asyncio
+
+from app.core.events import event_bus
+from app.services import booking_service
+from app.services.booking_service import BookingError
+
+
+def _reschedule(api, owner, booking_id, start_at):
+    return api.post(
+        f"/api/v1/bookings/{booking_id}/reschedule",
+        json={"start_at": start_at.isoformat()},
+        headers=owner.headers,
+    )
+
+
+def test_reschedule_moves_booking(api, owner, book, slot_at):
+    booking = book(slot_at(10)).json()
+
+    response = _reschedule(api, owner, booking["id"], slot_at(14))
+
+    assert response.status_code == 200
+    assert response.json()["id"] == booking["id"]
+    assert response.json()["start_at"] == slot_at(14).isoformat()
+    assert response.json()["status"] == booking["status"]
+    # Старый слот освобождён тем же commit
+    assert book(slot_at(10)).status_code == 201
+
+
+def test_reschedule_into_taken_slot_conflicts(api, owner, book, slot_at):
+    booking = book(slot_at(10)).json()
+    book(slot_at(14))
+
+    response = _reschedule(api, owner, booking["id"], slot_at(14, 30))
+
+    assert response.status_code == 409
+
+
+def test_reschedule_cancelled_booking_conflicts(api, owner, book, slot_at):
+    booking = book(slot_at(10)).json()
+    cancelled = api.post(f"/api/v1/bookings/{booking['id']}/cancel", json={}, headers=owner.headers)
+    assert cancelled.status_code == 200
+
+    response = _reschedule(api, owner, booking["id"], slot_at(14))
+
+    assert response.status_code == 409
+
+
+def test_other_booking_errors_map_to_400(api, owner, book, slot_at, monkeypatch):
+    booking = book(slot_at(10)).json()
+
+    def _fail(*args, **kwargs):
+        raise BookingError("StaffService.duration должен быть > 0")
+
+    monkeypatch.setattr(booking_service.BookingService, "reschedule_booking", _fail)
+    response = _reschedule(api, owner, booking["id"], slot_at(14))
+
+    assert response.status_code == 400
+
+
+def test_reschedule_event_carries_old_and_new_day(api, owner, master, book, slot_at):
+    booking = book(slot_at(10)).json()
+    loop = asyncio.new_event_loop()
+    subscription = event_bus.subscribe(owner.id, staff_id=master.id, loop=loop)
+    try:
+        assert _reschedule(api, owner, booking["id"], slot_at(14, days=2)).status_code == 200
+        events, _ = loop.run_until_complete(subscription.next_batch(1))
+    finally:
+        event_bus.unsubscribe(subscription)
+        loop.close()
+
+    (event,) = events
+    assert event.type == "booking.rescheduled"
+    assert event.data["day"] == slot_at(0, days=2).date().isoformat()
+    assert event.data["start_at"] == slot_at(14, days=2).isoformat()
+    assert event.data["previous_day"] == slot_at(0).date().isoformat()
+    assert event.data["previous_start_at"] == slot_at(10).isoformat()
+    assert event.data["previous_staff_id"] == master.id
@@ -0,0 +1,20 @@
+from app.api.v1 import schedule
+
+
+def test_booking_changes_slots_etag_and_flight_key(api, owner, master, book, slot_at, monkeypatch):
+    keys = []
+    do = schedule.slots_flight.do
+    monkeypatch.setattr(schedule.slots_flight, "do", lambda key, fn: keys.append(key) or do(key, fn))
+    start = slot_at(10, days=2)
+    url = f"/api/v1/schedule/staff/{master.id}/slots?service_id={master.service_id}&day={start.date()}"
+
+    before = api.get(url, headers=owner.headers)
+    assert book(start).status_code == 201
+    after = api.get(url, headers={**owner.headers, "If-None-Match": before.headers["etag"]})
+
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    assert start.isoformat() in {item["start"] for item in before.json()}
+    assert start.isoformat() not in {item["start"] for item in after.json()}
+    # Расчёт до брони и после неё — разные ключи single-flight
+    assert keys[0] != keys[1]
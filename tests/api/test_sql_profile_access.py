@@ -0,0 +1,21 @@
+from sqlalchemy import select
+
+from app.api import deps
+from app.api.v1.endpoints import debug
+from app.models.user import User
+
+
+def test_sql_profile_disabled_by_default(api, owner):
+    assert api.get("/api/v1/debug/sql-profile", headers=owner.headers).status_code == 404
+
+
+def test_sql_profile_requires_profiler_allowlist(api, db, owner, monkeypatch):
+    monkeypatch.setattr(debug, "SQL_PROFILER_ENABLED", True)
+
+    assert api.get("/api/v1/debug/sql-profile", headers=owner.headers).status_code == 403
+    assert api.delete("/api/v1/debug/sql-profile", headers=owner.headers).status_code == 403
+
+    user_id = db.scalar(select(User.id).where(User.email == "owner@example.com"))
+    monkeypatch.setattr(deps, "PROFILER_USER_IDS", frozenset({user_id}))
+
+    assert api.get("/api/v1/debug/sql-profile", headers=owner.headers).status_code == 200
@@ -0,0 +1,40 @@
+def _time_off(api, owner, staff_ids, start_at, end_at):
+    return api.post(
+        "/api/v1/time-off",
+        json={"staff_ids": staff_ids, "ranges": [{"start_at": start_at.isoformat(), "end_at": end_at.isoformat()}]},
+        headers=owner.headers,
+    )
+
+
+def test_time_off_reports_overlapping_confirmed_booking(api, owner, master, make_master, book, slot_at):
+    other = make_master(owner, first_name="Olga")
+    booking = book(slot_at(10)).json()
+    book(slot_at(15))  # вне отгула
+
+    response = _time_off(api, owner, [master.id, other.id], slot_at(9), slot_at(12))
+
+    assert response.status_code == 201
+    assert len(response.json()["created"]) == 2
+    conflicts = response.json()["conflicts"]
+    assert [c["booking_id"] for c in conflicts] == [booking["id"]]
+    assert conflicts[0]["status"] == "confirmed"
+    assert conflicts[0]["time_off_id"] in {t["id"] for t in response.json()["created"] if t["staff_id"] == master.id}
+    # Бронь не отменяется — решение за менеджером
+    listed = api.get("/api/v1/bookings", headers=owner.headers).json()
+    assert {b["id"]: b["status"] for b in listed}[booking["id"]] == "confirmed"
+
+
+def test_time_off_invalidates_slots_etag(api, owner, master, slot_at):
+    day = slot_at(9).date()
+    url = f"/api/v1/schedule/staff/{master.id}/slots?service_id={master.service_id}&day={day}"
+    before = api.get(url, headers=owner.headers)
+    assert slot_at(10).isoformat() in {slot["start"] for slot in before.json()}
+
+    assert _time_off(api, owner, [master.id], slot_at(9), slot_at(12)).status_code == 201
+    after = api.get(url, headers={**owner.headers, "If-None-Match": before.headers["etag"]})
+
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    starts = {slot["start"] for slot in after.json()}
+    assert slot_at(10).isoformat() not in starts
+    assert slot_at(12).isoformat() in starts
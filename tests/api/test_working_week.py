@@ -0,0 +1,58 @@
+from app.api import deps
+from app.core.admission import TenantAdmission
+from app.core.versions import change_versions
+
+
+def _put_week(api, owner, staff_id, days):
+    return api.put(
+        "/api/v1/working-hours/weekly",
+        json={"staff_id": staff_id, "days": days},
+        headers=owner.headers,
+    )
+
+
+WEEK = [
+    {"weekday": 0, "start_time": "09:00:00", "end_time": "18:00:00", "break_start": "13:00:00", "break_end": "14:00:00"},
+    {"weekday": 2, "start_time": "10:00:00", "end_time": "16:00:00"},
+]
+
+
+def test_days_missing_from_payload_are_deactivated(api, owner, master):
+    response = _put_week(api, owner, master.id, WEEK)
+
+    assert response.status_code == 200
+    by_day = {row["weekday"]: row for row in response.json()}
+    assert sorted(by_day) == list(range(7))
+    assert [day for day, row in by_day.items() if row["is_active"]] == [0, 2]
+    assert by_day[0]["start_time"] == "09:00:00"
+    assert by_day[0]["break_start"] == "13:00:00"
+    assert by_day[2]["end_time"] == "16:00:00"
+
+
+def test_resending_same_week_is_idempotent(api, owner, master):
+    first = _put_week(api, owner, master.id, WEEK).json()
+    second = _put_week(api, owner, master.id, WEEK).json()
+
+    assert second == first
+    listed = api.get(f"/api/v1/working-hours?staff_id={master.id}", headers=owner.headers).json()
+    assert len(listed) == 7
+
+
+def test_replacing_week_bumps_schedule_version(api, owner, master):
+    before = change_versions.schedule(owner.id, master.id)
+
+    _put_week(api, owner, master.id, WEEK)
+
+    assert change_versions.schedule(owner.id, master.id) == before + 1
+
+
+def test_weekly_update_goes_through_admission(api, owner, master, monkeypatch):
+    monkeypatch.setattr(deps, "tenant_admission", TenantAdmission(
+        rate_per_second=0.001, burst=4, max_concurrency=0,
+    ))
+
+    assert _put_week(api, owner, master.id, WEEK).status_code == 200
+    rejected = _put_week(api, owner, master.id, WEEK)
+
+    assert rejected.status_code == 429
+    assert "Retry-After" in rejected.headers
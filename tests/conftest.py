@@ -0,0 +1,179 @@
+import contextlib
+from datetime import datetime, time, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.api.deps import get_db
+from app.core.admission import TenantAdmission
+from app.core.security import create_access_token
+from app.db.base import Base
+from app.db.profiler import capture_queries
+from app.main import app
+from app.models.business import Business
+from app.models.business_user import BusinessRole, BusinessUser
+from app.models.service import Service
+from app.models.staff import Staff
+from app.models.staff_service import StaffService
+from app.models.user import User
+from app.models.working_hours import WorkingHours
+from app.models import (  # noqa: F401  регистрация всех моделей в Base.metadata
+    booking, client, customer, idempotency_key, service, staff, staff_service, time_off, working_hours,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Сессия на пустой SQLite-БД во временном каталоге (схема из моделей)."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def api(db, monkeypatch):
+    """
+    TestClient приложения поверх db. Lifespan (hold sweeper) не
+    запускается. Admission — свежий на каждый тест: business_id
+    в новых БД повторяются, и токены не должны переходить между тестами.
+    """
+    admission = deps.tenant_admission
+    monkeypatch.setattr(deps, "tenant_admission", TenantAdmission(
+        rate_per_second=admission.rate_per_second,
+        burst=admission.burst,
+        max_concurrency=admission.max_concurrency,
+    ))
+
+    def _get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def make_owner(db):
+    """make_owner("a@example.com") — ещё один бизнес со своим владельцем."""
+    def _make_owner(email: str) -> Business:
+        business = Business(name=f"Business of {email}")
+        owner_user = User(email=email, hashed_password="-")
+        db.add_all([business, owner_user])
+        db.flush()
+        db.add(BusinessUser(user_id=owner_user.id, business_id=business.id, role=BusinessRole.OWNER))
+        db.commit()
+        business.headers = {
+            "Authorization": f"Bearer {create_access_token(owner_user.id)}",
+            "X-Business-ID": str(business.id),
+        }
+        return business
+    return _make_owner
+
+
+@pytest.fixture
+def owner(make_owner):
+    """Бизнес с владельцем; .headers — заголовки запроса от его имени."""
+    return make_owner("owner@example.com")
+
+
+@pytest.fixture
+def max_queries():
+    """
+    Верхняя граница числа SQL-запросов в блоке:
+
+        with max_queries(4):
+            api.get("/api/v1/business-users", headers=owner.headers)
+
+    При превышении тест падает со списком выполненных запросов.
+    """
+    @contextlib.contextmanager
+    def _check(limit: int):
+        with capture_queries() as statements:
+            yield statements
+        assert len(statements) <= limit, (
+            f"{len(statements)} SQL queries, expected at most {limit}:\n"
+            + "\n".join(f"  {statement}" for statement in statements)
+        )
+    return _check
+
+
+@pytest.fixture
+def make_master(db):
+    """
+    make_master(business) — сотрудник: услуга на 60 минут (.service_id)
+    и рабочие часы 08:00–20:00 без перерыва каждый день.
+    """
+    def _make_master(business: Business, *, first_name: str = "Anna") -> Staff:
+        staff = Staff(business_id=business.id, first_name=first_name)
+        service = Service(business_id=business.id, name="Haircut", duration_minutes=60, price=100)
+        db.add_all([staff, service])
+        db.flush()
+        db.add(StaffService(staff_id=staff.id, service_id=service.id, price=100, duration=60))
+        db.add_all(
+            WorkingHours(
+                business_id=business.id, staff_id=staff.id, weekday=weekday,
+                start_time=time(8), end_time=time(20),
+            )
+            for weekday in range(7)
+        )
+        db.commit()
+        staff.service_id = service.id
+        return staff
+    return _make_master
+
+
+@pytest.fixture
+def master(make_master, owner):
+    """Сотрудник бизнеса owner (см. make_master)."""
+    return make_master(owner)
+
+
+@pytest.fixture
+def slot_at():
+    """slot_at(10) — завтра в 10:00 (naive UTC, как datetime.utcnow())."""
+    def _slot_at(hour: int, minute: int = 0, *, days: int = 1) -> datetime:
+        day = datetime.utcnow().date() + timedelta(days=days)
+        return datetime.combine(day, time(hour, minute))
+    return _slot_at
+
+
+@pytest.fixture
+def book(api, owner, master):
+    """
+    book(start_at, ...) — POST /bookings от имени owner к master;
+    business/staff — другой бизнес (make_owner) и его сотрудник.
+    """
+    def _book(
+        start_at: datetime,
+        *,
+        confirm: bool = True,
+        headers: dict | None = None,
+        business: Business | None = None,
+        staff: Staff | None = None,
+        **extra,
+    ):
+        business = business or owner
+        staff = staff or master
+        body = {
+            "staff_id": staff.id,
+            "service_id": staff.service_id,
+            "start_at": start_at.isoformat(),
+            "confirm": confirm,
+            "customer": {"name": "Client", "phone": "+79000000001"},
+            **extra,
+        }
+        return api.post("/api/v1/bookings", json=body, headers={**business.headers, **(headers or {})})
+    return _book
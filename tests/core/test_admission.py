@@ -0,0 +1,63 @@
+import pytest
+
+from app.core import admission as admission_module
+from app.core.admission import AdmissionRejected, TenantAdmission, TokenBucket, parse_weights
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate=2, burst=4, now=0.0)
+
+    assert bucket.try_take(4, now=0.0) == 0
+    assert bucket.try_take(1, now=0.0) == pytest.approx(0.5)
+    assert bucket.try_take(1, now=0.5) == 0
+
+
+def test_concurrency_limit_is_per_tenant():
+    admission = TenantAdmission(rate_per_second=0, burst=0, max_concurrency=3)
+
+    slots = admission.acquire(1, weight=2)
+    with pytest.raises(AdmissionRejected) as exc:
+        admission.acquire(1, weight=2)
+    assert exc.value.status_code == 503
+
+    # другой tenant не страдает от соседа
+    admission.acquire(2, weight=3)
+
+    admission.release(1, slots)
+    admission.acquire(1, weight=2)
+
+
+def test_rate_limit_rejects_with_retry_after():
+    admission = TenantAdmission(rate_per_second=1, burst=2, max_concurrency=0)
+
+    admission.acquire(1, weight=2)
+    with pytest.raises(AdmissionRejected) as exc:
+        admission.acquire(1, weight=2)
+    assert exc.value.status_code == 429
+    assert exc.value.retry_after >= 1
+
+
+def test_idle_tenants_with_full_bucket_are_evicted(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(admission_module.time, "monotonic", lambda: clock[0])
+    admission = TenantAdmission(rate_per_second=1, burst=2, max_concurrency=4)
+
+    for tenant_id in range(1, 6):
+        admission.acquire(tenant_id, weight=1)
+    busy = admission.acquire(6, weight=2)
+    for tenant_id in range(1, 6):
+        admission.release(tenant_id, 1)
+    assert admission.tenant_count() == 6
+
+    # Через burst / rate секунд bucket'ы полны; tenant 6 ещё в обработке
+    clock[0] += 2
+    admission.acquire(7, weight=1)
+    assert admission.tenant_count() == 2
+
+    # Удалённый tenant начинает с полного bucket'а, как и раньше
+    admission.release(6, busy)
+    admission.acquire(1, weight=2)
+
+
+def test_parse_weights():
+    assert parse_weights("a=3, b=2,,broken") == {"a": 3, "b": 2}
@@ -0,0 +1,55 @@
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app.db.retry import (
+    SQLITE_BUSY_TIMEOUT_MS,
+    BusyRetryPolicy,
+    WriteLockStats,
+    busy_timeout_ms,
+    run_with_busy_retry,
+)
+from app.services.booking_service import BookingService
+
+
+def test_busy_timeout_is_default_outside_retries():
+    assert busy_timeout_ms() == SQLITE_BUSY_TIMEOUT_MS
+
+
+def test_retries_wait_for_write_lock_no_longer_than_deadline(tmp_path):
+    path = tmp_path / "locked.db"
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _pragma(dbapi_connection, _):
+        dbapi_connection.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    session = Session(engine)
+    stats = WriteLockStats()
+    policy = BusyRetryPolicy(max_attempts=10, base_delay=0.01, max_delay=0.05, deadline=0.3)
+    try:
+        started = time.monotonic()
+        with pytest.raises(sqlite3.OperationalError):
+            run_with_busy_retry(
+                lambda: BookingService._begin_immediate(session),
+                policy=policy,
+                stats=stats,
+                before_retry=session.rollback,
+            )
+        elapsed = time.monotonic() - started
+
+        # Без ограничения одна попытка ждала бы SQLITE_BUSY_TIMEOUT_MS
+        assert elapsed < 1.5
+        assert stats.gave_up == 1
+        session.rollback()
+        assert session.execute(text("PRAGMA busy_timeout")).scalar() == SQLITE_BUSY_TIMEOUT_MS
+    finally:
+        holder.rollback()
+        holder.close()
+        session.close()
+        engine.dispose()
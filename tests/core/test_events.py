@@ -0,0 +1,37 @@
+import asyncio
+
+from app.core.events import ChangeEvent, Subscription, event_bus
+
+
+def test_subscriber_receives_event_after_booking(owner, master, book, slot_at):
+    loop = asyncio.new_event_loop()
+    subscription = event_bus.subscribe(owner.id, staff_id=master.id, loop=loop)
+    try:
+        response = book(slot_at(10))
+        assert response.status_code == 201
+
+        events, overflowed = loop.run_until_complete(subscription.next_batch(1))
+    finally:
+        event_bus.unsubscribe(subscription)
+        loop.close()
+
+    assert not overflowed
+    assert [event.type for event in events] == ["booking.created"]
+    assert events[0].data["booking_id"] == response.json()["id"]
+
+
+def test_full_queue_drops_events_instead_of_blocking():
+    loop = asyncio.new_event_loop()
+    subscription = Subscription(business_id=1, staff_id=None, maxsize=2, loop=loop)
+    try:
+        # Никто не читает: offer не должен ждать места в очереди
+        for i in range(1, 6):
+            subscription.offer(ChangeEvent(type="booking.created", business_id=1, id=i))
+
+        events, overflowed = loop.run_until_complete(subscription.next_batch(1))
+    finally:
+        loop.close()
+
+    assert overflowed
+    assert subscription.dropped == 3
+    assert [event.id for event in events] == [4, 5]
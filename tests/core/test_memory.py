@@ -0,0 +1,77 @@
+import tracemalloc
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.memory import AllocationTracker, HeapSnapshots, MemoryTrackingMiddleware
+
+
+@pytest.fixture
+def tracing():
+    tracemalloc.start(8)
+    try:
+        yield
+    finally:
+        tracemalloc.stop()
+
+
+def _allocate(size):
+    return [bytearray(1024) for _ in range(size // 1024)]
+
+
+def test_request_peak_includes_freed_allocations(tracing):
+    tracker = AllocationTracker()
+
+    measurement = tracker.begin()
+    data = _allocate(4 * 1024 * 1024)
+    del data
+    memory = tracker.end(measurement)
+
+    assert memory["peak_bytes"] >= 4 * 1024 * 1024
+    assert memory["retained_bytes"] < 1024 * 1024
+    assert memory["overlapped"] is False
+
+
+def test_overlapping_requests_are_marked(tracing):
+    tracker = AllocationTracker()
+
+    first = tracker.begin()
+    second = tracker.begin()
+
+    assert tracker.end(second)["overlapped"] is True
+    assert tracker.end(first)["overlapped"] is True
+    assert tracker.end(tracker.begin())["overlapped"] is False
+
+
+def test_middleware_skips_when_tracemalloc_is_off():
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    app.add_middleware(MemoryTrackingMiddleware, tracker=AllocationTracker())
+
+    assert TestClient(app).get("/ping").json() == {"ok": True}
+
+
+def test_diff_groups_growth_by_project_line(tracing):
+    snapshots = HeapSnapshots(keep=2)
+    snapshots.take()
+    base = snapshots.get(snapshots.recent()[0]["id"])
+
+    data = _allocate(2 * 1024 * 1024)
+    rows = snapshots.diff(base, key_type="app", top=5)
+
+    assert rows[0]["site"].startswith("tests/core/test_memory.py:")
+    assert rows[0]["size_diff"] >= 2 * 1024 * 1024
+    del data
+
+
+def test_keeps_only_last_snapshots(tracing):
+    snapshots = HeapSnapshots(keep=2)
+    ids = [snapshots.take()["id"] for _ in range(3)]
+
+    assert [s["id"] for s in snapshots.recent()] == ids[:0:-1]
+    assert snapshots.get(ids[0]) is None
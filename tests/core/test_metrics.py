@@ -0,0 +1,39 @@
+import threading
+
+from app.core.metrics import Counter, Histogram, Registry
+
+
+def test_counter_sums_values_written_from_different_threads():
+    counter = Counter("jobs_total", "Jobs", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc("b", amount=2)
+
+    # Потоки завершились — их значения слиты в retired и не теряются
+    assert list(counter.samples()) == [("", ("a",), (), 4000), ("", ("b",), (), 2)]
+    assert list(counter.samples()) == [("", ("a",), (), 4000), ("", ("b",), (), 2)]
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.register(Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "/a")
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
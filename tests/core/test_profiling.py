@@ -0,0 +1,54 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiling import ProfileStore, SamplingProfilerMiddleware
+
+
+def _busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _client(store, *, allowed):
+    app = FastAPI()
+
+    @app.get("/slots")
+    def slots():
+        _busy_loop(0.05)
+        return []
+
+    app.add_middleware(
+        SamplingProfilerMiddleware,
+        store=store,
+        is_allowed=lambda scope: allowed,
+        interval=0.001,
+    )
+    return TestClient(app)
+
+
+def test_profiles_sync_endpoint_into_collapsed_stacks():
+    store = ProfileStore()
+
+    response = _client(store, allowed=True).get("/slots", headers={"X-Profile": "1"})
+
+    profile = store.get(int(response.headers["x-profile-id"]))
+    assert profile.route == "/slots"
+    # Стек рабочего потока начинается с эндпоинта — кадры anyio отрезаны
+    assert any(
+        stack.startswith("_client.<locals>.slots (tests/core/test_profiling.py")
+        and "_busy_loop (tests/core/test_profiling.py" in stack
+        for stack in profile.stacks
+    )
+    line = profile.collapsed().splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_request_is_not_profiled_without_flag_or_permission():
+    store = ProfileStore()
+
+    assert "x-profile-id" not in _client(store, allowed=True).get("/slots").headers
+    assert "x-profile-id" not in _client(store, allowed=False).get("/slots", headers={"X-Profile": "1"}).headers
+    assert store.recent() == []
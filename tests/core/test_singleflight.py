@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    executions = []
+
+    def compute():
+        executions.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return ["slot"]
+
+    results = []
+
+    def worker():
+        results.append(flight.do("key", compute))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait(timeout=5)
+
+    followers = [threading.Thread(target=worker) for _ in range(5)]
+    for t in followers:
+        t.start()
+    # ждём, пока все followers встанут в очередь за лидером
+    deadline = time.monotonic() + 5
+    while flight.stats().coalesced < 5 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+
+    for t in [leader, *followers]:
+        t.join(timeout=5)
+
+    assert len(executions) == 1
+    assert len(results) == 6
+    assert all(r is results[0] for r in results)
+
+    stats = flight.stats()
+    assert stats.calls == 6
+    assert stats.executions == 1
+    assert stats.coalesced == 5
+    assert stats.in_flight == 0
+
+
+def test_error_is_shared_and_not_cached():
+    flight = SingleFlight()
+
+    def fail():
+        raise LookupError("not found")
+
+    with pytest.raises(LookupError):
+        flight.do("key", fail)
+
+    # результат не кэшируется — следующий вызов выполняется заново
+    assert flight.do("key", lambda: 42) == 42
+    assert flight.stats().executions == 2
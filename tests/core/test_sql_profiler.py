@@ -0,0 +1,63 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.db.profiler import BACKGROUND, SqlProfiler, SqlProfilerMiddleware, normalize_sql
+
+
+def test_normalize_sql_strips_literals_and_collapses_in_lists():
+    assert normalize_sql(
+        "SELECT * FROM bookings\n  WHERE id IN (?, ?, ?) AND status = 'new' AND staff_id = 42"
+    ) == "SELECT * FROM bookings WHERE id IN (?…) AND status = ? AND staff_id = ?"
+
+
+def _engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, staff_id INTEGER)"))
+    return engine
+
+
+def test_statements_are_attributed_to_route_template():
+    engine = _engine()
+    profiler = SqlProfiler(slow_query_ms=10_000)
+    profiler.instrument(engine)
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT * FROM items WHERE id = :id"), {"id": item_id})
+            conn.execute(text("SELECT * FROM items WHERE id = :id"), {"id": item_id})
+        return {}
+
+    app.add_middleware(SqlProfilerMiddleware, profiler=profiler)
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    by_route = {item["route"]: item for item in profiler.snapshot()}
+    assert by_route["GET /items/{item_id}"]["requests"] == 2
+    assert by_route["GET /items/{item_id}"]["queries_per_request"] == 2
+    assert by_route["GET /items/{item_id}"]["statements"][0]["count"] == 4
+    assert by_route[BACKGROUND]["queries"] == 1
+
+
+def test_slow_query_is_logged_with_query_plan(caplog):
+    engine = _engine()
+    SqlProfiler(slow_query_ms=0).instrument(engine)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.profiler"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT * FROM items WHERE staff_id = :s"), {"s": 1})
+
+    assert "SCAN items" in caplog.text
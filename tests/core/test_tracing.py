@@ -0,0 +1,67 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.tracing import ServerTimingMiddleware, Trace, server_timing, span
+
+
+class WriterFake:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+
+def _client(**kwargs):
+    app = FastAPI()
+
+    @app.get("/slots")
+    def slots():
+        with span("db.bookings"):
+            with span("sql"):
+                pass
+        with span("db.bookings"):
+            pass
+        return []
+
+    app.add_middleware(ServerTimingMiddleware, **kwargs)
+    return TestClient(app)
+
+
+def test_span_outside_request_is_shared_noop():
+    assert span("a") is span("b")
+
+
+def test_server_timing_sums_spans_by_name_and_reports_uncovered_time():
+    trace = Trace()
+    trace.spans = [("db", 0.0, 0.002, 0), ("sql", 0.0, 0.001, 1), ("db", 0.003, 0.001, 0)]
+
+    assert server_timing(trace, total=0.010) == (
+        'db;dur=3.00;desc="2x", sql;dur=1.00, other;dur=7.00, total;dur=10.00'
+    )
+
+
+def test_middleware_adds_header_and_writes_sampled_trace():
+    writer = WriterFake()
+    response = _client(writer=writer, sample_rate=1.0).get("/slots")
+
+    header = response.headers["server-timing"]
+    assert 'db.bookings;dur=' in header and 'desc="2x"' in header
+    assert "total;dur=" in header
+    (record,) = writer.records
+    assert record["route"] == "/slots"
+    assert [s["name"] for s in record["spans"]] == ["sql", "db.bookings", "db.bookings"]
+    assert record["spans"][0]["depth"] == 1
+
+
+def test_middleware_without_header_and_sampling_passes_through():
+    response = _client(header=False, writer=WriterFake(), sample_rate=0.0).get("/slots")
+
+    assert "server-timing" not in response.headers
+
+
+def test_header_only_for_allowed_requests():
+    client = _client(is_allowed=lambda scope: any(name == b"x-allowed" for name, _ in scope["headers"]))
+
+    assert "server-timing" not in client.get("/slots").headers
+    assert "total;dur=" in client.get("/slots", headers={"X-Allowed": "1"}).headers["server-timing"]
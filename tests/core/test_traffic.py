@@ -0,0 +1,67 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.traffic import REDACTED, TrafficRecorderMiddleware, sanitize
+
+
+class WriterFake:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+
+def _client(writer, **kwargs):
+    app = FastAPI()
+
+    @app.post("/api/v1/bookings/{booking_id}/confirm")
+    def confirm(booking_id: int, payload: dict):
+        return {"id": booking_id}
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    app.add_middleware(TrafficRecorderMiddleware, writer=writer, **kwargs)
+    return TestClient(app)
+
+
+def test_sanitize_redacts_nested_sensitive_keys():
+    value = {"staff_id": 1, "customer": {"name": "Анна", "phone": "+7900"}, "items": [{"email": "a@b.c"}]}
+
+    assert sanitize(value) == {
+        "staff_id": 1,
+        "customer": {"name": REDACTED, "phone": REDACTED},
+        "items": [{"email": REDACTED}],
+    }
+
+
+def test_middleware_records_route_template_tenant_and_sanitized_body():
+    writer = WriterFake()
+    client = _client(writer)
+
+    response = client.post(
+        "/api/v1/bookings/42/confirm?day=2026-03-02",
+        json={"customer": {"phone": "+7900"}, "confirm": True},
+        headers={"X-Business-ID": "7", "Authorization": "Bearer secret"},
+    )
+
+    assert response.status_code == 200
+    (record,) = writer.records
+    assert record["method"] == "POST"
+    assert record["route"] == "/api/v1/bookings/{booking_id}/confirm"
+    assert record["path_params"] == {"booking_id": "42"}
+    assert record["query"] == {"day": "2026-03-02"}
+    assert record["tenant"] == 7
+    assert record["status"] == 200
+    assert record["body"] == {"customer": {"phone": REDACTED}, "confirm": True}
+    assert "secret" not in str(record)
+
+
+def test_middleware_skips_paths_outside_prefix_and_unsampled():
+    writer = WriterFake()
+    _client(writer).get("/health")
+    _client(writer, sample_rate=0.0).post("/api/v1/bookings/1/confirm", json={})
+
+    assert writer.records == []
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.services.booking_index import BookingIntervalIndex
+
+
+# ===== fakes (замена ORM моделей) =====
+
+@dataclass
+class BookingFake:
+    id: int
+    business_id: int
+    staff_id: int
+    start_at: datetime
+    end_at: datetime
+    status: str
+    expires_at: Optional[datetime] = None
+    is_active: bool = True
+
+
+NOW = datetime(2026, 2, 1, 8, 0)
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 2, 1, hour, minute)
+
+
+def _find(index, start_at, end_at, loader=lambda: [], now=NOW):
+    return index.find_conflict(
+        business_id=1,
+        staff_id=10,
+        start_at=start_at,
+        end_at=end_at,
+        now=now,
+        loader=loader,
+    )
+
+
+# ===== tests =====
+
+def test_detects_overlap_and_touching_edges():
+    index = BookingIntervalIndex()
+    existing = [
+        BookingFake(1, 1, 10, _at(10), _at(11), "confirmed"),
+        BookingFake(2, 1, 10, _at(9), _at(13), "cancelled"),
+    ]
+
+    assert _find(index, _at(10, 30), _at(11, 30), loader=lambda: existing) == 1
+    assert _find(index, _at(11), _at(12)) is None
+    assert _find(index, _at(9), _at(10)) is None
+    assert (index.lookups, index.loads) == (3, 1)
+    assert (index.conflicts, index.clears) == (1, 2)
+
+
+def test_long_booking_found_before_short_ones():
+    index = BookingIntervalIndex()
+    existing = [
+        BookingFake(1, 1, 10, _at(9), _at(14), "confirmed"),
+        BookingFake(2, 1, 10, _at(12), _at(12, 30), "cancelled"),
+    ]
+
+    assert _find(index, _at(13), _at(13, 30), loader=lambda: existing) == 1
+
+
+def test_expired_hold_does_not_conflict():
+    index = BookingIntervalIndex()
+    hold = BookingFake(1, 1, 10, _at(10), _at(11), "hold", expires_at=NOW + timedelta(minutes=5))
+    _find(index, _at(10), _at(11), loader=lambda: [hold])
+
+    assert _find(index, _at(10), _at(11)) == 1
+    assert _find(index, _at(10), _at(11), now=NOW + timedelta(minutes=6)) is None
+
+
+def test_apply_tracks_transitions():
+    index = BookingIntervalIndex()
+    _find(index, _at(10), _at(11), loader=lambda: [])
+
+    booking = BookingFake(5, 1, 10, _at(10), _at(11), "hold", expires_at=NOW + timedelta(minutes=5))
+    index.apply(booking)
+    assert _find(index, _at(10), _at(11)) == 5
+
+    booking.status = "cancelled"
+    index.apply(booking)
+    assert _find(index, _at(10), _at(11)) is None
+
+
+def test_stale_entry_is_reloaded():
+    index = BookingIntervalIndex(ttl_seconds=0)
+    first = [BookingFake(1, 1, 10, _at(10), _at(11), "confirmed")]
+
+    assert _find(index, _at(10), _at(11), loader=lambda: first) == 1
+    assert _find(index, _at(10), _at(11), loader=lambda: []) is None
+    assert index.loads == 2
@@ -0,0 +1,101 @@
+import io
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.schemas.customer import CustomerCreate
+from app.services import csv_import
+from app.services.csv_import import ImportFormatError, import_csv
+
+
+# ===== fakes =====
+
+class SessionFake:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class ImporterFake(csv_import._Importer):
+    """Пишет в память; телефон "fail" роняет пакет."""
+    schema = CustomerCreate
+    stored: dict = {}
+    batches: list = []
+
+    def key(self, row):
+        return row.phone
+
+    def write(self, session, *, business_id, rows):
+        if any(row.phone == "fail" for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("constraint failed"))
+        type(self).batches.append(len(rows))
+        created = sum(1 for row in rows if row.phone not in self.stored)
+        self.stored.update({row.phone: row.name for row in rows})
+        return created
+
+
+@pytest.fixture
+def importer(monkeypatch):
+    ImporterFake.stored = {"100": "Old"}
+    ImporterFake.batches = []
+    monkeypatch.setitem(csv_import.IMPORTERS, "customers", ImporterFake)
+    return ImporterFake
+
+
+def _run(text, **kwargs):
+    session = SessionFake()
+    report = import_csv(
+        session, business_id=1, entity="customers", stream=io.StringIO(text), **kwargs,
+    )
+    return session, report
+
+
+# ===== tests =====
+
+def test_chunks_commit_separately_and_report_row_errors(importer):
+    text = "name,phone\nA,1\nB,2\n,3\nC,100\nD,4\nA2,1\n"
+    session, report = _run(text, chunk_size=2)
+
+    assert (report.total, report.inserted, report.updated, report.failed) == (6, 3, 2, 1)
+    assert report.errors[0].line == 4
+    assert importer.batches == [2, 2, 1]
+    assert session.commits == 3
+    assert importer.stored["1"] == "A2"
+
+
+def test_duplicate_key_within_chunk_written_once(importer):
+    _, report = _run("name,phone\nA,1\nB,1\n", chunk_size=10)
+
+    assert importer.batches == [1]
+    assert importer.stored["1"] == "B"
+    assert (report.inserted, report.updated) == (1, 1)
+
+
+def test_failed_chunk_rolled_back_and_import_continues(importer):
+    session, report = _run("name,phone\nA,1\nB,fail\nC,2\n", chunk_size=2)
+
+    assert session.rollbacks == 1
+    assert [e.line for e in report.errors] == [2, 3]
+    assert report.inserted == 1 and "2" in importer.stored
+
+
+def test_missing_required_column(importer):
+    with pytest.raises(ImportFormatError):
+        _run("name,email\nA,a@x\n")
+
+
+def test_importer_without_write_cannot_be_instantiated():
+    class Incomplete(csv_import._Importer):
+        schema = CustomerCreate
+
+        def key(self, row):
+            return row.phone
+
+    with pytest.raises(TypeError):
+        Incomplete()
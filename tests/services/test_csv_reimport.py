@@ -0,0 +1,54 @@
+import io
+from decimal import Decimal
+
+from app.core.versions import change_versions
+from app.models.service import Service
+from app.models.staff import Staff
+from app.services.csv_import import import_csv
+
+
+def _import(db, owner, entity, text):
+    return import_csv(db, business_id=owner.id, entity=entity, stream=io.StringIO(text))
+
+
+def test_partial_row_keeps_stored_values_and_inactive_staff(db, owner):
+    db.add(Staff(
+        business_id=owner.id, first_name="Anna", phone="+7900",
+        email="old@example.com", is_active=False,
+    ))
+    db.commit()
+
+    report = _import(db, owner, "staff", "first_name,last_name,phone,email\nAnna,,,new@example.com\n")
+
+    assert (report.inserted, report.updated, report.failed) == (0, 1, 0)
+    staff = db.query(Staff).one()
+    db.refresh(staff)
+    assert (staff.phone, staff.email, staff.is_active) == ("+7900", "new@example.com", False)
+
+
+def test_explicit_is_active_reactivates_and_invalidates_schedule(db, owner):
+    staff = Staff(business_id=owner.id, first_name="Anna", is_active=False)
+    db.add(staff)
+    db.commit()
+    before = change_versions.schedule(owner.id, staff.id)
+
+    _import(db, owner, "staff", "first_name,is_active\nAnna,true\n")
+
+    db.refresh(staff)
+    assert staff.is_active is True
+    assert change_versions.schedule(owner.id, staff.id) == before + 1
+
+
+def test_partial_service_row_keeps_description_and_inactive(db, owner):
+    db.add(Service(
+        business_id=owner.id, name="Haircut", description="Short",
+        duration_minutes=60, price=100, is_active=False,
+    ))
+    db.commit()
+
+    _import(db, owner, "services", "name,duration_minutes,price\nHaircut,45,120\n")
+
+    service = db.query(Service).one()
+    db.refresh(service)
+    assert (service.description, service.duration_minutes, service.is_active) == ("Short", 45, False)
+    assert service.price == Decimal("120")
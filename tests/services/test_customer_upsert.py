@@ -0,0 +1,28 @@
+from app.models.customer import Customer
+from app.repositories import customers as customers_repo
+
+
+def test_upsert_keeps_stored_email_when_row_has_none(db, owner):
+    db.add(Customer(business_id=owner.id, name="Old", phone="+7900", email="old@example.com"))
+    db.commit()
+
+    customers_repo.upsert_many(db, business_id=owner.id, rows=[
+        {"name": "New", "phone": "+7900", "email": None},
+        {"name": "Fresh", "phone": "+7901", "email": None},
+    ])
+    db.commit()
+
+    stored = {c.phone: (c.name, c.email) for c in db.query(Customer)}
+    assert stored == {"+7900": ("New", "old@example.com"), "+7901": ("Fresh", None)}
+
+
+def test_upsert_replaces_email_when_given(db, owner):
+    db.add(Customer(business_id=owner.id, name="Old", phone="+7900", email="old@example.com"))
+    db.commit()
+
+    customers_repo.upsert_many(db, business_id=owner.id, rows=[
+        {"name": "Old", "phone": "+7900", "email": "new@example.com"},
+    ])
+    db.commit()
+
+    assert db.query(Customer).one().email == "new@example.com"
@@ -0,0 +1,19 @@
+from app.services.idempotency import make_request
+
+
+def test_fingerprint_ignores_key_order():
+    a = make_request("k", endpoint="bookings.create", payload={"staff_id": 1, "service_id": 2})
+    b = make_request("k", endpoint="bookings.create", payload={"service_id": 2, "staff_id": 1})
+
+    assert a.fingerprint == b.fingerprint
+
+
+def test_fingerprint_depends_on_endpoint_and_payload():
+    base = make_request("k", endpoint="bookings.confirm", payload={"booking_id": 1})
+
+    assert base.fingerprint != make_request(
+        "k", endpoint="bookings.cancel", payload={"booking_id": 1},
+    ).fingerprint
+    assert base.fingerprint != make_request(
+        "k", endpoint="bookings.confirm", payload={"booking_id": 2},
+    ).fingerprint
@@ -0,0 +1,37 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.services.recurrence import Blocker, RecurrenceRule, find_conflicts
+
+FIRST = datetime(2026, 2, 2, 10, 0)  # понедельник
+
+
+def test_expand_weekly_by_count_and_biweekly_until():
+    weekly = RecurrenceRule(frequency="weekly", count=3).expand(FIRST, limit=52)
+    biweekly = RecurrenceRule(frequency="biweekly", until=date(2026, 3, 2)).expand(FIRST, limit=52)
+
+    assert weekly == [FIRST, FIRST + timedelta(weeks=1), FIRST + timedelta(weeks=2)]
+    assert biweekly == [FIRST + timedelta(weeks=2 * i) for i in range(3)]
+
+
+def test_expand_is_bounded_and_validated():
+    assert len(RecurrenceRule(frequency="weekly", until=date(2030, 1, 1)).expand(FIRST, limit=5)) == 5
+    with pytest.raises(ValueError):
+        RecurrenceRule(frequency="weekly", count=2, until=date(2026, 3, 1)).expand(FIRST, limit=5)
+
+
+def test_sweep_reports_each_blocked_occurrence():
+    intervals = [
+        (FIRST + timedelta(weeks=i), FIRST + timedelta(weeks=i, minutes=30))
+        for i in range(5)
+    ]
+    blockers = [
+        # длинный отгул на 2-й и 3-й неделях
+        Blocker(FIRST + timedelta(weeks=1, hours=-1), FIRST + timedelta(weeks=2, hours=1), "time_off"),
+        # бронь вплотную к 4-му повторению — не конфликт
+        Blocker(FIRST + timedelta(weeks=3, minutes=30), FIRST + timedelta(weeks=3, hours=1), "booking"),
+        Blocker(FIRST + timedelta(weeks=4, minutes=15), FIRST + timedelta(weeks=4, minutes=45), "booking"),
+    ]
+
+    assert find_conflicts(intervals, blockers) == {1: "time_off", 2: "time_off", 4: "booking"}
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from app.core.config import SLOT_TOKEN_TTL_SECONDS
+from app.core.versions import ChangeVersions, change_versions
+from app.services import slot_tokens
+from app.services.slot_tokens import issue_slot_token, verify_slot_token
+
+NOW = datetime(2026, 2, 1, 8, 0)
+SLOT = dict(business_id=901, staff_id=1, service_id=2, start_at=datetime(2026, 2, 1, 10, 0))
+
+
+def _issue(**overrides):
+    return issue_slot_token(
+        **{**SLOT, **overrides},
+        duration_minutes=30,
+        schedule_version=change_versions.schedule(901, 1),
+        now=NOW,
+    )
+
+
+def _verify(token, now=NOW, **overrides):
+    return verify_slot_token(token, **{**SLOT, **overrides}, duration_minutes=30, now=now)
+
+
+def test_token_is_bound_to_slot():
+    token = _issue()
+
+    assert _verify(token)
+    assert not _verify(token, start_at=datetime(2026, 2, 1, 10, 30))
+    assert not _verify(token, service_id=3)
+    assert not _verify(token + "0")
+    assert not _verify("garbage")
+
+
+def test_token_expires():
+    token = _issue()
+
+    assert _verify(token, now=NOW + timedelta(seconds=SLOT_TOKEN_TTL_SECONDS - 1))
+    assert not _verify(token, now=NOW + timedelta(seconds=2 * SLOT_TOKEN_TTL_SECONDS))
+
+
+def test_schedule_change_invalidates_token():
+    token = _issue()
+    change_versions.bump_schedule(901, 1)
+
+    assert not _verify(token)
+    assert _verify(_issue())
+
+
+def test_tokens_are_not_trusted_with_several_workers(monkeypatch):
+    token = _issue()
+    versions = ChangeVersions(authoritative=False)
+    versions.epoch = change_versions.epoch
+    monkeypatch.setattr(slot_tokens, "change_versions", versions)
+
+    assert not _verify(token)